@@ -0,0 +1,4 @@
+"""
+Benchmarks for the Boggle game, run from the repository root, e.g.
+python -m benchmarks.bench_solver
+"""
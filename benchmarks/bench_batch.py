@@ -0,0 +1,117 @@
+"""
+Compares the numpy batch analysis of boggle_batch with per-board Python
+loops over the game's boards: generation, letter counts, adjacent pairs and
+dictionary bigram coverage. Needs numpy.
+
+    python -m benchmarks.bench_batch [--boards 20000] [--repeat 3]
+                                     [--min-speedup 10]
+
+The feature extraction is timed --repeat times on both sides and the best
+times are compared.
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import random
+import time
+
+from boggle_batch import (FACE_CODES, FACE_COUNT, adjacency_pairs,
+                          bigram_coverage, encode_boards, letter_counts,
+                          random_boards, word_bigrams)
+from boggle_board_randomizer import randomize_board
+from boggle_path import neighbours_table
+from boggle_trie import read_words
+
+
+def python_features(boards, bigrams) -> list:
+    """
+    The per-board loops: letter counts, adjacent pair counts and the
+    coverage of the bigrams, for every board.
+    """
+    neighbours = neighbours_table(len(boards[0]), len(boards[0][0]))
+    wanted = {(first, second) for first in range(FACE_COUNT)
+              for second in range(FACE_COUNT) if bigrams[first][second]}
+    features = []
+    for board in boards:
+        codes = [FACE_CODES[face] for row in board for face in row]
+        counts = [0] * FACE_COUNT
+        pairs = {}
+        for cell, code in enumerate(codes):
+            counts[code] += 1
+            for neighbour in neighbours[cell]:
+                pair = (code, codes[neighbour])
+                pairs[pair] = pairs.get(pair, 0) + 1
+        coverage = len(wanted.intersection(pairs)) / len(wanted)
+        features.append((counts, pairs, coverage))
+    return features
+
+
+def _timed(function, *args, repeat: int = 1):
+    """
+    :return: (the result, the best time of repeat calls).
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--boards", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dictionary", default="boggle_dict.txt")
+    parser.add_argument("--min-speedup", type=float, default=10.0,
+                        help="fail if feature extraction is not this much "
+                             "faster than the Python loops")
+    args = parser.parse_args(argv)
+
+    bigrams = word_bigrams(read_words(args.dictionary))
+    rng = random.Random(args.seed)
+    boards, python_generate = _timed(
+        lambda: [randomize_board(rng=rng) for _ in range(args.boards)])
+    _, numpy_generate = _timed(
+        lambda: random_boards(args.boards, rng=args.seed))
+
+    python_result, python_time = _timed(python_features, boards,
+                                        bigrams.tolist(), repeat=args.repeat)
+    batch = encode_boards(boards)
+
+    def numpy_features():
+        return (letter_counts(batch), adjacency_pairs(batch),
+                bigram_coverage(batch, bigrams))
+
+    (counts, pairs, coverage), numpy_time = _timed(numpy_features,
+                                                   repeat=args.repeat)
+
+    # both compute the same features
+    for index in (0, len(boards) // 2, len(boards) - 1):
+        expected_counts, expected_pairs, expected_coverage = \
+            python_result[index]
+        assert counts[index].tolist() == expected_counts
+        assert {(first, second): int(pairs[index, first, second])
+                for first, second in zip(*pairs[index].nonzero())} == \
+            expected_pairs
+        assert abs(coverage[index] - expected_coverage) < 1e-9
+
+    rate = args.boards / 1e3
+    print(f"{'stage':<20} {'python ms':>10} {'numpy ms':>9} {'speedup':>8}")
+    for name, python, vectorized in (
+            ("generate", python_generate, numpy_generate),
+            ("features", python_time, numpy_time)):
+        print(f"{name:<20} {python * 1000:10.1f} {vectorized * 1000:9.1f} "
+              f"{python / vectorized:7.1f}x")
+    print(f"{args.boards} boards, features at "
+          f"{rate / numpy_time:.0f}k boards/s with numpy")
+
+    speedup = python_time / numpy_time
+    if speedup < args.min_speedup:
+        print(f"feature extraction is only {speedup:.1f}x faster")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,96 @@
+"""
+Plays the same game with many bots twice: submitting every word through
+BoggleLogic.after_submit, and in batches of packed paths as the bots do,
+and reports the words per second of both.
+
+    python -m benchmarks.bench_bots [--bots 500] [--games 5]
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import bisect
+import random
+import time
+
+from boggle_board_randomizer import randomize_board
+from boggle_bots import SKILLS, Bot, BotGame
+from boggle_cache import SolvedBoardCache
+from boggle_trie import load_trie
+
+
+class PerWordBot(Bot):
+    """
+    A bot submitting its words one after_submit call at a time.
+    """
+
+    def __init__(self, name, skill, board, logic, schedule):
+        super().__init__(name, skill, board, logic, schedule)
+        self._paths = [path for _, path in schedule]
+
+    def play(self, elapsed: float) -> int:
+        due = bisect.bisect_right(self._times, elapsed)
+        submit = self.logic.after_submit
+        accepted = sum(submit(path)
+                       for path in self._paths[self._submitted:due])
+        self._submitted = max(due, self._submitted)
+        return accepted
+
+
+class PerWordGame(BotGame):
+    bot_class = PerWordBot
+
+
+def _play(board, solutions, max_score, args, seed, batched: bool):
+    """
+    :return: (the bots' scores, words submitted, seconds spent playing).
+    """
+    game = (BotGame if batched else PerWordGame)(board, solutions, max_score,
+                                                 seed=seed)
+    skills = sorted(SKILLS)
+    for index in range(args.bots):
+        game.add_bot(SKILLS[skills[index % len(skills)]])
+    start = time.perf_counter()
+    submitted = game.run(args.step)
+    elapsed = time.perf_counter() - start
+    return [score for _, score in game.standings()], submitted, elapsed
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--bots", type=int, default=500)
+    parser.add_argument("--games", type=int, default=5)
+    parser.add_argument("--step", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dictionary", default="boggle_dict.txt")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    trie = load_trie(args.dictionary)
+    cache = SolvedBoardCache()
+    totals = {False: [0, 0.0], True: [0, 0.0]}
+    for _ in range(args.games):
+        board = randomize_board(rng=rng)
+        solutions, max_score = cache.solve(board, trie)
+        seed = rng.getrandbits(64)
+        results = {}
+        for batched in (False, True):
+            scores, submitted, elapsed = _play(board, solutions, max_score,
+                                               args, seed, batched)
+            results[batched] = scores
+            totals[batched][0] += submitted
+            totals[batched][1] += elapsed
+        # both play exactly the same game
+        assert results[False] == results[True]
+    trie.close()
+
+    print(f"{'submission':<12} {'words':>8} {'ms':>8} {'words/s':>10}")
+    for batched, name in ((False, "per word"), (True, "batched")):
+        words, elapsed = totals[batched]
+        print(f"{name:<12} {words:8d} {elapsed * 1000:8.1f} "
+              f"{words / elapsed:10.0f}")
+    print(f"{args.bots} bots, {args.games} games: batched submission is "
+          f"{totals[False][1] / totals[True][1]:.2f}x faster")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,165 @@
+"""
+Measures the memory of many live games with tracemalloc, as a server keeps
+them: a few solved boards, each played by many players who found some of
+its words. The BoggleLogic games share the SolvedBoard of their board and
+are compared with the dicts, sets and lists a game used to keep (modelled
+by LegacyGame), whose hints must agree with them.
+
+    python -m benchmarks.bench_game_state [--games 5000] [--min-reduction 10]
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import bisect
+import random
+import tracemalloc
+
+from boggle_board_randomizer import randomize_board
+from boggle_cache import SolvedBoardCache
+from boggle_logic import BoggleLogic
+from boggle_path import is_valid_path
+from boggle_state import SolvedBoard
+from boggle_trie import load_trie
+
+
+class LegacyGame:
+    """
+    The state a game kept before SolvedBoard: its own set, sorted list and
+    prefix counts of the remaining words, and the words and paths found as
+    lists.
+    """
+
+    def __init__(self, board, solutions, max_score):
+        self._score = 0
+        self._words_found = []
+        self._paths_found = []
+        self._board = board
+        self._solutions = solutions
+        self._max_score = max_score
+        self._remaining = set(solutions)
+        self._sorted = sorted(self._remaining)
+        self._prefix_counts = {}
+        for word in self._sorted:
+            for end in range(len(word) + 1):
+                prefix = word[:end]
+                self._prefix_counts[prefix] = \
+                    self._prefix_counts.get(prefix, 0) + 1
+
+    def after_submit(self, path) -> bool:
+        word = is_valid_path(self._board, path, self._remaining)
+        if not word:
+            return False
+        self._score += len(path) ** 2
+        self._words_found.append(word)
+        self._paths_found.append(list(path))
+        self._remaining.remove(word)
+        for end in range(len(word) + 1):
+            self._prefix_counts[word[:end]] -= 1
+        return True
+
+    def get_hint_count(self, prefix: str = "") -> int:
+        return self._prefix_counts.get(prefix, 0)
+
+    def iter_hints(self, prefix: str = ""):
+        words = self._sorted
+        index = bisect.bisect_left(words, prefix)
+        while index < len(words) and words[index].startswith(prefix):
+            if words[index] in self._remaining:
+                yield words[index]
+            index += 1
+
+
+def _live_games(boards, games: int, words: int, new_game, seed: int):
+    """
+    :return: (the games, the bytes they allocated): games round robin on
+    the boards, each submitting up to words of its board's words.
+    """
+    rng = random.Random(seed)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    live = []
+    for index in range(games):
+        _, solutions, shared = boards[index % len(boards)]
+        game = new_game(shared)
+        paths = list(solutions.values())
+        for path in rng.sample(paths, min(words, len(paths))):
+            game.after_submit(path)
+        live.append(game)
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return live, allocated
+
+
+def _shared_size(boards) -> int:
+    """
+    :return: the bytes of the SolvedBoards of the boards.
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    shared = [SolvedBoard(board, solutions, max_score)
+              for board, solutions, max_score in boards]
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del shared
+    return allocated
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=5000)
+    parser.add_argument("--boards", type=int, default=20)
+    parser.add_argument("--words", type=int, default=20,
+                        help="the words found in every game")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dictionary", default="boggle_dict.txt")
+    parser.add_argument("--min-reduction", type=float, default=10.0,
+                        help="fail if a game is not this many times smaller")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    trie = load_trie(args.dictionary)
+    cache = SolvedBoardCache()
+    solved = [(board,) + cache.solve(board, trie)
+              for board in (randomize_board(rng=rng)
+                            for _ in range(args.boards))]
+    trie.close()
+
+    compact, compact_bytes = _live_games(
+        [(board, solutions, SolvedBoard(board, solutions, max_score))
+         for board, solutions, max_score in solved],
+        args.games, args.words, BoggleLogic.from_solved, args.seed)
+    legacy, legacy_bytes = _live_games(
+        [(board, solutions, (board, solutions, max_score))
+         for board, solutions, max_score in solved],
+        args.games, args.words, lambda shared: LegacyGame(*shared),
+        args.seed)
+
+    # both kept the same games
+    for game, old in zip(compact, legacy):
+        assert game.get_score() == old._score
+        assert game.get_words_found() == old._words_found
+        assert game.get_paths_found() == old._paths_found
+        for prefix in ("", "A", "S", "ST", "QU"):
+            assert game.get_hint_count(prefix) == old.get_hint_count(prefix)
+            assert list(game.iter_hints(prefix)) == \
+                list(old.iter_hints(prefix))
+
+    words = sum(len(solutions) for _, solutions, _ in solved) / len(solved)
+    reduction = legacy_bytes / compact_bytes
+    print(f"{args.games} games on {args.boards} boards "
+          f"({words:.0f} words per board), {args.words} words found each")
+    print(f"{'state':<12} {'bytes/game':>12} {'MB':>8}")
+    for name, allocated in (("legacy", legacy_bytes),
+                            ("compact", compact_bytes)):
+        print(f"{name:<12} {allocated / args.games:12.0f} "
+              f"{allocated / 2 ** 20:8.1f}")
+    print(f"shared SolvedBoards: {_shared_size(solved) / args.boards:.0f} "
+          f"bytes per board")
+    print(f"a game is {reduction:.1f}x smaller")
+    if reduction < args.min_reduction:
+        print(f"less than {args.min_reduction:.0f}x")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,87 @@
+"""
+Fills a game history with many games through HistoryStore (its writer
+thread and batched transactions), on two dictionaries and two board sizes,
+then times the leaderboard (of one dictionary and size) and per-player
+queries.
+
+    python -m benchmarks.bench_history [--games 1000000] [--players 1000]
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from boggle_board_randomizer import randomize_board
+from boggle_history import GameRecord, HistoryStore
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=1000000)
+    parser.add_argument("--players", type=int, default=1000)
+    parser.add_argument("--words", type=int, default=2,
+                        help="words found in every game")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget-ms", type=float, default=5.0,
+                        help="fail if a query's p99 is slower")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    boards = [randomize_board(rng=rng, rows=4 + index % 2)
+              for index in range(100)]
+    path = [(0, 0), (0, 1), (1, 1)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = HistoryStore(os.path.join(directory, "history.sqlite3"))
+        start = time.perf_counter()
+        now = time.time()
+        for game in range(args.games):
+            store.record_game(GameRecord(
+                f"player-{rng.randrange(args.players)}", boards[game % 100],
+                rng.randrange(200), 200,
+                [(f"WORD{index}", path) for index in range(args.words)],
+                ("default", "kids")[game // 100 % 2], now - game))
+        queued = time.perf_counter() - start
+        store.flush()
+        written = time.perf_counter() - start
+        print(f"{args.games} games queued in {queued:.1f}s, "
+              f"written in {written:.1f}s "
+              f"({args.games / written:.0f} games/s)")
+
+        queries = {
+            "top_scores": lambda: store.top_scores(10, "default", 4),
+            "player_best": lambda: store.player_best(
+                f"player-{rng.randrange(args.players)}", 10, "default", 4),
+            "player_recent": lambda: store.player_recent(
+                f"player-{rng.randrange(args.players)}", 10),
+            "player_stats": lambda: store.player_stats(
+                f"player-{rng.randrange(args.players)}"),
+        }
+        slow = []
+        print(f"{'query':<15} {'p50 ms':>8} {'p99 ms':>8}")
+        for name, query in queries.items():
+            latencies = []
+            for _ in range(args.queries):
+                begin = time.perf_counter()
+                query()
+                latencies.append((time.perf_counter() - begin) * 1000)
+            latencies.sort()
+            p50 = latencies[len(latencies) // 2]
+            p99 = latencies[min(len(latencies) - 1,
+                                int(len(latencies) * 0.99))]
+            print(f"{name:<15} {p50:8.3f} {p99:8.3f}")
+            if p99 > args.budget_ms:
+                slow.append(name)
+        store.close()
+
+    if slow:
+        print(f"slower than {args.budget_ms} ms: {', '.join(slow)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
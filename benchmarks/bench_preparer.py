@@ -0,0 +1,58 @@
+"""
+Measures how long the player waits for a game with the background
+GamePreparer: the first game (dictionary load and solve) and every
+"play again" (the next board was solved while the previous game was played).
+
+    python -m benchmarks.bench_preparer [--games 20] [--play-seconds 0.2]
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import time
+
+from boggle_board_randomizer import randomize_board
+from boggle_preparer import GamePreparer
+
+
+def wait_for_game(preparer: GamePreparer, poll_seconds: float = 0.02):
+    """
+    Polls the preparer like the controller does from the Tk mainloop.
+    :return: (the game, seconds waited).
+    """
+    start = time.perf_counter()
+    while True:
+        game = preparer.poll()
+        if game is not None:
+            return game, time.perf_counter() - start
+        time.sleep(poll_seconds)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--play-seconds", type=float, default=0.2,
+                        help="time spent in each game before playing again")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    preparer = GamePreparer(randomize_board, seed=args.seed)
+
+    _, startup = wait_for_game(preparer)
+    preparer.request()
+    print(f"startup (dictionary + first board): {startup * 1000:8.2f} ms")
+
+    restarts = []
+    for _ in range(args.games):
+        time.sleep(args.play_seconds)
+        _, waited = wait_for_game(preparer)
+        preparer.request()
+        restarts.append(waited)
+    preparer.close()
+
+    restarts.sort()
+    print(f"restart wait mean: {sum(restarts) / len(restarts) * 1000:8.2f} ms")
+    print(f"restart wait max:  {restarts[-1] * 1000:8.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+"""
+Plays many seeded games through BoggleLogic and ReplayWriter (found words,
+words submitted twice and random walks), then replays the log with the
+replay engine and reports the games replayed per second. Every game must
+replay bit for bit, and a game with a forged score must not.
+
+    python -m benchmarks.bench_replay [--games 2000] [--min-rate 1000]
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.bench_submit_batch import random_walk
+from boggle_board_randomizer import randomize_board
+from boggle_cache import SolvedBoardCache
+from boggle_logic import BoggleLogic
+from boggle_replay import ReplayWriter, read_games, replay_game
+from boggle_trie import load_trie
+
+
+class SimulatedClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def write_games(log_path: str, games: int, trie, rng: random.Random) -> int:
+    """
+    Plays the games and logs them to log_path.
+    :return: the number of submissions logged.
+    """
+    clock = SimulatedClock()
+    writer = ReplayWriter(log_path, clock)
+    cache = SolvedBoardCache()
+    submitted = 0
+    for _ in range(games):
+        seed = rng.getrandbits(64)
+        board = randomize_board(rng=random.Random(seed))
+        solutions, max_score = cache.solve(board, trie)
+        logic = BoggleLogic.from_solutions(board, solutions, max_score)
+        found = list(solutions.values())
+        paths = rng.sample(found, min(len(found), rng.randint(5, 30)))
+        paths += paths[:3]
+        paths += [random_walk(len(board), len(board[0]), rng)
+                  for _ in range(rng.randint(5, 20))]
+        rng.shuffle(paths)
+
+        writer.start_game(seed, board, checksum=trie.checksum)
+        for path in paths:
+            clock.now += rng.uniform(0.5, 6.0)
+            writer.submit(path, logic.after_submit(path), logic.get_score())
+        writer.end_game(logic.get_score(), logic.get_max_score())
+        submitted += len(paths)
+    writer.close()
+    return submitted
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dictionary", default="boggle_dict.txt")
+    parser.add_argument("--min-rate", type=float, default=1000.0,
+                        help="fail if fewer games are replayed per second")
+    args = parser.parse_args(argv)
+
+    trie = load_trie(args.dictionary)
+    with tempfile.TemporaryDirectory() as directory:
+        log_path = os.path.join(directory, "games.replay")
+        submitted = write_games(log_path, args.games, trie,
+                                random.Random(args.seed))
+        size = os.path.getsize(log_path)
+
+        start = time.perf_counter()
+        results = [replay_game(game, trie) for game in read_games(log_path)]
+        elapsed = time.perf_counter() - start
+
+    different = [result for result in results if not result.ok]
+    game = results[0].game
+    forged = game._replace(score=game.score + 1)
+    assert not replay_game(forged, trie).ok
+    trie.close()
+
+    print(f"{len(results)} games, {submitted} submissions, {size} bytes "
+          f"({size / submitted:.1f} bytes per submission)")
+    print(f"replayed in {elapsed * 1000:.1f} ms "
+          f"({len(results) / elapsed:.0f} games/s), "
+          f"{len(different)} differ")
+    if different or len(results) != args.games:
+        return 1
+    if len(results) / elapsed < args.min_rate:
+        print(f"fewer than {args.min_rate:.0f} games/s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,85 @@
+"""
+Times solving, path validation and click tracking on boards of different
+sizes, and fails if a board takes longer to solve than the budget.
+
+    python -m benchmarks.bench_sizes [--boards 20] [--budget 1.0]
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import random
+import time
+
+from boggle_board_randomizer import LETTERS, load_dice, randomize_board
+from boggle_path import BoardPath, is_valid_path
+from boggle_solver import solve_board
+from boggle_trie import load_trie
+
+
+SIZES = [(4, 4), (5, 5), (6, 6), (4, 6), (5, 7), (8, 8)]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--boards", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget", type=float, default=1.0,
+                        help="maximum seconds to solve one board")
+    parser.add_argument("--dice", default="dice/big_boggle.txt",
+                        help="dice of the boards bigger than 4x4")
+    parser.add_argument("--dictionary", default="boggle_dict.txt")
+    args = parser.parse_args(argv)
+
+    trie = load_trie(args.dictionary)
+    big_dice = load_dice(args.dice)
+
+    print(f"{'size':>6} {'words':>7} {'solve ms':>9} {'max ms':>8} "
+          f"{'validate us/path':>17} {'click ns':>9}")
+    over_budget = []
+    for rows, cols in SIZES:
+        dice = LETTERS if rows * cols <= len(LETTERS) else big_dice
+        solve_times = []
+        validate_time = 0.0
+        validated = 0
+        click_time = 0.0
+        clicks = 0
+        words = 0
+        for index in range(args.boards):
+            board = randomize_board(dice, random.Random(args.seed + index),
+                                    rows, cols)
+            start = time.perf_counter()
+            solutions = solve_board(board, trie)
+            solve_times.append(time.perf_counter() - start)
+            words += len(solutions)
+
+            start = time.perf_counter()
+            for path in solutions.values():
+                is_valid_path(board, path, solutions)
+            validate_time += time.perf_counter() - start
+            validated += len(solutions)
+
+            start = time.perf_counter()
+            for path in solutions.values():
+                clicked = BoardPath(rows, cols)
+                for row, col in path:
+                    clicked.can_add(row, col)
+                    clicked.add(row, col)
+                clicks += len(path)
+            click_time += time.perf_counter() - start
+
+        slowest = max(solve_times)
+        if slowest > args.budget:
+            over_budget.append(f"{rows}x{cols}")
+        print(f"{rows:>2}x{cols:<3} {words / args.boards:7.0f} "
+              f"{sum(solve_times) / len(solve_times) * 1e3:9.2f} "
+              f"{slowest * 1e3:8.2f} "
+              f"{validate_time / max(validated, 1) * 1e6:17.2f} "
+              f"{click_time / max(clicks, 1) * 1e9:9.0f}")
+
+    if over_budget:
+        print(f"over the {args.budget}s budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
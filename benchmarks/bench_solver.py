@@ -0,0 +1,136 @@
+"""
+Compares the trie-pruned solve_board with a dictionary scan (the way the
+game used to find the words: a backtracking search for every word of the
+dictionary) on a fixed set of seeded boards, and measures how much the
+pre-filter (benchmarks.prefilter) shrinks the words to scan. Both must find
+the same words.
+
+    python -m benchmarks.bench_solver [--boards 20] [--seed 0]
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import random
+import time
+
+from typing import Dict, Iterable, Optional
+
+from benchmarks.prefilter import WordFilter
+from boggle_board_randomizer import randomize_board
+from boggle_path import Board, Path, is_valid_path
+from boggle_solver import solve_board
+from boggle_trie import load_trie, read_words
+
+
+def seeded_boards(count: int, seed: int):
+    """
+    :return: count boards, board i is generated from random.Random(seed + i).
+    """
+    return [randomize_board(rng=random.Random(seed + i)) for i in range(count)]
+
+
+def word_path(board: Board, word: str,
+              starts: Dict[str, list]) -> Optional[Path]:
+    """
+    :return: a path spelling word on the board, found by backtracking from
+    the cells starting with its first letter (starts, see
+    possible_words_on_board), or None if there is none.
+    """
+    rows, cols = len(board), len(board[0])
+    path = []
+
+    def extend(row: int, col: int, start: int) -> bool:
+        face = board[row][col]
+        if not word.startswith(face, start):
+            return False
+        path.append((row, col))
+        end = start + len(face)
+        if end == len(word) or any(
+                extend(next_row, next_col, end)
+                for next_row in range(max(row - 1, 0), min(row + 2, rows))
+                for next_col in range(max(col - 1, 0), min(col + 2, cols))
+                if (next_row, next_col) not in path):
+            return True
+        path.pop()
+        return False
+
+    for row, col in starts.get(word[:1], ()):
+        if extend(row, col, 0):
+            return path
+    return None
+
+
+def possible_words_on_board(board: Board,
+                            words: Iterable[str]) -> Dict[str, Path]:
+    """
+    :return: every word of words that can be spelled on the board, with a
+    path spelling it (checked with is_valid_path).
+    """
+    starts = {}
+    for row, faces in enumerate(board):
+        for col, face in enumerate(faces):
+            starts.setdefault(face[:1], []).append((row, col))
+    found = {}
+    for word in words:
+        path = word_path(board, word, starts)
+        if path is not None:
+            assert is_valid_path(board, path, (word,)) == word
+            found[word] = path
+    return found
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--boards", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dictionary", default="boggle_dict.txt")
+    args = parser.parse_args(argv)
+
+    boards = seeded_boards(args.boards, args.seed)
+    trie = load_trie(args.dictionary)
+
+    start = time.perf_counter()
+    solved = [solve_board(board, trie) for board in boards]
+    trie_time = (time.perf_counter() - start) / len(boards)
+    print(f"solve_board:              {trie_time * 1000:9.3f} ms/board")
+
+    words = list(read_words(args.dictionary))
+    start = time.perf_counter()
+    word_filter = WordFilter.from_words(words)
+    print(f"pre-filter build:         "
+          f"{time.perf_counter() - start:9.3f} s")
+    start = time.perf_counter()
+    candidates = [word_filter.candidates(board) for board in boards]
+    filter_time = (time.perf_counter() - start) / len(boards)
+    kept = sum(map(len, candidates)) / len(boards)
+    print(f"pre-filter:               {filter_time * 1000:9.3f} ms/board, "
+          f"{kept:.0f} of {len(word_filter)} words kept "
+          f"({len(word_filter) / kept:.0f}x fewer)")
+    missed = sum(not set(found) <= set(kept_words)
+                 for found, kept_words in zip(solved, candidates))
+    if missed:
+        print(f"boards whose words the pre-filter dropped: {missed}")
+        return 1
+
+    start = time.perf_counter()
+    scanned = [possible_words_on_board(board, words) for board in boards]
+    scan_time = (time.perf_counter() - start) / len(boards)
+    print(f"possible_words_on_board:  {scan_time * 1000:9.3f} ms/board")
+    print(f"speedup:                  {scan_time / trie_time:9.1f}x")
+
+    start = time.perf_counter()
+    filtered = [possible_words_on_board(board, kept_words)
+                for board, kept_words in zip(boards, candidates)]
+    filtered_time = (time.perf_counter() - start) / len(boards) + \
+        filter_time
+    print(f"pre-filter + scan:        {filtered_time * 1000:9.3f} ms/board")
+
+    mismatches = sum(set(found) != set(expected) or
+                     set(found) != set(filtered_found)
+                     for found, expected, filtered_found
+                     in zip(solved, scanned, filtered))
+    print(f"boards with different word sets: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
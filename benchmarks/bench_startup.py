@@ -0,0 +1,87 @@
+"""
+Measures the cold start of the game in fresh interpreters: the import time
+of boggle.py (python -X importtime) and the time from launching
+`python boggle.py` until its window is first drawn. Needs a display (e.g.
+xvfb-run) for the first frame.
+
+    python -m benchmarks.bench_startup [--runs 10]
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# runs boggle.py as `python boggle.py` does, and exits as soon as the
+# window is drawn (the first update or mainloop of the window)
+_FIRST_FRAME = """
+import os, runpy, sys, tkinter
+
+def first_frame(window, *args):
+    tkinter.Misc.update(window)
+    print("first frame", flush=True)
+    os._exit(0)
+
+tkinter.Tk.update = tkinter.Tk.mainloop = first_frame
+sys.argv = ["boggle.py", "--no-history", "--no-replay-log"]
+runpy.run_path("boggle.py", run_name="__main__")
+"""
+
+
+def import_time(module: str) -> float:
+    """
+    :return: the cumulative import time of module in a fresh interpreter,
+    in milliseconds, as reported by -X importtime.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                             f"import {module}"],
+                            capture_output=True, text=True, check=True)
+    for line in result.stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1]) / 1000
+    raise RuntimeError(f"no import time reported for {module}")
+
+
+def first_frame_time() -> float:
+    """
+    :return: the seconds from starting `python boggle.py` until its window
+    is drawn.
+    """
+    start = time.perf_counter()
+    child = subprocess.Popen([sys.executable, "-c", _FIRST_FRAME],
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                             text=True, cwd=os.getcwd())
+    line = child.stdout.readline()
+    elapsed = time.perf_counter() - start
+    _, errors = child.communicate()
+    if line.strip() != "first frame":
+        raise RuntimeError(f"boggle.py did not show its window:\n{errors}")
+    return elapsed
+
+
+def _summary(samples) -> str:
+    return (f"median {statistics.median(samples):8.1f} ms   "
+            f"min {min(samples):8.1f} ms")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    imports = [import_time("boggle") for _ in range(args.runs)]
+    print(f"import boggle         {_summary(imports)}")
+    try:
+        frames = [first_frame_time() * 1000 for _ in range(args.runs)]
+    except RuntimeError as error:
+        print(f"time to first frame: skipped ({str(error).splitlines()[-1]})")
+        return 0
+    print(f"time to first frame   {_summary(frames)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,102 @@
+"""
+Compares submitting many paths through BoggleLogic.after_submit in a loop
+with the batch API: submit_paths (paths packed on the fly) and
+submit_packed (paths packed beforehand, as a replay stores them). Every
+board gets all its words, some twice, and as many random walks.
+
+    python -m benchmarks.bench_submit_batch [--boards 200] [--repeat 5]
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import random
+import time
+
+from boggle_board_randomizer import randomize_board
+from boggle_cache import SolvedBoardCache
+from boggle_logic import BoggleLogic
+from boggle_path import BoardPath, pack_paths
+from boggle_trie import load_trie
+
+
+def random_walk(rows: int, cols: int, rng: random.Random) -> list:
+    """
+    :return: a legal random walk of 3 to 6 cells (usually not a word).
+    """
+    path = BoardPath(rows, cols)
+    row, col = rng.randrange(rows), rng.randrange(cols)
+    path.add(row, col)
+    for _ in range(rng.randint(2, 5)):
+        moves = [(row + dr, col + dc) for dr in (-1, 0, 1)
+                 for dc in (-1, 0, 1) if path.can_add(row + dr, col + dc)]
+        if not moves:
+            break
+        row, col = rng.choice(moves)
+        path.add(row, col)
+    return list(path)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--boards", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dictionary", default="boggle_dict.txt")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    trie = load_trie(args.dictionary)
+    cache = SolvedBoardCache()
+    games = []
+    for _ in range(args.boards):
+        board = randomize_board(rng=rng)
+        solutions, max_score = cache.solve(board, trie)
+        paths = list(solutions.values())
+        paths += rng.sample(paths, len(paths) // 4)
+        paths += [random_walk(len(board), len(board[0]), rng)
+                  for _ in range(len(paths))]
+        rng.shuffle(paths)
+        games.append((board, solutions, max_score, paths,
+                      pack_paths(paths, len(board), len(board[0]))))
+    trie.close()
+
+    def loop(logic, paths, _):
+        for path in paths:
+            logic.after_submit(path)
+
+    def batch(logic, paths, _):
+        logic.submit_paths(paths)
+
+    def packed(logic, _, packed_paths):
+        logic.submit_packed(*packed_paths)
+
+    submitted = sum(len(paths) for *_, paths, _ in games) * args.repeat
+    times = {}
+    results = {}
+    for name, submit in (("after_submit", loop), ("submit_paths", batch),
+                         ("submit_packed", packed)):
+        elapsed = 0.0
+        for _ in range(args.repeat):
+            logics = [BoggleLogic.from_solutions(board, solutions, max_score)
+                      for board, solutions, max_score, *_ in games]
+            start = time.perf_counter()
+            for logic, (*_, paths, packed_paths) in zip(logics, games):
+                submit(logic, paths, packed_paths)
+            elapsed += time.perf_counter() - start
+        times[name] = elapsed
+        results[name] = [(logic.get_score(), logic.get_words_found(),
+                          logic.get_paths_found()) for logic in logics]
+
+    # the three accept the same words, with the same paths and scores
+    assert results["submit_paths"] == results["after_submit"]
+    assert results["submit_packed"] == results["after_submit"]
+
+    print(f"{'submission':<14} {'ms':>8} {'paths/s':>10} {'speedup':>8}")
+    for name, elapsed in times.items():
+        print(f"{name:<14} {elapsed * 1000:8.1f} {submitted / elapsed:10.0f} "
+              f"{times['after_submit'] / elapsed:7.2f}x")
+    print(f"{submitted} paths on {args.boards} boards")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,62 @@
+"""
+Measures the time to add one word to the words found list as the list
+grows: the virtualized WordList against one canvas item per word and
+bbox("all") for the scroll region. Needs a display (e.g. Xvfb).
+
+    python -m benchmarks.bench_word_list [--words 5000] [--window 100]
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import time
+import tkinter as tk
+
+from boggle_word_list import WordList
+
+
+def _legacy_append(canvas: tk.Canvas, count: int, word: str) -> None:
+    canvas.create_text(40, 17 * (count + 2), text="* " + word)
+    canvas.config(scrollregion=canvas.bbox("all"))
+
+
+def _time_appends(append, words: int, window: int) -> list:
+    """
+    :return: the mean microseconds per append of every window of appends.
+    """
+    means = []
+    for start in range(0, words, window):
+        begin = time.perf_counter()
+        for index in range(start, start + window):
+            append(index, f"WORD{index}")
+        means.append((time.perf_counter() - begin) / window * 1e6)
+    return means
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--words", type=int, default=5000)
+    parser.add_argument("--window", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    root = tk.Tk()
+    scrollbar = tk.Scrollbar(root)
+    virtual = WordList(tk.Canvas(root, width=250, height=290), scrollbar,
+                       top=51)
+    legacy_canvas = tk.Canvas(root, width=250, height=290)
+
+    results = {
+        "virtualized": _time_appends(lambda _, word: virtual.append(word),
+                                     args.words, args.window),
+        "canvas item per word": _time_appends(
+            lambda index, word: _legacy_append(legacy_canvas, index + 1, word),
+            args.words, args.window),
+    }
+    root.destroy()
+
+    print(f"{'list':<22} {'first us/word':>14} {'last us/word':>13}")
+    for name, means in results.items():
+        print(f"{name:<22} {means[0]:14.1f} {means[-1]:13.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,239 @@
+"""
+An analysis tool for bench_solver: a per-board pre-filter of the
+dictionary, which rules out every word that needs a pair of letters no two
+adjacent cells of the board show, or more copies of a letter than the
+board has. It would narrow the words a dictionary scan searches; the trie
+solver (boggle_solver) needs no pre-filter, its search already stops at
+the first missing prefix.
+
+Every word is summarised by a bitset (its "mask") of the letter pairs it
+spells and of the letter copies it needs; the board gets the same bitset of
+what it offers, and a word can only be on the board if its mask is a
+subset of the board's. The words are indexed by the rarest bits of their
+masks (the ones fewest random boards offer), in a small tree a board only
+walks along the bits it offers, so a few thousand masks are checked per
+board instead of the whole dictionary. The masks and the index are
+computed in memory (a few seconds for the shipped dictionary).
+"""
+# -------------- I M P O R T S ----------------#
+import bisect
+import random
+from typing import Iterable, Iterator, List, Tuple
+
+from boggle_board_randomizer import randomize_board
+from boggle_path import Board, neighbours_table
+
+LETTERS_COUNT = 26
+# copies of a letter told apart, a word needing more is checked against 4
+MAX_COPIES = 4
+# bits 0..103: letter copies, letter * MAX_COPIES + copy
+_PAIRS_OFFSET = LETTERS_COUNT * MAX_COPIES
+# then one bit per unordered pair of letters (a pair and its reverse are
+# adjacent together): 104 + 351 bits
+MASK_BITS = _PAIRS_OFFSET + LETTERS_COUNT * (LETTERS_COUNT + 1) // 2
+# the rarest bits of a word (letter pairs or copies) its index key is made of
+KEY_BITS = 2
+
+
+def _pair_bit(first: int, second: int) -> int:
+    if first > second:
+        first, second = second, first
+    # index of (first, second) among the pairs with first <= second
+    index = first * LETTERS_COUNT - first * (first - 1) // 2 + second - first
+    return 1 << (_PAIRS_OFFSET + index)
+
+
+def _bit_rarity(boards: int = 1000) -> List[int]:
+    """
+    :return: for every bit of the masks, on how many of the given number of
+    seeded random boards it shows (the rarer, the fewer boards offer it).
+    """
+    rng = random.Random(0)
+    counts = [0] * MASK_BITS
+    for _ in range(boards):
+        bits = board_mask(randomize_board(rng=rng))
+        while bits:
+            low = bits & -bits
+            counts[low.bit_length() - 1] += 1
+            bits ^= low
+    return counts
+
+
+def _index_key(mask: int, rarity: List[int]) -> Tuple[int, ...]:
+    """
+    :return: the KEY_BITS rarest bits of the mask, rarest first.
+    """
+    bits = []
+    while mask:
+        low = mask & -mask
+        bits.append(low.bit_length() - 1)
+        mask ^= low
+    bits.sort(key=lambda bit: (rarity[bit], bit))
+    return tuple(bits[:KEY_BITS])
+
+
+def _build_index(keys: List[Tuple[int, ...]]) -> List[List[int]]:
+    """
+    Builds the index tree of the keys, which are sorted. A node is the
+    prefix of some keys: its words (the keys equal to it) and its children
+    (the prefixes one bit longer, sorted) are consecutive, its words first.
+    :return: the node lists (bit, first word, end of its words, first
+    child, end of its children), node 0 is the root.
+    """
+    bits, word_start, word_end, child_start, child_end = [0], [], [], [], []
+    # breadth first, so the children of a node get consecutive numbers
+    ranges = [(0, len(keys), 0)]
+    for start, end, depth in ranges:
+        own_end = start
+        while own_end < end and len(keys[own_end]) == depth:
+            own_end += 1
+        word_start.append(start)
+        word_end.append(own_end)
+        child_start.append(len(bits))
+        group = own_end
+        for index in range(own_end, end + 1):
+            if index == end or keys[index][depth] != keys[group][depth]:
+                if index > group:
+                    bits.append(keys[group][depth])
+                    ranges.append((group, index, depth + 1))
+                group = index
+        child_end.append(len(bits))
+    return [bits, word_start, word_end, child_start, child_end]
+
+
+def _letters(text: str) -> List[int]:
+    """
+    :return: the letters of text as 0..25, -1 for any other character.
+    """
+    return [ord(char) - 65 if "A" <= char <= "Z" else -1
+            for char in text.upper()]
+
+
+def _copies_mask(counts: List[int]) -> int:
+    mask = 0
+    for letter, count in enumerate(counts):
+        if count:
+            mask |= ((1 << min(count, MAX_COPIES)) - 1) << \
+                (letter * MAX_COPIES)
+    return mask
+
+
+def word_mask(word: str) -> int:
+    """
+    :return: the bitset of the letter copies and letter pairs the word
+    needs. Letters other than A..Z (other languages) are not checked.
+    """
+    letters = _letters(word)
+    counts = [0] * LETTERS_COUNT
+    mask = 0
+    for index, letter in enumerate(letters):
+        if letter < 0:
+            continue
+        counts[letter] += 1
+        if index and letters[index - 1] >= 0:
+            mask |= _pair_bit(letters[index - 1], letter)
+    return mask | _copies_mask(counts)
+
+
+def board_mask(board: Board) -> int:
+    """
+    :return: the bitset of the letter copies the board has and of the
+    letter pairs it can spell: inside a face ("QU") and from the last
+    letter of a face to the first letter of an adjacent one.
+    """
+    rows = len(board)
+    cols = len(board[0]) if rows else 0
+    faces = [_letters(board[row][col])
+             for row in range(rows) for col in range(cols)]
+    neighbours = neighbours_table(rows, cols)
+    counts = [0] * LETTERS_COUNT
+    mask = 0
+    for cell, face in enumerate(faces):
+        for index, letter in enumerate(face):
+            if letter >= 0:
+                counts[letter] += 1
+            if index and letter >= 0 and face[index - 1] >= 0:
+                mask |= _pair_bit(face[index - 1], letter)
+        for neighbour in neighbours[cell]:
+            last, first = face[-1], faces[neighbour][0]
+            if last >= 0 and first >= 0:
+                mask |= _pair_bit(last, first)
+    return mask | _copies_mask(counts)
+
+
+# -------------- W O R D  F I L T E R ----------------#
+class WordFilter:
+    """
+    The WordFilter class holds the words of a dictionary with their masks
+    and returns, for a board, the words that pass the pre-filter.
+
+
+    Attributes:
+    1. words: the words of the dictionary, sorted by their index key (the
+    rarest bits of their masks).
+    2. masks: the mask of every word (same order).
+    3. index: the index tree of the words, as node lists (see
+    _build_index).
+
+
+    API methods:
+    1. candidates -> List[str]: The words that may be on the board.
+    2. from_words -> WordFilter: Computes the masks of a word list.
+    """
+
+    def __init__(self, words: List[str], masks: List[int],
+                 index: List[List[int]]):
+        self.words = words
+        self.masks = masks
+        self.index = index
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "WordFilter":
+        words = sorted(set(words))
+        masks = [word_mask(word) for word in words]
+        rarity = _bit_rarity()
+        keys = [_index_key(mask, rarity) for mask in masks]
+        order = sorted(range(len(words)), key=keys.__getitem__)
+        return cls([words[index] for index in order],
+                   [masks[index] for index in order],
+                   _build_index([keys[index] for index in order]))
+
+    def candidates(self, board: Board) -> List[str]:
+        """
+        :return: the words whose letter pairs and letter copies the board
+        has, sorted. Every word of the board is among them; most are not on
+        it.
+        """
+        offered = board_mask(board)
+        missing = ~offered
+        present = bytes((offered >> bit) & 1 for bit in range(MASK_BITS))
+        offered_bits = [bit for bit in range(MASK_BITS) if present[bit]]
+        bits, word_start, word_end, child_start, child_end = self.index
+        masks = self.masks
+        kept = []
+        # the nodes whose bits the board all offers
+        nodes = [0]
+        while nodes:
+            node = nodes.pop()
+            start, end = word_start[node], word_end[node]
+            if start < end:
+                kept += [index for index in range(start, end)
+                         if not masks[index] & missing]
+            start, end = child_start[node], child_end[node]
+            if end - start > len(offered_bits):
+                # look the offered bits up among many children (sorted)
+                for bit in offered_bits:
+                    child = bisect.bisect_left(bits, bit, start, end)
+                    if child < end and bits[child] == bit:
+                        nodes.append(child)
+            else:
+                nodes += [child for child in range(start, end)
+                          if present[bits[child]]]
+        words = self.words
+        return sorted(words[index] for index in kept)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.words)
@@ -0,0 +1,90 @@
+"""
+Soak test of the game session: plays many consecutive games in one Tk
+window (start, a submission, game over, play again) and checks that memory
+and the number of widgets stay flat. Needs a display (e.g. Xvfb).
+
+    python -m benchmarks.soak_sessions [--games 1000] [--sample-every 100]
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import resource
+import time
+import tracemalloc
+from tkinter import messagebox
+
+from boggle import BoggleController
+from boggle_board_randomizer import randomize_board
+from boggle_cache import default_cache
+from boggle_gui import BoggleGUI
+from boggle_preparer import GamePreparer
+
+
+def _count_widgets(widget) -> int:
+    return 1 + sum(_count_widgets(child) for child in widget.winfo_children())
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--sample-every", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tolerance-kib", type=int, default=256,
+                        help="allowed growth of the lowest Python heap "
+                             "sample from the first to the second half")
+    args = parser.parse_args(argv)
+
+    # the scripted player always wants another game
+    messagebox.askyesno = lambda *_: True
+
+    preparer = GamePreparer(randomize_board, seed=args.seed)
+    gui = BoggleGUI()
+    controller = BoggleController(gui, preparer)
+    gui.set_controller(controller)
+    root = gui.get_main_window()
+
+    tracemalloc.start()
+    samples = []
+    start = time.perf_counter()
+    for game in range(1, args.games + 1):
+        controller.request_start()
+        while controller.get_games_started() < game:
+            root.update()
+            time.sleep(0.001)
+        controller.user_submission()
+        root.update()
+        # game over, the patched dialog answers "play again"
+        controller.game_is_over()
+        root.update()
+
+        # the first games warm up the caches of the interpreter and the GUI
+        if game % args.sample_every == 0:
+            # the solved boards cache is bounded on its own, keep it out
+            default_cache.clear()
+            current, _ = tracemalloc.get_traced_memory()
+            samples.append((game, current, _count_widgets(root),
+                            resource.getrusage(resource.RUSAGE_SELF)
+                            .ru_maxrss))
+    elapsed = time.perf_counter() - start
+    preparer.close()
+    root.destroy()
+
+    print(f"{'game':>6} {'heap KiB':>9} {'widgets':>8} {'max RSS KiB':>12}")
+    for game, current, widgets, max_rss in samples:
+        print(f"{game:>6} {current / 1024:9.1f} {widgets:>8} {max_rss:>12}")
+    print(f"{args.games} games in {elapsed:.1f}s")
+
+    # the next game is solved in the background while sampling, so the heap
+    # varies with the boards; a leak raises its floor
+    half = len(samples) // 2 or 1
+    growth = min(sample[1] for sample in samples[half:]) - \
+        min(sample[1] for sample in samples[:half])
+    widget_growth = samples[-1][2] - samples[0][2]
+    if growth > args.tolerance_kib * 1024 or widget_growth > 0:
+        print(f"memory is not flat: heap +{growth / 1024:.1f} KiB, "
+              f"widgets +{widget_growth}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,247 @@
+"""
+Benchmark suite of the game's hot paths on seeded boards and the shipped
+dictionary: dictionary load, board generation, solving, path validation,
+word submission and the words found list of the GUI.
+
+    python -m benchmarks.suite [--boards 20] [--output bench_results.json]
+    python -m benchmarks.suite --save-baseline
+    python -m benchmarks.suite --baseline benchmarks/baseline.json
+
+Every stage reports the mean, p50 and p99 latency of one operation, the
+throughput and the peak Python heap (tracemalloc, in a separate run so it
+does not slow the timed one). The results are written as JSON. Given a
+baseline (results of an earlier run on the same machine), a stage whose
+p50 got slower by more than --threshold is a regression and the exit code
+is 1. The GUI stage needs a display (e.g. Xvfb) and is skipped without one.
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from benchmarks.bench_solver import seeded_boards
+from boggle_board_randomizer import randomize_board
+from boggle_logic import BoggleLogic
+from boggle_path import is_valid_path
+from boggle_solver import max_score_paths, solve_board
+from boggle_trie import BoggleTrie, load_trie, read_words
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# a stage builds a fresh list of operations for each run
+Operations = List[Callable[[], object]]
+
+
+class StageResult(NamedTuple):
+    ops: int
+    mean_us: float
+    p50_us: float
+    p99_us: float
+    ops_per_sec: float
+    peak_kib: float
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def measure(prepare: Callable[[], Operations]) -> StageResult:
+    """
+    Times every operation of a fresh prepare() one by one, then runs
+    another fresh prepare() under tracemalloc for the peak memory.
+    """
+    operations = prepare()
+    latencies = []
+    total_start = time.perf_counter()
+    for operation in operations:
+        start = time.perf_counter()
+        operation()
+        latencies.append(time.perf_counter() - start)
+    total = time.perf_counter() - total_start
+
+    operations = prepare()
+    tracemalloc.start()
+    for operation in operations:
+        operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return StageResult(
+        ops=len(latencies),
+        mean_us=sum(latencies) / len(latencies) * 1e6,
+        p50_us=_percentile(latencies, 0.50) * 1e6,
+        p99_us=_percentile(latencies, 0.99) * 1e6,
+        ops_per_sec=len(latencies) / total if total else 0.0,
+        peak_kib=peak / 1024,
+    )
+
+
+# -------------- S T A G E S ----------------#
+def stages(args) -> Dict[str, Callable[[], Operations]]:
+    """
+    :return: the prepare function of every stage, by stage name.
+    """
+    trie = load_trie(args.dictionary)
+    boards = seeded_boards(args.boards, args.seed)
+    solved = [max_score_paths(board, trie) for board in boards]
+
+    def dictionary_compile() -> Operations:
+        return [lambda: BoggleTrie.from_words(read_words(args.dictionary))
+                for _ in range(3)]
+
+    def dictionary_open() -> Operations:
+        return [lambda: load_trie(args.dictionary).close()
+                for _ in range(50)]
+
+    def board_randomize() -> Operations:
+        rng = random.Random(args.seed)
+        return [lambda: randomize_board(rng=rng) for _ in range(1000)]
+
+    def board_solve() -> Operations:
+        return [lambda board=board: solve_board(board, trie)
+                for board in boards]
+
+    def board_max_score() -> Operations:
+        return [lambda board=board: max_score_paths(board, trie)
+                for board in boards]
+
+    def path_validate() -> Operations:
+        return [lambda board=board, path=path:
+                is_valid_path(board, path, trie)
+                for board, (paths, _) in zip(boards, solved)
+                for path in paths.values()]
+
+    def word_submit() -> Operations:
+        operations = []
+        for board, (paths, max_score) in zip(boards, solved):
+            logic = BoggleLogic.from_solutions(board, paths, max_score)
+            operations += [lambda logic=logic, path=path:
+                           logic.after_submit(path)
+                           for path in paths.values()]
+        return operations
+
+    return {
+        "dictionary_compile": dictionary_compile,
+        "dictionary_open": dictionary_open,
+        "board_randomize": board_randomize,
+        "board_solve": board_solve,
+        "board_max_score": board_max_score,
+        "path_validate": path_validate,
+        "word_submit": word_submit,
+    }
+
+
+def words_found_stage() -> Optional[Callable[[], Operations]]:
+    """
+    :return: the prepare function of the GUI's words found list, None if
+    Tk has no display.
+    """
+    import tkinter as tk
+    from boggle_word_list import WordList
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    root.withdraw()
+
+    def words_found_update() -> Operations:
+        canvas = tk.Canvas(root, width=250, height=290)
+        words = WordList(canvas, tk.Scrollbar(root), top=51)
+        return [lambda index=index: words.append(f"WORD{index}")
+                for index in range(2000)]
+
+    return words_found_update
+
+
+# -------------- B A S E L I N E ----------------#
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """
+    Prints the p50 of every stage next to the baseline.
+    :return: the names of the stages that regressed.
+    """
+    regressions = []
+    print(f"\n{'stage':<20} {'p50 us':>11} {'baseline':>11} {'change':>8}")
+    for name, stage in results["stages"].items():
+        base = baseline["stages"].get(name)
+        if base is None:
+            print(f"{name:<20} {stage['p50_us']:11.2f} {'-':>11} {'new':>8}")
+            continue
+        change = stage["p50_us"] / base["p50_us"] - 1 if base["p50_us"] \
+            else 0.0
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{name:<20} {stage['p50_us']:11.2f} {base['p50_us']:11.2f} "
+              f"{change:+8.1%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--boards", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dictionary", default="boggle_dict.txt")
+    parser.add_argument("--only", nargs="*", metavar="STAGE",
+                        help="run only these stages")
+    parser.add_argument("--output", default="bench_results.json",
+                        help="where to write the results")
+    parser.add_argument("--baseline", default=None,
+                        help="results to compare with "
+                             f"(e.g. {DEFAULT_BASELINE})")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"also write the results to {DEFAULT_BASELINE}")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed p50 slowdown against the baseline")
+    args = parser.parse_args(argv)
+
+    prepares = stages(args)
+    gui_stage = words_found_stage()
+    if gui_stage is not None:
+        prepares["words_found_update"] = gui_stage
+    else:
+        print("words_found_update: skipped, Tk has no display")
+    if args.only:
+        prepares = {name: prepare for name, prepare in prepares.items()
+                    if name in args.only}
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "boards": args.boards,
+        "seed": args.seed,
+        "stages": {},
+    }
+    print(f"{'stage':<20} {'ops':>6} {'mean us':>11} {'p50 us':>11} "
+          f"{'p99 us':>11} {'ops/s':>11} {'peak KiB':>9}")
+    for name, prepare in prepares.items():
+        result = measure(prepare)
+        results["stages"][name] = result._asdict()
+        print(f"{name:<20} {result.ops:>6} {result.mean_us:11.2f} "
+              f"{result.p50_us:11.2f} {result.p99_us:11.2f} "
+              f"{result.ops_per_sec:11.1f} {result.peak_kib:9.1f}")
+
+    paths = [args.output] + ([DEFAULT_BASELINE] if args.save_baseline else [])
+    for path in paths:
+        with open(path, "w") as results_file:
+            json.dump(results, results_file, indent=2)
+            results_file.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file),
+                                  args.threshold)
+        if regressions:
+            print(f"regressions: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
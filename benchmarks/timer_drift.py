@@ -0,0 +1,96 @@
+"""
+Checks that the game timer does not drift when its ticks run late: plays a
+game on a simulated clock where every tick is delayed by a random load, and
+compares when the game ends with the old count down (one decrement per
+after(1000) tick).
+
+    python -m benchmarks.timer_drift [--max-delay-ms 300] [--seed 0]
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import random
+
+from boggle_timer import GAME_SECONDS, GameTimer
+
+
+class SimulatedClock:
+    """
+    A monotonic clock that only moves when advanced.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def play_timer(load, pause_at: float = 0.0, pause_for: float = 0.0) -> float:
+    """
+    Runs GameTimer the way the GUI does: every tick is scheduled after
+    next_tick_delay (rounded up to whole ms) and runs late by load().
+    :return: the simulated time at which the game ended.
+    """
+    clock = SimulatedClock()
+    timer = GameTimer(clock=clock)
+    timer.start()
+    paused = False
+    while not timer.is_over():
+        delay_ms = int(timer.next_tick_delay() * 1000) + 1
+        clock.now += delay_ms / 1000 + load()
+        if pause_for and not paused and clock.now >= pause_at:
+            paused = True
+            timer.pause()
+            clock.now += pause_for
+            timer.resume()
+    return clock.now
+
+
+def play_countdown(load) -> float:
+    """
+    The old timer: decrements a counter on every after(1000) tick.
+    :return: the simulated time at which the game ended.
+    """
+    now, seconds = 0.0, GAME_SECONDS
+    while seconds >= 1:
+        seconds -= 1
+        now += 1.0 + load()
+    return now
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--max-delay-ms", type=float, default=300.0,
+                        help="largest extra delay of a tick")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+
+    def load() -> float:
+        return rng.uniform(0, args.max_delay_ms / 1000)
+
+    # a tick is at most one late tick (plus a ms of rounding) past the end
+    tolerance = args.max_delay_ms / 1000 + 0.002
+    checks = {
+        "deadline timer": (play_timer(load), GAME_SECONDS),
+        "deadline timer, paused 30s": (play_timer(load, 60.0, 30.0),
+                                       GAME_SECONDS + 30.0),
+        "tick count down": (play_countdown(load), GAME_SECONDS),
+    }
+
+    failed = False
+    print(f"{'timer':<28} {'ended at':>9} {'drift':>8}")
+    for name, (ended, expected) in checks.items():
+        drift = ended - expected
+        print(f"{name:<28} {ended:9.3f} {drift:+8.3f}")
+        if name.startswith("deadline") and not 0 <= drift <= tolerance:
+            failed = True
+    if failed:
+        print("the deadline timer drifted")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
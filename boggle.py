@@ -1,10 +1,23 @@
 # -------------- I M P O R T S ----------------#
 # from ex11_utils import *
-from boggle_gui import *
-from boggle_logic import *
+import argparse
+import getpass
+import os
+import time
+from collections import deque
+from functools import partial
+
+from boggle_board_randomizer import BOARD_SIZE, load_dice, randomize_board
+from boggle_gui import BoggleGUI
+# the profiler, the dictionary, the game history and the replay log are
+# imported by main once the window is shown (see create_controller)
 
 
 # -------------- GAME RUNNER ----------------#
+# milliseconds between two polls of the preparer while a game is not ready
+POLL_MS = 20
+# how many of the last start latencies the controller keeps
+LATENCY_HISTORY = 100
 
 
 class BoggleController:
@@ -16,36 +29,107 @@ class BoggleController:
 
 
     Attributes:
-    1. words: a set of words that are used for the game
+    1. preparer: a GamePreparer that loads the words and solves the boards
+    in a background thread
     2. gui: an object of the BoggleGUI class that represents the GUI of the game
-    3. logic: an object of the BoggleLogic class that represents the logic of the game
+    3. logic: an object of the BoggleLogic class that represents the logic of
+    the game, None until the first game is ready
+    4. start_latencies: seconds the user waited from clicking start until
+    each of the last games was shown
+    5. history: an optional HistoryStore every finished game is recorded in
+    6. player: the name the games are recorded under
+    7. replay_log: an optional ReplayWriter the seed, board and every
+    submission of the games are logged to
 
 
     Methods:
-    1. __init__: Initializes the class by setting the words, GUI object, and logic object.
-    2. user_submission: Handles the user's submission when s/he submits a word.
-    3. game_is_over: Ends the game by calling the game_over method of the gui
+    1. __init__: Initializes the class by setting the preparer and GUI object.
+    2. request_start: Starts the game as soon as the preparer has it ready.
+    3. user_submission: Handles the user's submission when s/he submits a word.
+    4. game_is_over: Ends the game by calling the game_over method of the gui
     object and passing the score.
-    4. new_game: Creates new game objects and starts a new game.
-    5. run: Runs the main loop of the game.
+    5. new_game: Resets the GUI for a new game in the same window.
+    6. get_hint_count: Returns how many words left to find start with a prefix.
+    7. run: Runs the main loop of the game.
     """
 
-    def __init__(self, gui_obj, board):
+    def __init__(self, gui_obj, preparer, history=None, player="player",
+                 dictionary="default", replay_log=None):
 
         """
-        This function initializes the Boggle controller, it takes two arguments, a gui_obj and board.
-        It first retrieves a set of all possible words from a dictionary file,
-        then it creates the gui and logic objects, passing the board and words set to the logic object.
+        This function initializes the Boggle controller, it takes two arguments, a gui_obj and a preparer.
+        The preparer is already loading the dictionary and solving the first
+        board in the background, so nothing here blocks the GUI.
+        If a history store is given, every finished game is recorded in it
+        under the player's name (and the name of the dictionary), and if a
+        replay log is given every game can be replayed from it.
         """
+        self._gui = gui_obj
+        self._preparer = preparer
+        self._history = history
+        self._player = player
+        self._dictionary = dictionary
+        self._replay_log = replay_log
+        self._logic = None
+        self._start_latencies = deque(maxlen=LATENCY_HISTORY)
+        self._games_started = 0
+        self._start_requested_at = None
+        # whether the game of the next start must be requested (it failed)
+        self._retry_request = False
 
-        # Step 1: get all possible words
-        self._words = get_words_set("boggle_dict.txt")
+    # ------------ class encapsulated helpers ------------ #
+    def __wait_for_game(self):
+        """
+        Polls the preparer's queue from the Tk mainloop (with after), and
+        shows the game once it is ready. The next game is then requested
+        right away, so it is solved while this one is played.
+        If the preparer failed, the user is told and gets the Start button
+        back; another game is requested when they click it again.
+        """
+        try:
+            game = self._preparer.poll()
+        except RuntimeError as error:
+            self._retry_request = True
+            self._gui.start_failed(f"The game could not be prepared:\n"
+                                   f"{error.__cause__ or error}")
+            return
+        if game is None:
+            self._gui.get_main_window().after(POLL_MS, self.__wait_for_game)
+            return
 
-        # Step 2: create gui and logic objects
-        self._gui = gui_obj
-        self._logic = BoggleLogic(board, self._words)
+        self._logic = game.logic
+        self._gui.start_game(game.board)
+        if self._replay_log is not None:
+            self._replay_log.start_game(game.seed, game.board,
+                                        self._dictionary, game.checksum)
+        self._start_latencies.append(
+            time.perf_counter() - self._start_requested_at)
+        self._games_started += 1
+        self._preparer.request()
 
     # ------------ class API ------------ #
+    def request_start(self):
+        """
+        This function is called when the user clicks the start button.
+        It starts the game as soon as its board is solved (immediately if the
+        preparer already solved it).
+        """
+        self._start_requested_at = time.perf_counter()
+        if self._retry_request:
+            self._retry_request = False
+            self._preparer.request()
+        self.__wait_for_game()
+
+    def get_start_latencies(self):
+        """
+        This function returns the seconds the user waited after clicking
+        start, for the last LATENCY_HISTORY games.
+        """
+        return list(self._start_latencies)
+
+    def get_games_started(self):
+        return self._games_started
+
     def user_submission(self):
         """
         This function handles the user's submission of a word after clicking
@@ -61,6 +145,8 @@ class BoggleController:
 
         # check if it is a word on board
         is_a_word = self._logic.after_submit(path)
+        if self._replay_log is not None:
+            self._replay_log.submit(path, is_a_word, self._logic.get_score())
 
         if is_a_word:
 
@@ -84,44 +170,157 @@ class BoggleController:
         else:
             self._gui.try_again()
 
+        # the temp word was reset, show the words left
+        self._gui.update_hint_label()
+
     def get_all_words_found(self):
         """
         This function return all words found by user.
         """
         return self._logic.get_words_found()
 
+    def get_hint_count(self, prefix):
+        """
+        This function returns how many words left to find start with prefix.
+        """
+        return self._logic.get_hint_count(prefix)
+
     def game_is_over(self):
         """
         This function triggers when the game is over.
-        It retrieves the final score from the game logic and passes it to the
-        GUI to display the game over screen with the final score.
+        It retrieves the final score and the best possible score from the game
+        logic and passes them to the GUI to display the game over screen.
         """
+        if self._history is not None:
+            # already imported with the history store (create_controller)
+            from boggle_history import GameRecord
+
+            # queued, the history store writes it in its own thread
+            self._history.record_game(GameRecord(
+                self._player, self._gui.get_board(), self._logic.get_score(),
+                self._logic.get_max_score(),
+                list(zip(self._logic.get_words_found(),
+                         self._logic.get_paths_found())),
+                self._dictionary))
+        if self._replay_log is not None:
+            self._replay_log.end_game(self._logic.get_score(),
+                                      self._logic.get_max_score())
         score = str(self._logic.get_score())
-        self._gui.game_over(score)
+        max_score = str(self._logic.get_max_score())
+        self._gui.game_over(score, max_score)
 
     def new_game(self):
         """
         This function starts a new game.
-        It first destroys the current main window of the GUI, then creates new
-        instances of the BoggleGUI, BoggleController, and the board.
-        It then sets the controller for the new GUI and starts the game by
-        running the new controller.
+        It resets the GUI to the cover of a new game in the same main window;
+        the main window, its images, the dictionary and the preparer (which
+        already solved the next board) are reused, only the per-game state
+        is new. The logic of the new game is set when the user clicks start.
         """
-        # destroy pre root:
-        self._gui.get_main_window().destroy()
-
-        # create new game objects
-        new_gui = BoggleGUI()
-        new_cont = BoggleController(new_gui, new_gui.get_board())
-        new_gui.set_controller(new_cont)
-        new_cont.run()
+        self._logic = None
+        self._gui.reset()
 
     def run(self) -> None:
-        self._gui.run()
+        """
+        Runs the main loop of the game (once, for all the games) and stops
+        the preparer (and writes the history) when the window is closed.
+        """
+        try:
+            self._gui.run()
+        finally:
+            self._preparer.close()
+            if self._history is not None:
+                self._history.close()
+            if self._replay_log is not None:
+                self._replay_log.close()
 
 
-if __name__ == "__main__":
+def parse_args(argv=None):
+    """
+    Parses the command line: the board options (--rows, --cols, --dice),
+    the word list (--dictionary), the game history (--player, --history,
+    --no-history), the replay log (--replay-log, --no-replay-log) and the
+    profiling options (--profile, --cprofile).
+    """
+    parser = argparse.ArgumentParser(description="Play Boggle.")
+    parser.add_argument("--rows", type=int, default=BOARD_SIZE)
+    parser.add_argument("--cols", type=int, default=None)
+    parser.add_argument("--dice", default=None,
+                        help="dice definition file, e.g. dice/big_boggle.txt")
+    parser.add_argument("--dictionary", default=None,
+                        help="word list, one word per line (plain or .gz, "
+                             "default: boggle_dict.txt)")
+    parser.add_argument("--player", default=getpass.getuser(),
+                        help="name the games are recorded under")
+    parser.add_argument("--history", default=None,
+                        help="SQLite file of the game history "
+                             "(default: boggle_history.sqlite3)")
+    parser.add_argument("--no-history", action="store_true",
+                        help="do not record the games")
+    parser.add_argument("--replay-log", default=None,
+                        help="file the games are logged to for replays "
+                             "(default: boggle_games.replay)")
+    parser.add_argument("--no-replay-log", action="store_true",
+                        help="do not log the games")
+    parser.add_argument("--profile", nargs="?", const=".", default=None,
+                        metavar="DIR",
+                        help="write a timing report of every game to DIR "
+                             "(also enabled by $BOGGLE_PROFILE)")
+    parser.add_argument("--cprofile", action="store_true", default=None,
+                        help="with --profile, also dump cProfile stats")
+    return parser.parse_args(argv)
+
+
+def board_factory(args):
+    """
+    Returns a function that creates boards of the size and dice given on
+    the command line.
+    """
+    if args.dice:
+        return partial(randomize_board, load_dice(args.dice),
+                       rows=args.rows, cols=args.cols)
+    return partial(randomize_board, rows=args.rows, cols=args.cols)
+
+
+def create_controller(gui, args):
+    """
+    Creates the controller of the games with what they need: the preparer
+    (which loads the dictionary and solves the first board in its own
+    thread), the game history and the replay log. Their modules are only
+    imported here, after the window is shown.
+    """
+    from boggle_history import DEFAULT_HISTORY_PATH, HistoryStore
+    from boggle_preparer import GamePreparer
+    from boggle_replay import DEFAULT_REPLAY_PATH, ReplayWriter
+    from boggle_trie import DEFAULT_DICT_PATH
+
+    dictionary = args.dictionary or DEFAULT_DICT_PATH
+    preparer = GamePreparer(board_factory(args), dictionary)
+    history = None if args.no_history else \
+        HistoryStore(args.history or DEFAULT_HISTORY_PATH)
+    replay_log = None if args.no_replay_log else \
+        ReplayWriter(args.replay_log or DEFAULT_REPLAY_PATH)
+    return BoggleController(gui, preparer, history, args.player, dictionary,
+                            replay_log)
+
+
+def main(argv=None) -> None:
+    """
+    Runs the game: the window and its cover are drawn first, everything
+    else is loaded after (and the dictionary in the background).
+    """
+    args = parse_args(argv)
+    if args.profile or os.environ.get("BOGGLE_PROFILE"):
+        import boggle_profile
+
+        # instruments the classes before any game object exists
+        boggle_profile.enable(args.profile, args.cprofile, BoggleController)
     gui = BoggleGUI()
-    cont = BoggleController(gui, gui.get_board())
+    gui.get_main_window().update()
+    cont = create_controller(gui, args)
     gui.set_controller(cont)
     cont.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Vectorized analysis of many boards at once, for difficulty statistics over
+millions of boards. Needs numpy (optional, only this module uses it):
+
+    pip install numpy
+
+A batch of boards is an (N, rows, cols) uint8 array of face codes: 'A'..'Z'
+are 0..25 and the "QU" face is 26 (QU_CODE). Boards are generated directly
+as such arrays (random_boards) or converted from the game's lists of
+strings (encode_boards / decode_board), and the features are computed for
+the whole batch with numpy instead of looping over the cells in Python.
+"""
+# -------------- I M P O R T S ----------------#
+from typing import Iterable, List, Optional, Union
+
+from boggle_board_randomizer import BOARD_SIZE, LETTERS
+from boggle_path import Board
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+FACES = [chr(ord("A") + code) for code in range(26)] + ["QU"]
+FACE_CODES = {face: code for code, face in enumerate(FACES)}
+QU_CODE = FACE_CODES["QU"]
+FACE_COUNT = len(FACES)
+
+# the 4 directions whose pairs, with their reverses, are all the adjacent
+# pairs of cells of a board
+_HALF_DIRECTIONS = [(0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("boggle_batch needs numpy (pip install numpy)")
+
+
+def _face_code(face: str) -> int:
+    try:
+        return FACE_CODES[face.upper()]
+    except KeyError:
+        raise ValueError(f"no face code for {face!r}") from None
+
+
+# -------------- E N C O D I N G ----------------#
+def encode_boards(boards: Iterable[Board]) -> "np.ndarray":
+    """
+    :return: the boards (all of the same size) as an (N, rows, cols) uint8
+    array of face codes.
+    """
+    _require_numpy()
+    return np.array([[[_face_code(face) for face in row] for row in board]
+                     for board in boards], dtype=np.uint8)
+
+
+def decode_board(codes: "np.ndarray") -> Board:
+    """
+    :return: one (rows, cols) array of face codes as the game's board.
+    """
+    return [[FACES[code] for code in row] for row in codes.tolist()]
+
+
+def dice_array(dice_list: List[List[str]] = LETTERS) -> "np.ndarray":
+    """
+    :return: the dice as a (dice, faces) uint8 array of face codes, every
+    die must have the same number of faces.
+    """
+    _require_numpy()
+    if len({len(die) for die in dice_list}) != 1:
+        raise ValueError("every die must have the same number of faces")
+    return np.array([[_face_code(face) for face in die]
+                     for die in dice_list], dtype=np.uint8)
+
+
+def random_boards(count: int, dice_list: List[List[str]] = LETTERS,
+                  rows: int = BOARD_SIZE, cols: Optional[int] = None,
+                  rng: Union[None, int, "np.random.Generator"] = None
+                  ) -> "np.ndarray":
+    """
+    Rolls count boards like randomize_board does (the dice are shuffled
+    over the cells, reused if the board has more cells than dice, and each
+    shows a random face), all at once.
+    :param rng: a numpy Generator or a seed.
+    :return: an (count, rows, cols) uint8 array of face codes.
+    """
+    _require_numpy()
+    cols = rows if cols is None else cols
+    cells = rows * cols
+    rng = np.random.default_rng(rng)
+    dice = dice_array(dice_list)
+    dice_count, face_count = dice.shape
+
+    slots = np.arange(max(cells, dice_count)) % dice_count
+    order = rng.permuted(np.broadcast_to(slots, (count, len(slots))),
+                         axis=1)[:, :cells]
+    faces = rng.integers(0, face_count, size=(count, cells))
+    return dice[order, faces].reshape(count, rows, cols)
+
+
+# -------------- F E A T U R E S ----------------#
+def letter_counts(boards: "np.ndarray") -> "np.ndarray":
+    """
+    :return: an (N, FACE_COUNT) array, how many times each face shows on
+    each board.
+    """
+    _require_numpy()
+    count = len(boards)
+    flat = boards.reshape(count, -1).astype(np.intp)
+    flat += (np.arange(count) * FACE_COUNT)[:, None]
+    return np.bincount(flat.ravel(), minlength=count * FACE_COUNT) \
+        .reshape(count, FACE_COUNT)
+
+
+def _pair_codes(boards: "np.ndarray") -> "np.ndarray":
+    """
+    :return: an (N, pairs) array with the code first * FACE_COUNT + second
+    of every ordered pair of faces on adjacent cells (both directions).
+    """
+    _, rows, cols = boards.shape
+    # 27 * 27 codes fit in 16 bits, small arrays are faster to combine
+    codes = boards.astype(np.int16)
+    pair_codes = []
+    for d_row, d_col in _HALF_DIRECTIONS:
+        first = codes[:, max(0, -d_row):rows - max(0, d_row),
+                      max(0, -d_col):cols - max(0, d_col)]
+        second = codes[:, max(0, d_row):rows - max(0, -d_row),
+                       max(0, d_col):cols - max(0, -d_col)]
+        pair_codes += [(first * FACE_COUNT + second).reshape(len(codes), -1),
+                       (second * FACE_COUNT + first).reshape(len(codes), -1)]
+    return np.concatenate(pair_codes, axis=1)
+
+
+def adjacency_pairs(boards: "np.ndarray", chunk: int = 256) -> "np.ndarray":
+    """
+    Counts the ordered pairs of faces on adjacent cells (the 8 neighbours),
+    so pairs[n, a, b] == pairs[n, b, a] is the number of places where a and
+    b touch on board n.
+    :return: an (N, FACE_COUNT, FACE_COUNT) array (N * 729 counts, chunk
+    big batches or use bigram_coverage), of the smallest unsigned type
+    holding every pair of a board (uint8 up to 255 pairs). Boards are
+    counted chunk at a time, so the counts of a chunk stay in the cache.
+    """
+    _require_numpy()
+    count, rows, cols = boards.shape
+    board_pairs = 2 * sum((rows - abs(d_row)) * (cols - abs(d_col))
+                          for d_row, d_col in _HALF_DIRECTIONS)
+    pairs = np.empty((count, FACE_COUNT, FACE_COUNT),
+                     dtype=np.min_scalar_type(board_pairs))
+    squares = FACE_COUNT * FACE_COUNT
+    offsets = (np.arange(min(chunk, count), dtype=np.int32) * squares)[:, None]
+    for start in range(0, count, chunk):
+        pair_codes = _pair_codes(boards[start:start + chunk])
+        size = len(pair_codes)
+        pairs[start:start + size] = np.bincount(
+            (pair_codes + offsets[:size]).ravel(), minlength=size * squares) \
+            .reshape(size, FACE_COUNT, FACE_COUNT)
+    return pairs
+
+
+def word_bigrams(words: Iterable[str]) -> "np.ndarray":
+    """
+    :return: a (FACE_COUNT, FACE_COUNT) bool array, True for every pair of
+    faces that follow each other in some word ("QU" is one face, a word
+    with a Q and no U after it cannot be spelled and is skipped).
+    """
+    _require_numpy()
+    bigrams = np.zeros((FACE_COUNT, FACE_COUNT), dtype=bool)
+    for word in words:
+        word = word.upper()
+        if "Q" in word.replace("QU", ""):
+            continue
+        codes = [QU_CODE if face == "\0" else FACE_CODES.get(face, -1)
+                 for face in word.replace("QU", "\0")]
+        if -1 in codes:
+            continue
+        bigrams[codes[:-1], codes[1:]] = True
+    return bigrams
+
+
+def bigram_coverage(boards: "np.ndarray", bigrams: "np.ndarray",
+                    chunk: int = 65536) -> "np.ndarray":
+    """
+    :param bigrams: the pairs to look for, as returned by word_bigrams.
+    :return: an (N,) float array, the fraction of the bigrams that some
+    pair of adjacent cells of each board spells. Boards are processed
+    chunk at a time to bound the memory, without the (N, 729) matrices of
+    adjacency_pairs.
+    """
+    _require_numpy()
+    total = bigrams.sum()
+    coverage = np.zeros(len(boards))
+    if not total:
+        return coverage
+    wanted = bigrams.ravel()
+    for start in range(0, len(boards), chunk):
+        pair_codes = _pair_codes(boards[start:start + chunk])
+        # the wanted pairs of each board, sorted, to count each one once
+        found = np.sort(np.where(wanted[pair_codes], pair_codes, -1), axis=1)
+        distinct = (found[:, 1:] != found[:, :-1]) & (found[:, 1:] >= 0)
+        coverage[start:start + chunk] = \
+            (distinct.sum(axis=1) + (found[:, 0] >= 0)) / total
+    return coverage
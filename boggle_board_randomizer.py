@@ -5,7 +5,7 @@
 # DESCRIPTION:A helper file for ex11 that randomizes a Boggle board
 ##############################################################################
 import random
-from typing import List
+from typing import List, Optional
 
 
 BOARD_SIZE = 4
@@ -29,21 +29,49 @@ LETTERS = [
 ]
 
 
-def randomize_board(dice_list: List[List[str]] = LETTERS) -> List[List[str]]:
+def load_dice(dice_path: str) -> List[List[str]]:
+    """
+    Loads a dice definition file: one die per line, its faces separated by
+    spaces or commas ("QU" is a single face). Empty lines and lines starting
+    with '#' are ignored.
+    :param dice_path: path of the dice file.
+    :return: 2-dimensional list of letters, as LETTERS.
+    """
+    dice_list = []
+    with open(dice_path, encoding="utf-8") as dice_file:
+        for line in dice_file:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                dice_list.append(line.upper().replace(",", " ").split())
+    return dice_list
+
+
+def randomize_board(dice_list: List[List[str]] = LETTERS,
+                    rng: random.Random = random,
+                    rows: int = BOARD_SIZE,
+                    cols: Optional[int] = None) -> List[List[str]]:
     """
     Creates a random Boggle board.
     :param dice_list: 2-dimensional list of letters to generate the board from.
+    :param rng: source of randomness, pass random.Random(seed) for a
+    reproducible board.
+    :param rows: number of rows of the board.
+    :param cols: number of columns of the board (rows if not given).
+    If the board has more cells than there are dice, dice are used again.
     :return: a 2D list of strings representing a random Boggle board.
     """
-    dice_indices = list(range(len(dice_list)))
-    random.shuffle(dice_indices)
+    cols = rows if cols is None else cols
+    dice_count = len(dice_list)
+    dice_indices = [i % dice_count
+                    for i in range(max(rows * cols, dice_count))]
+    rng.shuffle(dice_indices)
     dice_indices_iter = iter(dice_indices)
     board = []
-    for i in range(BOARD_SIZE):
+    for i in range(rows):
         row = []
-        for j in range(BOARD_SIZE):
+        for j in range(cols):
             die = dice_list[next(dice_indices_iter)]
-            letter = random.choice(die)
+            letter = rng.choice(die)
             row.append(letter)
         board.append(row)
     return board
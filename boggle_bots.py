@@ -0,0 +1,288 @@
+"""
+Simulated players for load testing and single-player practice: bots that
+play a solved board, each against its own BoggleLogic, as the players of a
+server room do.
+
+    python -m boggle_bots --bots 500 --skill casual --seconds 180
+
+A bot's skill (BotSkill) is the chance it finds a word, by the length of the
+word and by how common its letters are, and the pace it finds words at.
+When a bot joins a game it draws which words of the board's solutions it
+will find and when, a sorted discovery schedule; playing is then only
+taking the words that came due since the bot's last turn and submitting
+them together through BoggleLogic.submit_packed (the schedule is packed
+once), so hundreds of bots per process cost a bisect and one call per bot
+and tick.
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import bisect
+import random
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from boggle_board_randomizer import randomize_board
+from boggle_cache import SolvedBoardCache
+from boggle_logic import BoggleLogic
+from boggle_path import Board, Path, pack_paths
+from boggle_state import SolvedBoard
+from boggle_timer import GAME_SECONDS
+from boggle_trie import DEFAULT_DICT_PATH, load_trie
+
+# how often every letter is used in English text, in percent. There is no
+# word frequency list next to the dictionary, so how common a word is is
+# told by its rarest letter
+LETTER_FREQUENCIES = {
+    "E": 12.7, "T": 9.1, "A": 8.2, "O": 7.5, "I": 7.0, "N": 6.7, "S": 6.3,
+    "H": 6.1, "R": 6.0, "D": 4.3, "L": 4.0, "C": 2.8, "U": 2.8, "M": 2.4,
+    "W": 2.4, "F": 2.2, "G": 2.0, "Y": 2.0, "P": 1.9, "B": 1.5, "V": 0.98,
+    "K": 0.77, "J": 0.15, "X": 0.15, "Q": 0.095, "Z": 0.074,
+}
+# a word whose letters are all at least this frequent is a common word
+COMMON_FREQUENCY = 2.0
+
+
+class BotSkill(NamedTuple):
+    # words found per minute, on average
+    words_per_minute: float
+    # the chance of finding a word of 3, 4, 5... letters; the last one is
+    # used for longer words too
+    length_chances: Tuple[float, ...]
+    # how much rare letters hide a word: the chance is multiplied by the
+    # word's commonness to this power (0 for a bot that does not mind)
+    rarity_aversion: float = 1.0
+
+
+SKILLS: Dict[str, BotSkill] = {
+    "beginner": BotSkill(6.0, (0.5, 0.3, 0.12, 0.04, 0.01, 0.0), 1.0),
+    "casual": BotSkill(12.0, (0.75, 0.55, 0.3, 0.12, 0.05, 0.02), 0.6),
+    "expert": BotSkill(30.0, (0.95, 0.9, 0.75, 0.55, 0.35, 0.2), 0.2),
+}
+
+
+def word_commonness(word: str) -> float:
+    """
+    :return: 1.0 for a word of common letters, less the rarer its rarest
+    letter is (letters other than A..Z do not count).
+    """
+    rarest = min((LETTER_FREQUENCIES[letter] for letter in word
+                  if letter in LETTER_FREQUENCIES), default=COMMON_FREQUENCY)
+    return min(1.0, rarest / COMMON_FREQUENCY)
+
+
+def find_chance(word: str, skill: BotSkill) -> float:
+    """
+    :return: the chance a bot of the given skill finds the word.
+    """
+    chances = skill.length_chances
+    chance = chances[min(max(len(word) - 3, 0), len(chances) - 1)]
+    return chance * word_commonness(word) ** skill.rarity_aversion
+
+
+def word_chances(words: Iterable[str],
+                 skill: BotSkill) -> List[Tuple[str, float]]:
+    """
+    :return: every word with the chance a bot of the given skill finds it,
+    in sorted order (computed once per game and skill).
+    """
+    return [(word, find_chance(word, skill)) for word in sorted(words)]
+
+
+def plan_discoveries(solutions: Dict[str, Path],
+                     chances: List[Tuple[str, float]], skill: BotSkill,
+                     duration: float,
+                     rng: random.Random) -> List[Tuple[float, Path]]:
+    """
+    Draws the words a bot finds on a board (chances as word_chances of the
+    board's solutions) and the second it finds each one at, with
+    exponential gaps of words_per_minute on average.
+    :return: the (second, path) of every word found before duration, in
+    time order.
+    """
+    words = [word for word, chance in chances if rng.random() < chance]
+    rng.shuffle(words)
+    rate = skill.words_per_minute / 60
+    schedule = []
+    elapsed = 0.0
+    for word in words:
+        elapsed += rng.expovariate(rate)
+        if elapsed >= duration:
+            break
+        schedule.append((elapsed, solutions[word]))
+    return schedule
+
+
+class Bot:
+    """
+    The Bot class is a simulated player of one game.
+
+
+    Attributes:
+    1. name: the name of the bot.
+    2. skill: the BotSkill it plays with.
+    3. logic: its BoggleLogic of the game's board.
+    4. _times: the second every word of its schedule is found at, sorted.
+    5. _cells, _offsets: the paths of the words of its schedule (same
+    order), packed once (boggle_path.pack_paths).
+    6. _submitted: how many words of the schedule were submitted.
+
+
+    API methods:
+    1. play -> int: Submits the words found up to a second of the game.
+    2. get_score -> int: The score of the bot.
+    3. is_done -> bool: Whether every word of the schedule was submitted.
+    """
+
+    def __init__(self, name: str, skill: BotSkill, board: Board,
+                 logic: BoggleLogic, schedule: List[Tuple[float, Path]]):
+        self.name = name
+        self.skill = skill
+        self.logic = logic
+        self._times = [second for second, _ in schedule]
+        self._cells, self._offsets = pack_paths(
+            [path for _, path in schedule], len(board), len(board[0]))
+        self._submitted = 0
+
+    # ------------ class API ------------ #
+    def play(self, elapsed: float) -> int:
+        """
+        Submits, in one batch, the words found since the last turn.
+        :return: the number of new words.
+        """
+        due = bisect.bisect_right(self._times, elapsed)
+        if due <= self._submitted:
+            return 0
+        # the offsets of the due paths, into all the packed cells
+        result = self.logic.submit_packed(
+            self._cells, self._offsets[self._submitted:due + 1])
+        self._submitted = due
+        return len(result.words) - result.words.count(None)
+
+    def get_score(self) -> int:
+        return self.logic.get_score()
+
+    def is_done(self) -> bool:
+        return self._submitted == len(self._times)
+
+
+class BotGame:
+    """
+    The BotGame class is one game of a solved board played by bots; the
+    board is solved once and shared by all of them.
+
+
+    Attributes:
+    1. board: the board of the game.
+    2. duration: the length of the game in seconds.
+    3. bots: the bots of the game, in the order they joined.
+    4. _solutions: every word on the board with its best path.
+    5. _solved: the SolvedBoard shared by the games of the bots.
+    6. _chances: the word_chances of the board for every skill played.
+    7. _rng: the source of the seeds of the bots.
+
+
+    API methods:
+    1. add_bot -> Bot: Adds a bot of a skill, with its own schedule.
+    2. tick -> int: Lets every bot play up to a second of the game.
+    3. run -> int: Plays the whole game on a simulated clock.
+    4. standings -> List[Tuple[str, int]]: The bots by score.
+    """
+
+    # the class of the bots added
+    bot_class = Bot
+
+    def __init__(self, board: Board, solutions: Dict[str, Path],
+                 max_score: int, duration: float = GAME_SECONDS,
+                 seed: Optional[int] = None):
+        self.board = board
+        self.duration = duration
+        self.bots: List[Bot] = []
+        self._solutions = solutions
+        self._solved = SolvedBoard(board, solutions, max_score)
+        self._chances: Dict[BotSkill, List[Tuple[str, float]]] = {}
+        self._rng = random.Random(seed)
+
+    # ------------ class API ------------ #
+    def add_bot(self, skill: BotSkill, name: Optional[str] = None,
+                seed: Optional[int] = None) -> Bot:
+        rng = random.Random(self._rng.getrandbits(64) if seed is None
+                            else seed)
+        chances = self._chances.get(skill)
+        if chances is None:
+            chances = word_chances(self._solutions, skill)
+            self._chances[skill] = chances
+        logic = BoggleLogic.from_solved(self._solved)
+        bot = self.bot_class(name or f"bot-{len(self.bots) + 1}", skill,
+                             self.board, logic,
+                             plan_discoveries(self._solutions, chances, skill,
+                                              self.duration, rng))
+        self.bots.append(bot)
+        return bot
+
+    def tick(self, elapsed: float) -> int:
+        """
+        :return: the number of new words submitted by all the bots.
+        """
+        return sum(bot.play(elapsed) for bot in self.bots)
+
+    def run(self, step: float = 1.0) -> int:
+        """
+        Plays the game from start to end in steps of step seconds, without
+        waiting for them.
+        :return: the number of words submitted by all the bots.
+        """
+        submitted = 0
+        elapsed = 0.0
+        while elapsed < self.duration:
+            elapsed = min(elapsed + step, self.duration)
+            submitted += self.tick(elapsed)
+        return submitted
+
+    def standings(self) -> List[Tuple[str, int]]:
+        return sorted(((bot.name, bot.get_score()) for bot in self.bots),
+                      key=lambda standing: standing[1], reverse=True)
+
+
+# -------------- C O M M A N D  L I N E ----------------#
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Play a random board with simulated players.")
+    parser.add_argument("--bots", type=int, default=100)
+    parser.add_argument("--skill", choices=sorted(SKILLS), default=None,
+                        help="skill of every bot (default: a mix)")
+    parser.add_argument("--seconds", type=float, default=GAME_SECONDS)
+    parser.add_argument("--step", type=float, default=1.0,
+                        help="seconds of the game between two turns")
+    parser.add_argument("--dictionary", default=DEFAULT_DICT_PATH)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    board = randomize_board(rng=rng)
+    trie = load_trie(args.dictionary)
+    solutions, max_score = SolvedBoardCache().solve(board, trie)
+    trie.close()
+
+    skills = [args.skill] if args.skill else sorted(SKILLS)
+    game = BotGame(board, solutions, max_score, args.seconds,
+                   seed=rng.getrandbits(64))
+    start = time.perf_counter()
+    for index in range(args.bots):
+        skill = skills[index % len(skills)]
+        game.add_bot(SKILLS[skill], f"{skill}-{index + 1}")
+    planned = time.perf_counter() - start
+    submitted = game.run(args.step)
+    played = time.perf_counter() - start - planned
+
+    for row in board:
+        print(" ".join(f"{face:<2}" for face in row))
+    print(f"{len(solutions)} words, max score {max_score}")
+    print(f"{args.bots} bots planned in {planned * 1000:.1f} ms, played "
+          f"{submitted} words in {played * 1000:.1f} ms")
+    for name, score in game.standings()[:10]:
+        print(f"{name:<16} {score:5d}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
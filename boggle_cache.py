@@ -0,0 +1,205 @@
+# -------------- I M P O R T S ----------------#
+import dbm
+import json
+import sys
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from boggle_path import Board, Path
+from boggle_solver import max_score_paths
+from boggle_trie import BoggleTrie
+
+
+# canonical word paths: word -> cell ids on the canonical board
+CanonicalPaths = Dict[str, Tuple[int, ...]]
+# a symmetry: (shape of the moved board, new cell id of every cell id)
+Symmetry = Tuple[Tuple[int, int], Tuple[int, ...]]
+
+
+# -------------- S Y M M E T R I E S ----------------#
+@lru_cache(maxsize=None)
+def symmetries(rows: int, cols: int) -> Tuple[Symmetry, ...]:
+    """
+    :return: the 8 rotations and reflections of a rows x cols board.
+    Adjacency is kept by all of them, so they all have the same words and
+    path lengths.
+    """
+    moves = (
+        (False, lambda r, c: (r, c)),
+        (True, lambda r, c: (c, rows - 1 - r)),
+        (False, lambda r, c: (rows - 1 - r, cols - 1 - c)),
+        (True, lambda r, c: (cols - 1 - c, r)),
+        (False, lambda r, c: (rows - 1 - r, c)),
+        (False, lambda r, c: (r, cols - 1 - c)),
+        (True, lambda r, c: (c, r)),
+        (True, lambda r, c: (cols - 1 - c, rows - 1 - r)),
+    )
+    result = []
+    for swapped, move in moves:
+        new_cols = rows if swapped else cols
+        shape = (cols, rows) if swapped else (rows, cols)
+        mapping = []
+        for r in range(rows):
+            for c in range(cols):
+                new_r, new_c = move(r, c)
+                mapping.append(new_r * new_cols + new_c)
+        result.append((shape, tuple(mapping)))
+    return tuple(result)
+
+
+def canonical_form(board: Board) -> Tuple[str, Tuple[int, int],
+                                          Tuple[int, ...]]:
+    """
+    Finds the smallest of the 8 symmetric versions of the board.
+    :return: (text key of the canonical board, its shape, the canonical
+    cell id of every cell id of board).
+    """
+    rows, cols = len(board), len(board[0])
+    cells = [text for row in board for text in row]
+    best = None
+    for shape, mapping in symmetries(rows, cols):
+        moved = [""] * len(cells)
+        for cell, new_cell in enumerate(mapping):
+            moved[new_cell] = cells[cell]
+        candidate = (shape, moved)
+        if best is None or candidate < best[0]:
+            best = (candidate, mapping)
+    (shape, moved), mapping = best
+    key = f"{shape[0]}x{shape[1]}:{','.join(moved)}"
+    return key, shape, mapping
+
+
+def _entry_size(key: str, paths: CanonicalPaths) -> int:
+    """
+    :return: an estimate of the bytes held by a cache entry.
+    """
+    return sys.getsizeof(key) + sys.getsizeof(paths) + sum(
+        sys.getsizeof(word) + sys.getsizeof(path)
+        for word, path in paths.items())
+
+
+# -------------- C A C H E ----------------#
+class SolvedBoardCache:
+    """
+    The SolvedBoardCache class keeps solved boards (max_score_paths results)
+    keyed by the canonical form of the board under its 8 rotations and
+    reflections, so a board and all its symmetric versions are solved once.
+
+
+    Attributes:
+    1. _entries: an OrderedDict from key to (canonical paths, max score, size)
+    in least recently used first order.
+    2. _max_entries, _max_bytes: the limits, the least recently used entries
+    are evicted once one of them is passed.
+    3. _disk: an optional dbm file that keeps every solved board, it is read
+    when a board is not in memory.
+    4. hits, misses, disk_hits, evictions: counters.
+
+
+    API methods:
+    1. solve -> (paths, max_score): Returns max_score_paths(board, trie),
+    from the cache when possible, with the paths in the board's orientation.
+    2. get_stats -> dict: The counters and the current size of the cache.
+    3. clear -> None: Empties the memory tier and resets the counters.
+    4. close -> None: Closes the disk tier.
+    """
+
+    def __init__(self, max_entries: int = 1024,
+                 max_bytes: int = 64 * 1024 * 1024,
+                 disk_path: Optional[str] = None):
+        self._entries = OrderedDict()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._disk = dbm.open(disk_path, "c") if disk_path else None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    # ------------ class encapsulated helpers ------------ #
+    def _store(self, key: str, paths: CanonicalPaths, max_score: int) -> None:
+        size = _entry_size(key, paths)
+        self._entries[key] = (paths, max_score, size)
+        self._bytes += size
+        while self._entries and (len(self._entries) > self._max_entries
+                                 or self._bytes > self._max_bytes):
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def _lookup(self, key: str) -> Optional[Tuple[CanonicalPaths, int]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+        if self._disk is not None and key in self._disk:
+            stored = json.loads(self._disk[key])
+            paths = {word: tuple(path)
+                     for word, path in stored["paths"].items()}
+            self._store(key, paths, stored["max_score"])
+            self.hits += 1
+            self.disk_hits += 1
+            return paths, stored["max_score"]
+        return None
+
+    # ------------ class API ------------ #
+    def solve(self, board: Board,
+              trie: BoggleTrie) -> Tuple[Dict[str, Path], int]:
+        """
+        :return: (dict mapping each word to its best path, maximum score) of
+        the board, as max_score_paths.
+        """
+        cols = len(board[0])
+        board_key, _, mapping = canonical_form(board)
+        key = f"{trie.checksum:08x}:{board_key}"
+
+        with self._lock:
+            cached = self._lookup(key)
+        if cached is not None:
+            canonical_paths, max_score = cached
+            # map canonical (row, col) back to the board's own cells
+            to_board = [(0, 0)] * len(mapping)
+            for cell, canonical_cell in enumerate(mapping):
+                to_board[canonical_cell] = divmod(cell, cols)
+            return {word: [to_board[cell] for cell in path]
+                    for word, path in canonical_paths.items()}, max_score
+
+        paths, max_score = max_score_paths(board, trie)
+        canonical_paths = {
+            word: tuple(mapping[row * cols + col] for row, col in path)
+            for word, path in paths.items()}
+        with self._lock:
+            self.misses += 1
+            self._store(key, canonical_paths, max_score)
+            if self._disk is not None:
+                self._disk[key] = json.dumps({"paths": canonical_paths,
+                                              "max_score": max_score})
+        return paths, max_score
+
+    def get_stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses,
+                "disk_hits": self.disk_hits, "evictions": self.evictions,
+                "entries": len(self._entries), "bytes": self._bytes}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.disk_hits = self.evictions = 0
+
+    def close(self) -> None:
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# the cache used by BoggleLogic unless it is given another one
+default_cache = SolvedBoardCache()
@@ -0,0 +1,107 @@
+"""
+A registry of the word lists the game can be played with (the shipped
+dictionary, a tournament list, a kids list, other languages), by name.
+
+    registry = DictionaryRegistry()
+    registry.register("kids", "lists/kids.txt.gz")
+    trie = registry.trie("kids")
+
+Word lists are plain or gzip compressed text, one word per line, streamed
+and normalized line by line (boggle_trie.read_words) into their compiled
+trie, which is kept next to the list and rebuilt when the list changes.
+Any number of dictionaries stay loaded at once. Each trie is its own
+memory-mapped file: tries share no storage, a word in two lists is stored
+in both, and a loaded dictionary costs about the size of its file.
+"""
+# -------------- I M P O R T S ----------------#
+import os
+import threading
+from typing import Dict, List, NamedTuple, Tuple
+
+from boggle_trie import DEFAULT_DICT_PATH, BoggleTrie, dictionary_stem, \
+    load_trie
+
+DEFAULT_DICTIONARY = "default"
+
+
+class DictionarySpec(NamedTuple):
+    path: str
+    # whether the dice of this dictionary show "QU" as one face
+    qu_face: bool = True
+
+
+class DictionaryRegistry:
+    """
+    The DictionaryRegistry class loads dictionaries by name, on first use,
+    and keeps them loaded until unloaded. It is safe to use from several
+    threads.
+
+
+    Attributes:
+    1. specs: the registered dictionaries, by name.
+
+
+    API methods:
+    1. register -> None: Adds a word list under a name.
+    2. names -> List[str]: The registered names.
+    3. trie -> BoggleTrie: The compiled dictionary of a name.
+    4. unload -> None: Closes the loaded trie of a name.
+    5. close -> None: Unloads every dictionary.
+    """
+
+    def __init__(self, with_default: bool = True):
+        self.specs: Dict[str, DictionarySpec] = {}
+        self._tries: Dict[str, BoggleTrie] = {}
+        self._lock = threading.Lock()
+        if with_default:
+            self.register(DEFAULT_DICTIONARY, DEFAULT_DICT_PATH)
+
+    # ------------ class encapsulated helpers ------------ #
+    def _spec(self, name: str) -> DictionarySpec:
+        try:
+            return self.specs[name]
+        except KeyError:
+            raise KeyError(f"unknown dictionary {name!r}") from None
+
+    # ------------ class API ------------ #
+    def register(self, name: str, path: str, qu_face: bool = True) -> None:
+        with self._lock:
+            if name in self.specs:
+                raise ValueError(f"dictionary {name!r} is already registered")
+            self.specs[name] = DictionarySpec(path, qu_face)
+
+    def names(self) -> List[str]:
+        return list(self.specs)
+
+    def trie(self, name: str = DEFAULT_DICTIONARY) -> BoggleTrie:
+        with self._lock:
+            trie = self._tries.get(name)
+            if trie is None:
+                spec = self._spec(name)
+                trie = load_trie(spec.path, qu_face=spec.qu_face)
+                self._tries[name] = trie
+            return trie
+
+    def unload(self, name: str) -> None:
+        with self._lock:
+            trie = self._tries.pop(name, None)
+            if trie is not None:
+                trie.close()
+
+    def close(self) -> None:
+        for name in list(self.specs):
+            self.unload(name)
+
+
+def parse_dictionary_option(option: str) -> Tuple[str, str]:
+    """
+    Parses a NAME=PATH command line option (PATH alone is named after the
+    file, without its directory and extensions).
+    :return: (name, path).
+    """
+    name, separator, path = option.partition("=")
+    if not separator:
+        path = option
+        name = os.path.basename(dictionary_stem(path))
+    return name, path
+
@@ -0,0 +1,314 @@
+"""
+Board generation with difficulty targets.
+
+Boards are scored once (word count, maximum score, long words) and kept in
+an on-disk pool, so a board that meets a target is normally picked from the
+pool instead of solving random boards until one fits. A pooled board is
+only picked for the dictionary (by its checksum) and the board size it was
+scored with.
+
+    python boggle_generator.py fill --count 5000
+    python boggle_generator.py generate --min-words 60 --max-words 150
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import bisect
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from boggle_board_randomizer import BOARD_SIZE, randomize_board
+from boggle_path import Board, Path
+from boggle_solver import max_score_paths
+from boggle_trie import DEFAULT_DICT_PATH, BoggleTrie, load_trie
+
+
+DEFAULT_POOL_PATH = "boggle_pool.jsonl"
+
+
+# -------------- S T A T I S T I C S ----------------#
+class BoardStats(NamedTuple):
+    word_count: int
+    max_score: int
+    long_word_count: int
+
+
+def board_stats(board: Board, solutions: Dict[str, Path]) -> BoardStats:
+    """
+    :return: the statistics of a solved board. A word is long if it has
+    more letters than the board has rows, as in BoggleLogic.is_long_word.
+    """
+    long_length = len(board) + 1
+    return BoardStats(
+        word_count=len(solutions),
+        max_score=sum(len(path) ** 2 for path in solutions.values()),
+        long_word_count=sum(len(word) >= long_length for word in solutions))
+
+
+class DifficultyTarget:
+    """
+    The DifficultyTarget class is a set of (inclusive) bounds a board's
+    statistics must fall in. Bounds left as None are not checked.
+    """
+
+    def __init__(self, min_words: Optional[int] = None,
+                 max_words: Optional[int] = None,
+                 min_score: Optional[int] = None,
+                 max_score: Optional[int] = None,
+                 min_long_words: Optional[int] = None,
+                 max_long_words: Optional[int] = None):
+        self.min_words = min_words
+        self.max_words = max_words
+        self.min_score = min_score
+        self.max_score = max_score
+        self.min_long_words = min_long_words
+        self.max_long_words = max_long_words
+
+    def matches(self, stats: BoardStats) -> bool:
+        return (_within(stats.word_count, self.min_words, self.max_words)
+                and _within(stats.max_score, self.min_score, self.max_score)
+                and _within(stats.long_word_count, self.min_long_words,
+                            self.max_long_words))
+
+    def __repr__(self) -> str:
+        bounds = ", ".join(f"{name}={value}"
+                           for name, value in vars(self).items()
+                           if value is not None)
+        return f"DifficultyTarget({bounds})"
+
+
+def _within(value: int, low: Optional[int], high: Optional[int]) -> bool:
+    return (low is None or value >= low) and (high is None or value <= high)
+
+
+# -------------- P O O L ----------------#
+class BoardPool:
+    """
+    The BoardPool class is a pool of pre-scored boards, stored as JSON Lines
+    on disk and kept in memory sorted by word count, so the boards within a
+    word count range are found with a binary search. Every board is stored
+    with the checksum of the dictionary it was scored with (None for the
+    boards of older pool files, which are never taken).
+
+
+    API methods:
+    1. add -> bool: Adds a scored board to the pool (and to the file),
+    False if the pool already has it for the dictionary.
+    2. take -> Optional[(board, stats)]: Removes and returns a random board
+    of the pool that meets a target, None if there is none.
+    3. fill -> int: Scores new seeded random boards into the pool.
+    """
+
+    def __init__(self, pool_path: Optional[str] = DEFAULT_POOL_PATH):
+        """
+        This function initializes the pool and loads the boards stored at
+        pool_path (a pool_path of None keeps the pool in memory only).
+        """
+        self._pool_path = pool_path
+        self._keys: List[int] = []
+        self._entries: List[Tuple[BoardStats, Board, Optional[int]]] = []
+        # (dictionary, board) of every board in the file, taken or not
+        self._stored: Set[Tuple[Optional[int], str]] = set()
+        if pool_path and os.path.exists(pool_path):
+            with open(pool_path, encoding="utf-8") as pool_file:
+                for line in pool_file:
+                    if line.strip():
+                        item = json.loads(line)
+                        self._insert(BoardStats(*item["stats"]),
+                                     item["board"], item.get("dictionary"))
+
+    def _insert(self, stats: BoardStats, board: Board,
+                dictionary: Optional[int]) -> bool:
+        key = (dictionary, json.dumps(board))
+        if key in self._stored:
+            return False
+        self._stored.add(key)
+        index = bisect.bisect_right(self._keys, stats.word_count)
+        self._keys.insert(index, stats.word_count)
+        self._entries.insert(index, (stats, board, dictionary))
+        return True
+
+    # ------------ class API ------------ #
+    def add(self, board: Board, stats: BoardStats, dictionary: int) -> bool:
+        """
+        Adds a board scored with the dictionary of checksum dictionary.
+        """
+        if not self._insert(stats, board, dictionary):
+            return False
+        if self._pool_path:
+            with open(self._pool_path, "a", encoding="utf-8") as pool_file:
+                pool_file.write(json.dumps({"stats": list(stats),
+                                            "board": board,
+                                            "dictionary": dictionary}) + "\n")
+        return True
+
+    def take(self, target: DifficultyTarget, dictionary: int,
+             rows: int = BOARD_SIZE, cols: Optional[int] = None,
+             rng: random.Random = random) -> Optional[Tuple[Board, BoardStats]]:
+        """
+        Removes a random rows x cols board scored with the dictionary of
+        checksum dictionary that meets target from the pool (in memory, the
+        file keeps every board for later runs).
+        """
+        cols = cols or rows
+        lo = 0 if target.min_words is None else \
+            bisect.bisect_left(self._keys, target.min_words)
+        hi = len(self._keys) if target.max_words is None else \
+            bisect.bisect_right(self._keys, target.max_words)
+        matching = [index for index in range(lo, hi)
+                    if self._entries[index][2] == dictionary
+                    and len(self._entries[index][1]) == rows
+                    and len(self._entries[index][1][0]) == cols
+                    and target.matches(self._entries[index][0])]
+        if not matching:
+            return None
+        index = rng.choice(matching)
+        del self._keys[index]
+        stats, board, _ = self._entries.pop(index)
+        return board, stats
+
+    def fill(self, trie: BoggleTrie, count: int, seed: Optional[int] = None,
+             rows: int = BOARD_SIZE, cols: Optional[int] = None) -> int:
+        """
+        Scores count rows x cols boards (board i seeded with seed + i, a
+        random seed if seed is None) into the pool.
+        :return: the number of boards added, the boards the pool already
+        has are skipped.
+        """
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        added = 0
+        for index in range(count):
+            board = randomize_board(rng=random.Random(seed + index),
+                                    rows=rows, cols=cols)
+            paths, _ = max_score_paths(board, trie)
+            added += self.add(board, board_stats(board, paths),
+                              trie.checksum)
+        return added
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# -------------- G E N E R A T O R ----------------#
+class BoardGenerator:
+    """
+    The BoardGenerator class returns rows x cols boards that meet a
+    DifficultyTarget. Boards come from the pool when possible (the ones
+    scored with the same dictionary and size); otherwise random boards are
+    solved (and added to the pool, so the pool grows with use) until one
+    meets the target.
+
+
+    API methods:
+    1. generate -> (board, stats): Returns a board meeting a target.
+    2. get_latency_stats -> dict: Generation latency (seconds) of the calls
+    so far: count, mean, p50, p99, and how many came from the pool.
+    """
+
+    def __init__(self, trie: BoggleTrie, pool: Optional[BoardPool] = None,
+                 max_attempts: int = 2000, rows: int = BOARD_SIZE,
+                 cols: Optional[int] = None):
+        self._trie = trie
+        self._rows = rows
+        self._cols = cols
+        self._pool = pool if pool is not None else BoardPool(None)
+        self._max_attempts = max_attempts
+        self._latencies: List[float] = []
+        self._pool_hits = 0
+
+    # ------------ class API ------------ #
+    def generate(self, target: DifficultyTarget,
+                 rng: random.Random = random) -> Tuple[Board, BoardStats]:
+        """
+        :return: a board meeting target and its statistics.
+        Raises ValueError if no board was found within max_attempts.
+        """
+        start = time.perf_counter()
+        try:
+            taken = self._pool.take(target, self._trie.checksum,
+                                    self._rows, self._cols, rng)
+            if taken is not None:
+                self._pool_hits += 1
+                return taken
+
+            for _ in range(self._max_attempts):
+                board = randomize_board(rng=rng, rows=self._rows,
+                                        cols=self._cols)
+                paths, _ = max_score_paths(board, self._trie)
+                stats = board_stats(board, paths)
+                if target.matches(stats):
+                    return board, stats
+                self._pool.add(board, stats, self._trie.checksum)
+            raise ValueError(f"no board meets {target} "
+                             f"after {self._max_attempts} attempts")
+        finally:
+            self._latencies.append(time.perf_counter() - start)
+
+    def get_latency_stats(self) -> dict:
+        if not self._latencies:
+            return {"count": 0, "pool_hits": 0}
+        ordered = sorted(self._latencies)
+        return {
+            "count": len(ordered),
+            "pool_hits": self._pool_hits,
+            "mean": sum(ordered) / len(ordered),
+            "p50": ordered[len(ordered) // 2],
+            "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+        }
+
+
+# -------------- C O M M A N D  L I N E ----------------#
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate Boggle boards that meet difficulty targets.")
+    parser.add_argument("--pool", default=DEFAULT_POOL_PATH)
+    parser.add_argument("--dictionary", default=DEFAULT_DICT_PATH)
+    parser.add_argument("--rows", type=int, default=BOARD_SIZE)
+    parser.add_argument("--cols", type=int, default=None)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    fill_parser = subparsers.add_parser("fill", help="score boards into "
+                                                     "the pool")
+    fill_parser.add_argument("--count", type=int, default=1000)
+    fill_parser.add_argument("--seed", type=int, default=None)
+
+    generate_parser = subparsers.add_parser("generate",
+                                            help="print boards meeting "
+                                                 "a target")
+    generate_parser.add_argument("--boards", type=int, default=1)
+    generate_parser.add_argument("--seed", type=int, default=None)
+    for bound in ("words", "score", "long-words"):
+        generate_parser.add_argument(f"--min-{bound}", type=int)
+        generate_parser.add_argument(f"--max-{bound}", type=int)
+
+    args = parser.parse_args(argv)
+    trie = load_trie(args.dictionary)
+    pool = BoardPool(args.pool)
+
+    if args.command == "fill":
+        start = time.perf_counter()
+        added = pool.fill(trie, args.count, args.seed, args.rows, args.cols)
+        print(f"scored {args.count} boards ({added} new) in "
+              f"{time.perf_counter() - start:.2f}s, "
+              f"{len(pool)} boards in {args.pool}", file=sys.stderr)
+        return 0
+
+    target = DifficultyTarget(args.min_words, args.max_words,
+                              args.min_score, args.max_score,
+                              args.min_long_words, args.max_long_words)
+    rng = random.Random(args.seed)
+    generator = BoardGenerator(trie, pool, rows=args.rows, cols=args.cols)
+    for _ in range(args.boards):
+        board, stats = generator.generate(target, rng)
+        print(json.dumps({"board": board, "stats": stats._asdict()}))
+    print(json.dumps({"latency": generator.get_latency_stats()}),
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
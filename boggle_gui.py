@@ -1,12 +1,18 @@
 # -------------- I M P O R T S ----------------#
 # our files:
-from boggle_board_randomizer import *
-from boggle import BoggleController
+from boggle_path import BoardPath
+from boggle_timer import GameTimer
+from boggle_word_list import WordList
 
 # python modules:
 import tkinter as tk
 from tkinter import messagebox
-import copy
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    # only for the annotations: importing boggle here would run it a second
+    # time (as "boggle" next to "__main__") before the window is shown
+    from boggle import BoggleController
 
 
 # -------------- G U I  C L A S S ----------------#
@@ -21,24 +27,31 @@ class BoggleGUI:
     1. __init__: Initializes the BoggleGUI class, creates the main window and
     all necessary frames, buttons and labels.
     2. set_controller: Sets the controller of the game
-    3. game_over: Ends the game, displays the user's final score and asks if
+    3. start_game: Starts the game on the board given by the controller.
+    4. game_over: Ends the game, displays the user's final score and asks if
      s/he wants to play again.
-    4. get_board: Returns the current boggle board.
-    5. submit_on_click: This method is called when the user clicks the submit
-    button. It returns a deep copy of list contains all the buttons on board
-    that the user clicked on and resets that list.
-    6. update_words_found: Updates the words found by user with the given word.
-    7. update_score_label: Updates the score label with the given score.
-    8. run: Runs the main loop of the GUI, displaying the window to the user.
+    5. get_board: Returns the current boggle board.
+    6. submit_on_click: This method is called when the user clicks the submit
+    button. It returns the path of the buttons on board that the user
+    clicked on and starts a new, empty path.
+    7. update_words_found: Updates the words found by user with the given word.
+    8. update_score_label: Updates the score label with the given score.
+    9. update_hint_label: Updates the number of words left to find that start
+    with the letters clicked.
+    10. reset: Shows the cover of a new game in the same main window.
+    11. start_failed: Tells the user the game could not be prepared and
+    restores the Start button.
+    12. run: Runs the main loop of the GUI, displaying the window to the user.
 
 
    """
 
-    def __init__(self) -> None:
+    def __init__(self, board: Optional[List[List[str]]] = None) -> None:
         """
         This function initializes the Boggle GUI, creating the main window and
         all necessary frames, buttons and widgets for the game.
-        It also assigns a random board and sets the controller to None.
+        The board is given by the controller when the game starts (start_game)
+        and the controller is set to None.
         It also uploads the cover image, creates the Start button and defines
         empty objects for storing the path of clicked word and the timer.
         """
@@ -51,13 +64,30 @@ class BoggleGUI:
         root.config(bg="gray99")
 
         self._main_window = root
-        self._board = randomize_board()
+        self._board = board
         self._controller = None
 
-        # Step 2: upload open cover image using helper
+        # images and feedback labels are created once and reused by every game
+        self._images = {}
+        self._try_again_label = None
+        self._long_word_label = None
+
+        # Step 2: create the cover, frames and start button of the first game
+        self.__create_cover()
+
+    # ------- class encapsulated helpers ------- #
+
+    # cover
+    def __create_cover(self):
+        """
+        Creates the cover image, the frames of a game and the Start button,
+        and resets the per-game state. It runs for every game, the main
+        window and the loaded images are reused.
+        """
+        # Step 1: upload open cover image using helper
         self.__add_pic("cover.PNG")
 
-        # Step 3: Create frames for object on main_window
+        # Step 2: Create frames for object on main_window
         # 1) board frame
         self._board_frame = tk.Frame(self._main_window)
         self._board_frame.pack(expand=True)
@@ -92,19 +122,18 @@ class BoggleGUI:
         self._temp_word_frame = tk.Frame(self._main_window)
         self._temp_word_frame.pack()
 
-        # Step 4: Create start game button
+        # Step 3: Create start game button
         self._start_button = tk.Button(self._start_button_frame,
                                        text=" * S t a r t  *  G a m e * ",
                                        font=("Berlin Sans FB Demi Bold", 20),
                                        bg="DodgerBlue2", fg="gray99",
-                                       command=self.__start_game)
+                                       command=self.__start_clicked)
         self._start_button.pack(side=tk.TOP)
 
-        # Step 5: define empty objects for path and timer
-        self._coor_clicked = []
-        self._clock = 180
-
-    # ------- class encapsulated helpers ------- #
+        # Step 4: define empty objects for path and timer
+        self._coor_clicked = None
+        self._timer = GameTimer()
+        self._timer_id = None
 
     # buttons
     def __special_buttons(self):
@@ -184,6 +213,14 @@ class BoggleGUI:
                                          bg="gray99", relief="flat")
         self._temp_word_label.pack()
 
+        # hints label, under the temp word
+        self._hint_label = tk.Label(self._temp_word_frame, text="",
+                                    font=("Berlin Sans FB Demi", 12),
+                                    fg="DodgerBlue2",
+                                    bg="gray99", relief="flat")
+        self._hint_label.pack()
+        self.update_hint_label()
+
         # configure frame
         self._temp_word_frame.config(height=20, width=100)
         self._temp_word_frame.place(x=430, y=90)
@@ -198,6 +235,12 @@ class BoggleGUI:
         board_row = len(self._board)
         board_col = len(self._board[0])
 
+        # shrink the buttons of boards bigger than 4x4 to fit the frame
+        button_width = min(6, 24 // board_col) or 1
+        button_height = min(3, 12 // board_row) or 1
+        button_font = "Ariel" if max(board_row, board_col) <= 4 else \
+            ("Ariel", max(7, 48 // max(board_row, board_col)))
+
         # create clickable board with its letters
         self._buttons = []
 
@@ -206,9 +249,10 @@ class BoggleGUI:
             for j in range(board_col):
                 # create button and add it to list of buttons
                 button = tk.Button(self._board_frame, text=self._board[i][j],
-                                   width=6, height=3, bg="DodgerBlue2",
+                                   width=button_width, height=button_height,
+                                   bg="DodgerBlue2",
                                    fg="gray99",
-                                   font="Ariel",
+                                   font=button_font,
                                    command=lambda x=i, y=j:
                                    self.__button_clicked(x, y))
                 button.grid(row=i, column=j)
@@ -227,39 +271,22 @@ class BoggleGUI:
         Checks if letter clicked at coordinate (x,y) is next to previous
         letter clicked and update the path list.
         """
-        if self._coor_clicked == []:
-            # add to coor list
-            self._coor_clicked.append((x, y))
-            # change temp letter label text
-            cube_cont = self._board[x][y]
-            self._temp_word_label["text"] += cube_cont
-
-
-        elif self.__check_flow(x, y):
-            # add to coor list
-            self._coor_clicked.append((x, y))
+        if self.__check_flow(x, y):
+            # add to coor path
+            self._coor_clicked.add(x, y)
             # change temp letter label text
             cube_cont = self._board[x][y]
             self._temp_word_label["text"] += cube_cont
+            self.update_hint_label()
 
     def __check_flow(self, x, y) -> bool:
         """
         Checks if user clicked on the next cube, it returns a boolean depending
-        on whether the provided x,y coordinates have been clicked before or not.
+        on whether the provided x,y coordinates have been clicked before or not
+        and are next to the last cube clicked (any cube starts a word).
+        The path keeps the clicked cubes as a bitmask, so this is O(1).
         """
-        # user cant choose same cube
-        if (x, y) in self._coor_clicked:
-            return False
-
-        # take last coor
-        last_coor = self._coor_clicked[-1]
-
-        # check if coor is valid
-        diff = [-1, 0, 1]
-        if ((last_coor[0] - x) in diff) and ((last_coor[1] - y) in diff):
-            return True
-
-        return False
+        return self._coor_clicked.can_add(x, y)
 
     # other functions
     def __add_pic(self, pic_name: str):
@@ -273,11 +300,14 @@ class BoggleGUI:
         # self._img_label = tk.Label(image=cover_image)
         # self._img_label.image = cover_image
         # self._img_label.pack(expand=True)
-        # Open an image file
-        img = tk.PhotoImage(file=pic_name)
+        # Open an image file (once, later games reuse the loaded image)
+        img = self._images.get(pic_name)
+        if img is None:
+            img = tk.PhotoImage(file=pic_name)
+            self._images[pic_name] = img
 
         # Create a label to display the image
-        self._img_label = tk.Label(image=img)
+        self._img_label = tk.Label(self._main_window, image=img)
         self._img_label.image = img
         self._img_label.pack()
 
@@ -285,15 +315,16 @@ class BoggleGUI:
         """
         Set timer for game
         """
-        # Count Down
-        if self._clock >= 1:
-            min, sec = divmod(self._clock, 60)
+        # Count Down (the time left comes from the deadline, not the ticks)
+        if not self._timer.is_over():
+            min, sec = divmod(self._timer.seconds_shown(), 60)
             self._time_label.config(
                 text="Time left: " + "{:02d}:{:02d}".format(min, sec))
-            self._clock -= 1
-            # set time will be called again in 1 second
-            self._time_label.after(1000, self.__set_time)
+            # set time will be called again when the shown second changes
+            delay_ms = int(self._timer.next_tick_delay() * 1000) + 1
+            self._timer_id = self._time_label.after(delay_ms, self.__set_time)
         else:
+            self._timer_id = None
             self._controller.game_is_over()
 
     def __delete_on_click(self) -> None:
@@ -303,12 +334,23 @@ class BoggleGUI:
         """
         # reset the temp word label
         self._temp_word_label["text"] = ""
+        self.update_hint_label()
 
-        # reset the coor clicked list:
-        self._coor_clicked = []
+        # reset the coor clicked path:
+        self._coor_clicked.clear()
 
     # ------- class main function using helpers ------- #
 
+    def __start_clicked(self):
+        """
+        Asks the controller to start the game. The board may still be solved
+        in the background, so the button shows it is loading until the
+        controller calls start_game.
+        """
+        self._start_button.config(text=" * L o a d i n g . . . * ",
+                                  state=tk.DISABLED)
+        self._controller.request_start()
+
     def __start_game(self):
 
         """
@@ -334,6 +376,7 @@ class BoggleGUI:
 
         # Step 6: create timer
         self.__create_time_label()
+        self._timer.start()
         self.__set_time()
 
         # Step 7: create score
@@ -355,11 +398,12 @@ class BoggleGUI:
         self._scrollbar = tk.Scrollbar(self._main_window, orient="vertical")
         self._scrollbar.place(x=270, y=142, height=291)
 
-        # Set the yscrollcommand of the canvas to the set method of the scrollbar
-        self._words_found_canvas.config(yscrollcommand=self._scrollbar.set)
-
-        # Set the command attribute of the scrollbar to be yview
-        self._scrollbar.config(command=self._words_found_canvas.yview)
+        # the words are drawn on a fixed set of rows that scroll with the
+        # scrollbar, the canvas itself does not scroll
+        self._words_found = WordList(self._words_found_canvas,
+                                     self._scrollbar, top=51,
+                                     fill="gray99",
+                                     font=('Berlin Sans FB Demi', 13))
 
     # ------------ class API ------------ #
     def try_again(self):
@@ -368,11 +412,14 @@ class BoggleGUI:
         disappears after 1 second
         """
 
-        # create try again label
-        self._try_again_label = tk.Label(self._main_window, text="Try again",
-                                         font=("Berlin Sans FB Demi bold", 18),
-                                         fg="red",
-                                         bg="black", relief="flat")
+        # create try again label (once, it is reused by every game)
+        if self._try_again_label is None:
+            self._try_again_label = tk.Label(self._main_window,
+                                             text="Try again",
+                                             font=("Berlin Sans FB Demi bold",
+                                                   18),
+                                             fg="red",
+                                             bg="black", relief="flat")
 
         # activate Try again label
         self._try_again_label.place(x=420, y=90)
@@ -383,17 +430,37 @@ class BoggleGUI:
         When user found a long word on board - appears "YOU ROCK" label
         that disappears in 1 second.
         """
-        # create long word label
-        self._long_word_label = tk.Label(self._main_window, text="YOU ROCK!!!",
-                                         font=("Berlin Sans FB Demi bold", 50),
-                                         fg="red",
-                                         bg="black", relief="flat")
+        # create long word label (once, it is reused by every game)
+        if self._long_word_label is None:
+            self._long_word_label = tk.Label(self._main_window,
+                                             text="YOU ROCK!!!",
+                                             font=("Berlin Sans FB Demi bold",
+                                                   50),
+                                             fg="red",
+                                             bg="black", relief="flat")
 
         # activate long word label
         self._long_word_label.place(x=140, y=270)
         self._main_window.after(1000, self._long_word_label.place_forget)
 
-    def set_controller(self, controller: BoggleController):
+    def start_failed(self, message: str):
+        """
+        Shows why the game could not be started and restores the Start
+        button, so the user can try again.
+        """
+        messagebox.showerror("Boggle", message)
+        self._start_button.config(text=" * S t a r t  *  G a m e * ",
+                                  state=tk.NORMAL)
+
+    def start_game(self, board: List[List[str]]):
+        """
+        Starts the game on the given (already solved) board.
+        """
+        self._board = board
+        self._coor_clicked = BoardPath(len(board), len(board[0]))
+        self.__start_game()
+
+    def set_controller(self, controller: "BoggleController"):
         """
         Define a controller object to connect the controller
         class with gui class.
@@ -406,40 +473,43 @@ class BoggleGUI:
     def get_main_window(self):
         return self._main_window
 
-    def submit_on_click(self) -> list[tuple]:
+    def submit_on_click(self) -> BoardPath:
         """
-        This function creates a deep copy of the _coor_clicked list,
-        resets _coor_clicked list and _temp_word_label and returns the deep
-        copy of the _coor_clicked list.
+        This function hands over the _coor_clicked path, starts a new empty
+        _coor_clicked path, resets _temp_word_label and returns the clicked
+        path.
         """
 
-        if self._coor_clicked != []:
-            # Step 1: create deep copy of coor_clicked
-            coor_clicked_copy = copy.deepcopy(self._coor_clicked)
+        if self._coor_clicked:
+            # Step 1: take the clicked path
+            coor_clicked = self._coor_clicked
 
-            # Step 2: resets coor_clicked
-            self._coor_clicked = []
+            # Step 2: start a new path
+            self._coor_clicked = BoardPath(*coor_clicked.shape)
 
             # step 3: resets temp_word
             self._temp_word_label["text"] = ""
 
-            return coor_clicked_copy
+            return coor_clicked
 
     def update_words_found(self, word):
         """
-        Updating the words found canvas
+        Updating the words found list (only its visible rows are drawn)
         """
-        # get list of all words using controller API func
-        all_words = self._controller.get_all_words_found()
+        self._words_found.append(word)
 
-        # add word to words_found canvas
-        self._words_found_canvas.create_text(40, 17 * (len(all_words) + 2),
-                                             text="* " + word, fill="gray99",
-                                             font=('Berlin Sans FB Demi', 13))
-
-        # adapt scrollbar to canvas
-        self._words_found_canvas.config(
-            scrollregion=self._words_found_canvas.bbox("all"))
+    def update_hint_label(self):
+        """
+        Shows how many words left to find start with the temp word. The count
+        is a single lookup in the logic's hint index, so it is cheap enough
+        to run on every click.
+        """
+        prefix = self._temp_word_label["text"]
+        count = self._controller.get_hint_count(prefix)
+        if prefix:
+            self._hint_label["text"] = f"{count} words start with {prefix}"
+        else:
+            self._hint_label["text"] = f"{count} words left"
 
     def update_score_label(self, score: str):
         """
@@ -447,16 +517,21 @@ class BoggleGUI:
         """
         self._score_label.config(text="Score : " + score)
 
-    def game_over(self, score: str):
+    def game_over(self, score: str, max_score: Optional[str] = None):
 
         """
         When time is up:
         1. destroy all unnecessary buttons
         2. upload 'game_over' img
-        3. your score was label
+        3. your score was label (and the best possible score, if given)
         4. add a ques for user if he wants to play another game
         """
-        # Step 1: destroy unnecessary buttons, frames and labels
+        # Step 1: stop the timer (the window is reused by the next game)
+        if self._timer_id is not None:
+            self._main_window.after_cancel(self._timer_id)
+            self._timer_id = None
+
+        # destroy unnecessary buttons, frames and labels
         # destroy buttons and labels
         self._time_label.destroy()
         self._temp_word_label.destroy()
@@ -477,12 +552,15 @@ class BoggleGUI:
         self._delete_button_frame.destroy()
 
         # Step 2: create label that shows user's score from prev game
+        score_text = f"Your final score:\n {score}"
+        if max_score is not None:
+            score_text += f" / {max_score}"
         self._prev_score_frame = tk.Frame(self._main_window)
         self._prev_score_frame.pack(side=tk.TOP)
         self._prev_score = tk.Label(self._prev_score_frame, fg="red",
                                     bg="black",
                                     font=("Berlin Sans FB Demi", 30),
-                                    text=f"Your final score:\n {score}")
+                                    text=score_text)
         self._prev_score.pack()
         self._prev_score_frame.place(x=150, y=10)
 
@@ -502,6 +580,16 @@ class BoggleGUI:
         else:
             self._main_window.destroy()
 
+    def reset(self):
+        """
+        Clears the game over screen and shows the cover and Start button of
+        a new game in the same main window.
+        """
+        self._prev_score_frame.destroy()
+        self._img_label.destroy()
+        self._main_window.config(bg="gray99")
+        self.__create_cover()
+
     def run(self) -> None:
         self._main_window.mainloop()
 
@@ -0,0 +1,288 @@
+"""
+A local SQLite store of the games played: the board, the words found with
+their paths and the score of every game, with leaderboard and per-player
+queries.
+
+The GUI only hands finished games to the store (record_game puts them on a
+queue); a writer thread inserts whatever is queued in one transaction, so
+the mainloop never waits for the disk and thousands of games a day are
+written in a few commits. The indexes keep the leaderboards to a short
+index scan however many games are stored
+(`python -m benchmarks.bench_history` fills a million). Scores of different
+dictionaries and board sizes are not comparable: the leaderboards take
+them as filters.
+"""
+# -------------- I M P O R T S ----------------#
+import json
+import queue
+import sqlite3
+import threading
+import time
+from typing import List, NamedTuple, Optional, Tuple
+
+from boggle_path import Board, Path
+
+DEFAULT_HISTORY_PATH = "boggle_history.sqlite3"
+# the most games the writer puts in one transaction
+BATCH_SIZE = 1000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    played_at REAL NOT NULL,
+    dictionary TEXT NOT NULL,
+    board TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    max_score INTEGER NOT NULL,
+    board_rows INTEGER NOT NULL DEFAULT 0,
+    board_cols INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS words (
+    game_id INTEGER NOT NULL REFERENCES games(id),
+    word TEXT NOT NULL,
+    path TEXT NOT NULL
+);
+"""
+# created once the games of older stores have their board size (_migrate)
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS games_by_score ON games (score DESC);
+-- replaced by games_by_player_kind_score: an unfiltered player_best only
+-- sorts the games of one player
+DROP INDEX IF EXISTS games_by_player_score;
+CREATE INDEX IF NOT EXISTS games_by_kind_score
+    ON games (dictionary, board_rows, board_cols, score DESC);
+CREATE INDEX IF NOT EXISTS games_by_player_kind_score
+    ON games (player, dictionary, board_rows, board_cols, score DESC);
+CREATE INDEX IF NOT EXISTS games_by_player_time
+    ON games (player, played_at DESC);
+CREATE INDEX IF NOT EXISTS words_by_game ON words (game_id);
+"""
+
+
+class GameRecord(NamedTuple):
+    player: str
+    board: Board
+    score: int
+    max_score: int
+    # every word found, with the path the player clicked
+    words: List[Tuple[str, Path]]
+    dictionary: str = "default"
+    played_at: Optional[float] = None
+
+
+class ScoreRow(NamedTuple):
+    game_id: int
+    player: str
+    score: int
+    max_score: int
+    played_at: float
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(db_path, check_same_thread=False)
+    # readers do not wait for the writer (and the other way around)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+def _migrate(connection: sqlite3.Connection) -> None:
+    """
+    Adds the board size columns to the games of a store written before
+    they existed, and fills them in from the boards.
+    """
+    columns = {row[1] for row in
+               connection.execute("PRAGMA table_info(games)")}
+    if "board_rows" in columns:
+        return
+    with connection:
+        for column in ("board_rows", "board_cols"):
+            connection.execute(f"ALTER TABLE games ADD COLUMN {column} "
+                               f"INTEGER NOT NULL DEFAULT 0")
+        sizes = []
+        for game_id, board in connection.execute(
+                "SELECT id, board FROM games"):
+            board = json.loads(board)
+            sizes.append((len(board), len(board[0]) if board else 0,
+                          game_id))
+        connection.executemany(
+            "UPDATE games SET board_rows = ?, board_cols = ? WHERE id = ?",
+            sizes)
+
+
+def _kind_filter(dictionary: Optional[str], rows: Optional[int],
+                 cols: Optional[int]) -> Tuple[List[str], tuple]:
+    """
+    :return: (the conditions, their parameters) selecting the games of a
+    dictionary and of rows x cols boards (cols is rows if not given), None
+    selects any.
+    """
+    conditions, params = [], ()
+    if dictionary is not None:
+        conditions.append("dictionary = ?")
+        params += (dictionary,)
+    if rows is not None:
+        conditions += ["board_rows = ?", "board_cols = ?"]
+        params += (rows, cols or rows)
+    return conditions, params
+
+
+class HistoryStore:
+    """
+    The HistoryStore class records finished games in SQLite from a writer
+    thread and answers leaderboard queries.
+
+
+    Attributes:
+    1. db_path: the path of the SQLite database.
+
+
+    API methods:
+    1. record_game -> None: Queues a finished game, without waiting.
+    2. flush -> None: Waits until every queued game is written.
+    3. top_scores -> List[ScoreRow]: The best games of all players (of a
+    dictionary and board size, optionally).
+    4. player_best -> List[ScoreRow]: The best games of one player (of a
+    dictionary and board size, optionally).
+    5. player_recent -> List[ScoreRow]: The last games of one player.
+    6. player_stats -> dict: Games played, best and average score.
+    7. game_words -> List[Tuple[str, Path]]: The words found in a game.
+    8. close -> None: Writes the queued games and closes the store.
+    """
+
+    def __init__(self, db_path: str = DEFAULT_HISTORY_PATH):
+        self.db_path = db_path
+        self._reader = _connect(db_path)
+        self._reader.executescript(_SCHEMA)
+        _migrate(self._reader)
+        self._reader.executescript(_INDEXES)
+        self._queue: "queue.Queue[Optional[GameRecord]]" = queue.Queue()
+        self._errors: List[BaseException] = []
+        self._writer = threading.Thread(target=self._write_loop,
+                                        name="boggle-history", daemon=True)
+        self._writer.start()
+
+    # ------------ class encapsulated helpers ------------ #
+    def _write_loop(self) -> None:
+        connection = _connect(self.db_path)
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < BATCH_SIZE:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                records = [record for record in batch if record is not None]
+                # the errors are reported by the next flush and their games
+                # are lost; the writer goes on, or every later flush would
+                # wait forever
+                try:
+                    now = time.time()
+                    games = []
+                    for record in records:
+                        try:
+                            games.append(self._encode(record, now))
+                        except Exception as error:
+                            self._errors.append(error)
+                    if games:
+                        self._insert(connection, games)
+                except Exception as error:
+                    self._errors.append(error)
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if len(records) < len(batch):
+                    return
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _encode(record: GameRecord, now: float) -> Tuple[tuple, list]:
+        """
+        :return: (the games row, the words rows without their game id) of a
+        record.
+        """
+        game = (record.player,
+                now if record.played_at is None else record.played_at,
+                record.dictionary,
+                json.dumps(record.board, separators=(",", ":")),
+                record.score, record.max_score, len(record.board),
+                len(record.board[0]) if record.board else 0)
+        words = [(word, json.dumps([list(coord) for coord in path],
+                                   separators=(",", ":")))
+                 for word, path in record.words]
+        return game, words
+
+    @staticmethod
+    def _insert(connection: sqlite3.Connection,
+                games: List[Tuple[tuple, list]]) -> None:
+        """
+        Inserts the encoded games and their words in one transaction.
+        """
+        with connection:
+            for game, words in games:
+                cursor = connection.execute(
+                    "INSERT INTO games (player, played_at, dictionary, "
+                    "board, score, max_score, board_rows, board_cols) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", game)
+                game_id = cursor.lastrowid
+                connection.executemany(
+                    "INSERT INTO words (game_id, word, path) VALUES (?, ?, ?)",
+                    [(game_id,) + word for word in words])
+
+    def _scores(self, query: str, params: tuple) -> List[ScoreRow]:
+        return [ScoreRow(*row) for row in self._reader.execute(
+            "SELECT id, player, score, max_score, played_at FROM games "
+            + query, params)]
+
+    # ------------ class API ------------ #
+    def record_game(self, record: GameRecord) -> None:
+        self._queue.put(record)
+
+    def flush(self) -> None:
+        self._queue.join()
+        if self._errors:
+            raise RuntimeError("writing the game history failed") \
+                from self._errors.pop(0)
+
+    def top_scores(self, count: int = 10, dictionary: Optional[str] = None,
+                   rows: Optional[int] = None,
+                   cols: Optional[int] = None) -> List[ScoreRow]:
+        conditions, params = _kind_filter(dictionary, rows, cols)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        return self._scores(where + "ORDER BY score DESC LIMIT ?",
+                            params + (count,))
+
+    def player_best(self, player: str, count: int = 10,
+                    dictionary: Optional[str] = None,
+                    rows: Optional[int] = None,
+                    cols: Optional[int] = None) -> List[ScoreRow]:
+        conditions, params = _kind_filter(dictionary, rows, cols)
+        return self._scores(
+            f"WHERE {' AND '.join(['player = ?'] + conditions)} "
+            f"ORDER BY score DESC LIMIT ?", (player,) + params + (count,))
+
+    def player_recent(self, player: str, count: int = 10) -> List[ScoreRow]:
+        return self._scores(
+            "WHERE player = ? ORDER BY played_at DESC LIMIT ?",
+            (player, count))
+
+    def player_stats(self, player: str) -> dict:
+        games, best, average = self._reader.execute(
+            "SELECT COUNT(*), MAX(score), AVG(score) FROM games "
+            "WHERE player = ?", (player,)).fetchone()
+        return {"games": games, "best": best or 0, "average": average or 0.0}
+
+    def game_words(self, game_id: int) -> List[Tuple[str, Path]]:
+        return [(word, [tuple(coord) for coord in json.loads(path)])
+                for word, path in self._reader.execute(
+                    "SELECT word, path FROM words WHERE game_id = ? "
+                    "ORDER BY rowid", (game_id,))]
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self._reader.close()
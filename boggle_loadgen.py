@@ -0,0 +1,158 @@
+"""
+Load generator for boggle_server: opens many concurrent connections spread
+over rooms, submits words found on each room's board (plus random paths
+that are not words) and reports throughput and reply latency.
+
+    python -m boggle_server --port 8765 &
+    python -m boggle_loadgen --port 8765 --clients 2000 --rooms 20 --seconds 30
+
+Thousands of connections may need a higher open files limit (ulimit -n).
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import List
+
+from boggle_cache import SolvedBoardCache
+from boggle_path import BoardPath
+from boggle_trie import DEFAULT_DICT_PATH, BoggleTrie, load_trie
+
+
+class LoadStats:
+    """
+    The LoadStats class collects the results of all simulated clients.
+    """
+
+    def __init__(self):
+        self.connected = 0
+        self.failed = 0
+        self.requests = 0
+        self.accepted = 0
+        self.latencies: List[float] = []
+
+    def report(self, elapsed: float) -> dict:
+        ordered = sorted(self.latencies)
+
+        def percentile(fraction: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+        return {
+            "connected": self.connected,
+            "failed": self.failed,
+            "requests": self.requests,
+            "accepted_words": self.accepted,
+            "requests_per_sec": self.requests / elapsed if elapsed else 0.0,
+            "latency_p50_ms": percentile(0.50) * 1000,
+            "latency_p99_ms": percentile(0.99) * 1000,
+        }
+
+
+def _random_path(rows: int, cols: int, rng: random.Random) -> list:
+    """
+    :return: a legal random walk of 3 to 6 cells (usually not a word).
+    """
+    path = BoardPath(rows, cols)
+    row, col = rng.randrange(rows), rng.randrange(cols)
+    path.add(row, col)
+    for _ in range(rng.randint(2, 5)):
+        moves = [(row + dr, col + dc) for dr in (-1, 0, 1)
+                 for dc in (-1, 0, 1) if path.can_add(row + dr, col + dc)]
+        if not moves:
+            break
+        row, col = rng.choice(moves)
+        path.add(row, col)
+    return [list(coord) for coord in path]
+
+
+async def _client(index: int, args, trie: BoggleTrie,
+                  cache: SolvedBoardCache, stats: LoadStats,
+                  deadline: float) -> None:
+    """
+    One simulated player: joins a room and submits paths at args.rate per
+    second until the deadline.
+    """
+    rng = random.Random(index)
+    try:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+    except OSError:
+        stats.failed += 1
+        return
+    stats.connected += 1
+
+    async def request(message: dict) -> dict:
+        start = time.perf_counter()
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+        while True:
+            reply = json.loads(await reader.readline())
+            if reply["event"] != "round_over":
+                stats.requests += 1
+                stats.latencies.append(time.perf_counter() - start)
+                return reply
+
+    try:
+        joined = await request({"op": "join", "room":
+                                f"room-{index % args.rooms}",
+                                "player": f"bot-{index}"})
+        board = joined["board"]
+        rows, cols = len(board), len(board[0])
+        solutions, _ = cache.solve(board, trie)
+        words = [[list(coord) for coord in path]
+                 for path in solutions.values()]
+        rng.shuffle(words)
+
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(rng.expovariate(args.rate))
+            if words and rng.random() < 0.5:
+                path = words.pop()
+            else:
+                path = _random_path(rows, cols, rng)
+            reply = await request({"op": "submit", "path": path})
+            stats.accepted += bool(reply.get("ok"))
+    except (ConnectionError, ValueError, KeyError):
+        stats.failed += 1
+    finally:
+        writer.close()
+
+
+async def run_load(args) -> dict:
+    trie = load_trie(args.dictionary)
+    cache = SolvedBoardCache()
+    stats = LoadStats()
+    start = time.perf_counter()
+    deadline = start + args.seconds
+    clients = []
+    for index in range(args.clients):
+        clients.append(asyncio.create_task(
+            _client(index, args, trie, cache, stats, deadline)))
+        # ramp the connections up instead of opening them all at once
+        if index % 100 == 99:
+            await asyncio.sleep(0.05)
+    await asyncio.gather(*clients)
+    return stats.report(time.perf_counter() - start)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test boggle_server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--rate", type=float, default=1.0,
+                        help="submissions per second of each client")
+    parser.add_argument("--dictionary", default=DEFAULT_DICT_PATH)
+    args = parser.parse_args(argv)
+
+    print(json.dumps(asyncio.run(run_load(args)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
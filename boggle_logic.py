@@ -1,4 +1,19 @@
-from ex11_utils import *
+from array import array
+from typing import (Dict, Iterable, Iterator, List, NamedTuple, Optional,
+                    Sequence, Union)
+
+from boggle_cache import SolvedBoardCache, default_cache
+from boggle_path import (Board, BoardPath, Path, as_board_path,
+                         get_word_length, pack_paths, validate_packed)
+from boggle_state import SolvedBoard
+from boggle_trie import BoggleTrie
+
+
+class BatchResult(NamedTuple):
+    # for every path submitted, the new word it described, None if rejected
+    words: List[Optional[str]]
+    # the points the new words added to the score
+    score_delta: int
 
 
 class BoggleLogic:
@@ -9,15 +24,25 @@ class BoggleLogic:
     The class takes in two arguments in its constructor:
     1. board: A two-dimensional list which represents the game board.
     2. words: An iterable of strings representing the words that might be found
-    on the board.
+    on the board, ideally an already compiled BoggleTrie.
+    An optional third argument is the SolvedBoardCache to solve the board
+    through (boggle_cache.default_cache by default).
+
+
+    The object only keeps what the user found: thousands of games can stay
+    live in one process (a server), and all the games of one board share
+    its SolvedBoard (boggle_state).
 
 
     Attributes:
     1. _score: an integer representing the current score of the user.
-    2. _words_found: a list of the words found on the board,
-    3. _board: a Board which represents the game board.
-    4. _words: a list of words that might be found on the board, this list is
-    updated during the game as words are found.
+    2. _solved: the SolvedBoard of the game: the board, the words on it
+    (a word's id is its index in the sorted words) and the highest score.
+    3. _remaining: a bitset of the ids of the words not found yet.
+    4. _found: an array of the ids of the words found, in order.
+    5. _found_cells, _found_offsets: the paths the user clicked for the
+    words found, packed (the cell ids of all the paths, and the offset
+    where each one starts).
 
 
     API methods:
@@ -38,36 +63,116 @@ class BoggleLogic:
     found during the game.
 
 
+    5. get_max_score -> int: This method returns the highest score that can
+    be reached on the board.
+
+
+    6. get_hint_count -> int: This method returns how many words that were
+    not found yet start with the given prefix.
+
+
+    7. iter_hints -> Iterator[str]: This method lazily yields the words that
+    were not found yet and start with the given prefix.
+
+
+    8. get_paths_found -> list: This method returns the path clicked for
+    each of the words found (same order as get_words_found).
+
+
+    9. after_submit_many -> List[bool]: This method submits several paths at
+    once, as after_submit does for each of them in order.
+
+
+    10. submit_paths -> BatchResult: This method submits several paths at
+    once and returns the new word of every path and the points they added.
+
+
+    11. submit_packed -> BatchResult: This method does the same for paths
+    packed as an array of cell ids with offsets (boggle_path.pack_paths).
+
+
     Other methods:
-    1. _update_score -> None: This method updates the score.
+    1. from_solutions -> BoggleLogic: Creates a logic object for a board
+    that was already solved.
+    2. from_solved -> BoggleLogic: Creates a logic object sharing a
+    SolvedBoard with the other games of the board.
+    3. _start -> None: This method sets the state of a new game.
+    4. _update_score -> None: This method updates the score.
+    5. _add_found -> None: This method records a word found.
    """
 
-    def __init__(self, board: Board, words: Iterable[str]):
+    __slots__ = ("_score", "_solved", "_remaining", "_found", "_found_cells",
+                 "_found_offsets")
+
+    def __init__(self, board: Board, words: Iterable[str],
+                 cache: Optional[SolvedBoardCache] = None):
 
         """
         This function initializes the Boggle logic object, it takes two
         arguments, a board and words(Iterable of strings).
-        It sets the score to 0, creates an empty list for words found,
-        assigns the board and finds all possible words from the board using
-        the possible_words_on_board helper function.
+        It sets the score to 0, creates an empty array for words found,
+        and finds all possible words from the board using the prefix-pruned
+        max_score_paths solver through the solved boards cache.
         """
+        if not isinstance(words, BoggleTrie):
+            words = BoggleTrie.from_words(words)
+        if cache is None:
+            cache = default_cache
 
-        self._score = 0
-        self._words_found = []
-        self._board = board
-        self._words = possible_words_on_board(self._board, words)
+        solutions, max_score = cache.solve(board, words)
+        self._start(SolvedBoard(board, solutions, max_score))
+
+    @classmethod
+    def from_solutions(cls, board: Board, solutions: Dict[str, Path],
+                       max_score: int) -> "BoggleLogic":
+        """
+        Creates a logic object for a board that was already solved without
+        solving it again.
+        """
+        return cls.from_solved(SolvedBoard(board, solutions, max_score))
+
+    @classmethod
+    def from_solved(cls, solved: SolvedBoard) -> "BoggleLogic":
+        """
+        Creates a logic object for a board that was already solved, sharing
+        its SolvedBoard (e.g. one board played by all the players of a room).
+        """
+        logic = cls.__new__(cls)
+        logic._start(solved)
+        return logic
 
     # ------------ class Encapsulated helpers ------------ #
+    def _start(self, solved: SolvedBoard):
+        """
+        Sets the state of a new game on a solved board.
+        """
+        self._score = 0
+        self._solved = solved
+        self._remaining = solved.all_words
+        self._found = array("I")
+        self._found_cells = array("H")
+        self._found_offsets = array("I", [0])
+
     def _update_score(self, path: Path):
         """
         Updates the score.
         """
         self._score += (len(path)) ** 2
 
+    def _add_found(self, word_id: int, cells: Sequence[int]):
+        """
+        Records the word found, with the cells of the path clicked for it.
+        """
+        self._remaining &= ~(1 << word_id)
+        self._found.append(word_id)
+        self._found_cells.extend(cells)
+        self._found_offsets.append(len(self._found_cells))
+
     # ------------ class API ------------ #
-    def after_submit(self, path: Path) -> bool:
+    def after_submit(self, path: Union[BoardPath, Path]) -> bool:
         """
-        Checks if the clicked list of tuples describing a word on board. If it
+        Checks if the clicked path (a BoardPath or a list of tuples) describes
+        a word on board. If it
         does - return True and update the score, the words the found and remove the given word
         from words list and reset clicked list. If it is not a word returns False.
         """
@@ -75,25 +180,76 @@ class BoggleLogic:
         if not path:
             return False
 
-        word = is_valid_path(self._board, path, self._words)
-        if word and word not in self._words_found:
+        board = self._solved.board
+        board_path = as_board_path(board, path)
+        if board_path is None:
+            return False
+        word_id = self._solved.word_id(board_path.word(board))
+        # a word on board that was not found yet
+        if word_id is not None and self._remaining >> word_id & 1:
             # update score:
             self._update_score(path)
-            # add to found word:
-            self._words_found.append(word)
-            # remove word from words list:
-            self._words.remove(word)
+            # add to found words, and remove from the remaining words:
+            self._add_found(word_id, board_path.cell_ids())
 
             return True
 
         return False
 
-    def is_long_word(self, path) -> bool:
+    def after_submit_many(self,
+                          paths: Iterable[Union[BoardPath, Path]]) -> List[bool]:
+        """
+        Submits the paths in order, as many calls to after_submit would (bots
+        submit all the words they found since their last turn this way).
+        :return: for every path, True if it described a new word on board,
+        False otherwise.
+        """
+        return [word is not None for word in self.submit_paths(paths).words]
+
+    def submit_paths(self,
+                     paths: Iterable[Union[BoardPath, Path]]) -> BatchResult:
+        """
+        Submits the paths in order, as many calls to after_submit would.
+        :return: the new word of every path (None if rejected) and the
+        points they added.
+        """
+        board = self._solved.board
+        cells, offsets = pack_paths(paths, len(board), len(board[0]))
+        return self.submit_packed(cells, offsets)
+
+    def submit_packed(self, cells: Sequence[int],
+                      offsets: Sequence[int]) -> BatchResult:
+        """
+        Submits packed paths (boggle_path.pack_paths: the cell ids of all the
+        paths and the offset where each one starts), validated in one pass.
+        A word found before, or earlier in the batch, is rejected.
+        :return: the new word of every path (None if rejected) and the
+        points they added.
+        """
+        solved = self._solved
+        words = validate_packed(solved.board, cells, offsets, solved.word_ids)
+        score_delta = 0
+        for index, word in enumerate(words):
+            if word is None:
+                continue
+            word_id = solved.word_id(word)
+            # found before, or earlier in the batch
+            if not self._remaining >> word_id & 1:
+                words[index] = None
+                continue
+            start, end = offsets[index], offsets[index + 1]
+            score_delta += (end - start) ** 2
+            self._add_found(word_id, cells[start:end])
+        self._score += score_delta
+        return BatchResult(words, score_delta)
+
+    def is_long_word(self, path: Union[BoardPath, Path]) -> bool:
         """
         :return: True if length of word is bigger enough, False otherwise
         """
-        wanted_length = len(self._board) + 1
-        word_length = get_word_length(path, self._board)
+        board = self._solved.board
+        wanted_length = len(board) + 1
+        word_length = get_word_length(path, board)
         if word_length >= wanted_length:
             return True
         return False
@@ -102,4 +258,26 @@ class BoggleLogic:
         return self._score
 
     def get_words_found(self) -> list[str]:
-        return self._words_found
+        words = self._solved.words
+        return [words[word_id] for word_id in self._found]
+
+    def get_max_score(self) -> int:
+        return self._solved.max_score
+
+    def get_hint_count(self, prefix: str = "") -> int:
+        start, end = self._solved.prefix_range(prefix)
+        return (self._remaining >> start & ((1 << (end - start)) - 1)) \
+            .bit_count()
+
+    def iter_hints(self, prefix: str = "") -> Iterator[str]:
+        start, end = self._solved.prefix_range(prefix)
+        words = self._solved.words
+        remaining = self._remaining
+        return (words[word_id] for word_id in range(start, end)
+                if remaining >> word_id & 1)
+
+    def get_paths_found(self) -> list[Path]:
+        cols = len(self._solved.board[0])
+        cells, offsets = self._found_cells, self._found_offsets
+        return [[divmod(cell, cols) for cell in cells[start:end]]
+                for start, end in zip(offsets, offsets[1:])]
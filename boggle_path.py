@@ -0,0 +1,245 @@
+# -------------- I M P O R T S ----------------#
+from array import array
+from functools import lru_cache
+from typing import (Container, Iterable, Iterator, List, Optional, Sequence,
+                    Tuple, Union)
+
+
+Board = List[List[str]]
+Path = List[Tuple[int, int]]
+
+# the cell id packed for a cell that is not on the board
+INVALID_CELL = 0xFFFF
+
+
+# -------------- A D J A C E N C Y  T A B L E S ----------------#
+@lru_cache(maxsize=None)
+def neighbours_table(rows: int, cols: int) -> Tuple[Tuple[int, ...], ...]:
+    """
+    :return: for every cell id (row * cols + col) of a rows x cols board,
+    the ids of the cells around it.
+    """
+    table = []
+    for row in range(rows):
+        for col in range(cols):
+            table.append(tuple(
+                r * cols + c
+                for r in range(max(0, row - 1), min(rows, row + 2))
+                for c in range(max(0, col - 1), min(cols, col + 2))
+                if (r, c) != (row, col)))
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def adjacency_masks(rows: int, cols: int) -> Tuple[int, ...]:
+    """
+    :return: for every cell id of a rows x cols board, a bitmask with the
+    bits of the cells around it set.
+    """
+    return tuple(sum(1 << neighbour for neighbour in neighbours)
+                 for neighbours in neighbours_table(rows, cols))
+
+
+# -------------- P A T H ----------------#
+class BoardPath:
+    """
+    The BoardPath class is a path of cells on a rows x cols board that can
+    only grow along legal moves.
+
+
+    The cells are kept as ids (row * cols + col) in an array, the visited
+    cells as an integer bitmask and the neighbours come from a table shared
+    by all boards of the same size, so checking and adding a cell are O(1).
+
+
+    API methods:
+    1. can_add -> bool: Checks if (row, col) may be the next cell of the path.
+    2. add -> bool: Adds (row, col) to the path if it may be the next cell.
+    3. clear -> None: Empties the path.
+    4. cell_ids -> array: The ids of the cells of the path, in order.
+    5. word -> str: The word the path spells on a board.
+    6. from_coords -> Optional[BoardPath]: Builds a path from a list of
+    (row, col) tuples, None if they do not form a legal path.
+    """
+
+    __slots__ = ("_rows", "_cols", "_adjacency", "_cells", "_visited")
+
+    def __init__(self, rows: int, cols: int):
+        self._rows = rows
+        self._cols = cols
+        self._adjacency = adjacency_masks(rows, cols)
+        self._cells = array("H")
+        self._visited = 0
+
+    @classmethod
+    def from_coords(cls, rows: int, cols: int,
+                    coords: Iterable[Tuple[int, int]]) -> Optional["BoardPath"]:
+        path = cls(rows, cols)
+        for row, col in coords:
+            if not path.add(row, col):
+                return None
+        return path
+
+    # ------------ class API ------------ #
+    def can_add(self, row: int, col: int) -> bool:
+        """
+        :return: True if (row, col) is on the board, was not visited yet and
+        is next to the last cell of the path (any cell starts a path).
+        """
+        if not (0 <= row < self._rows and 0 <= col < self._cols):
+            return False
+        cell = row * self._cols + col
+        if self._visited >> cell & 1:
+            return False
+        return not self._cells or bool(
+            self._adjacency[self._cells[-1]] >> cell & 1)
+
+    def add(self, row: int, col: int) -> bool:
+        """
+        Adds (row, col) at the end of the path.
+        :return: True if it was added, False if the move is not legal.
+        """
+        if not self.can_add(row, col):
+            return False
+        cell = row * self._cols + col
+        self._cells.append(cell)
+        self._visited |= 1 << cell
+        return True
+
+    def clear(self) -> None:
+        self._cells = array("H")
+        self._visited = 0
+
+    def cell_ids(self) -> array:
+        return self._cells
+
+    def word(self, board: Board) -> str:
+        cols = self._cols
+        return "".join(board[cell // cols][cell % cols] for cell in self._cells)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self._rows, self._cols
+
+    def __contains__(self, coord: object) -> bool:
+        if not isinstance(coord, tuple) or len(coord) != 2:
+            return False
+        row, col = coord
+        if not (0 <= row < self._rows and 0 <= col < self._cols):
+            return False
+        return bool(self._visited >> (row * self._cols + col) & 1)
+
+    def __getitem__(self, index: int) -> Tuple[int, int]:
+        return divmod(self._cells[index], self._cols)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        cols = self._cols
+        for cell in self._cells:
+            yield divmod(cell, cols)
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __repr__(self) -> str:
+        return f"BoardPath({self._rows}, {self._cols}, {list(self)})"
+
+
+# -------------- V A L I D A T I O N ----------------#
+def as_board_path(board: Board,
+                  path: Union[BoardPath, Path]) -> Optional[BoardPath]:
+    """
+    :return: path as a BoardPath of the board's size, or None if it is not
+    a legal path on the board.
+    """
+    rows, cols = len(board), len(board[0])
+    if isinstance(path, BoardPath):
+        return path if path.shape == (rows, cols) else None
+    return BoardPath.from_coords(rows, cols, path)
+
+
+def is_valid_path(board: Board, path: Union[BoardPath, Path],
+                  words: Container[str]) -> Optional[str]:
+    """
+    :return: the word spelled by path if path is a legal path on the board
+    and the word is in words, None otherwise.
+    """
+    board_path = as_board_path(board, path)
+    if board_path is None:
+        return None
+    word = board_path.word(board)
+    return word if word in words else None
+
+
+def get_word_length(path: Union[BoardPath, Path], board: Board) -> int:
+    """
+    :return: the number of letters spelled by path ("QU" counts as two).
+    """
+    return sum(len(board[row][col]) for row, col in path)
+
+
+# -------------- B A T C H  V A L I D A T I O N ----------------#
+def pack_paths(paths: Iterable[Union[BoardPath, Path]], rows: int,
+               cols: int) -> Tuple[array, array]:
+    """
+    Packs paths into the cell ids of a rows x cols board, one after the
+    other, with the offset where every path starts (and one past the last
+    path), as validate_packed takes them. A cell off the board (or a
+    BoardPath of another size) is packed as INVALID_CELL.
+    :return: (cells, offsets).
+    """
+    cells = array("H")
+    offsets = array("I", [0])
+    for path in paths:
+        if isinstance(path, BoardPath):
+            if path.shape == (rows, cols):
+                cells.extend(path.cell_ids())
+            elif path:
+                cells.append(INVALID_CELL)
+        else:
+            cells.extend(row * cols + col
+                         if 0 <= row < rows and 0 <= col < cols
+                         else INVALID_CELL
+                         for row, col in path)
+        offsets.append(len(cells))
+    return cells, offsets
+
+
+def validate_packed(board: Board, cells: Sequence[int],
+                    offsets: Sequence[int],
+                    words: Container[str]) -> List[Optional[str]]:
+    """
+    Validates many packed paths (pack_paths) in one pass over the cells,
+    with the adjacency table shared by all boards of the board's size.
+    :return: for every path, the word it spells if it is a legal path on
+    the board and the word is in words, None otherwise.
+    """
+    cols = len(board[0])
+    faces = [face for row in board for face in row]
+    adjacency = adjacency_masks(len(board), cols)
+    results: List[Optional[str]] = []
+    start = offsets[0]
+    for index in range(1, len(offsets)):
+        end = offsets[index]
+        path = cells[start:end]
+        start = end
+        # the word is looked up first: most rejected paths are legal moves
+        # that spell no word
+        try:
+            word = "".join(map(faces.__getitem__, path))
+        except IndexError:
+            # a cell off the board
+            word = None
+        if not path or word is None or word not in words:
+            results.append(None)
+            continue
+        visited = 0
+        previous = -1
+        for cell in path:
+            if cell < 0 or visited >> cell & 1 or \
+                    (previous >= 0 and not adjacency[previous] >> cell & 1):
+                word = None
+                break
+            visited |= 1 << cell
+            previous = cell
+        results.append(word)
+    return results
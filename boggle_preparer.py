@@ -0,0 +1,101 @@
+# -------------- I M P O R T S ----------------#
+import queue
+import random
+import threading
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+from boggle_board_randomizer import randomize_board
+from boggle_logic import BoggleLogic
+from boggle_path import Board
+from boggle_trie import DEFAULT_DICT_PATH, load_trie
+
+
+class PreparedGame(NamedTuple):
+    board: Board
+    logic: BoggleLogic
+    # seconds from the request of the game until it was ready
+    latency: float
+    # the seed the board was drawn from (boggle_replay logs it)
+    seed: int = 0
+    # the checksum of the dictionary the board was solved with
+    checksum: int = 0
+
+
+class GamePreparer:
+    """
+    The GamePreparer class loads the dictionary and solves boards in a
+    worker thread, so the Tk mainloop never waits for them.
+
+
+    The worker takes requests from one queue and puts the ready games
+    (board and BoggleLogic) in another thread-safe queue, which the GUI
+    polls with after(). The first game is requested when the preparer is
+    created, and the controller requests the next one as soon as a game is
+    handed out, so "play again" finds it already solved.
+    Every board is drawn by new_board(rng=random.Random(seed)) from a seed
+    of its own, so a logged game can be drawn again from its seed.
+
+
+    API methods:
+    1. request -> None: Asks the worker to prepare one more game.
+    2. poll -> Optional[PreparedGame]: Returns a ready game without waiting,
+    None if there is none yet.
+    3. close -> None: Stops the worker thread.
+    """
+
+    def __init__(self, new_board: Callable[..., Board] = randomize_board,
+                 dict_path: str = DEFAULT_DICT_PATH,
+                 seed: Optional[int] = None):
+        self._new_board = new_board
+        self._dict_path = dict_path
+        # the seeds of the boards (OS entropy unless seed is given)
+        self._seeds = random.Random(seed)
+        self._requests: "queue.Queue[Optional[float]]" = queue.Queue()
+        self._ready: "queue.Queue[PreparedGame]" = queue.Queue()
+        self._errors: List[BaseException] = []
+        self._thread = threading.Thread(target=self._run,
+                                        name="boggle-preparer", daemon=True)
+        self._thread.start()
+        self.request()
+
+    # ------------ class encapsulated helpers ------------ #
+    def _run(self) -> None:
+        trie = None
+        while True:
+            requested_at = self._requests.get()
+            if requested_at is None:
+                return
+            try:
+                if trie is None:
+                    trie = load_trie(self._dict_path)
+                seed = self._seeds.getrandbits(64)
+                board = self._new_board(rng=random.Random(seed))
+                logic = BoggleLogic(board, trie)
+                self._ready.put(PreparedGame(
+                    board, logic, time.perf_counter() - requested_at, seed,
+                    trie.checksum))
+            except Exception as error:
+                # re-raised on the Tk thread by the next poll; the game is
+                # dropped, the worker goes on with the next request
+                self._errors.append(error)
+
+    # ------------ class API ------------ #
+    def request(self) -> None:
+        self._requests.put(time.perf_counter())
+
+    def poll(self) -> Optional[PreparedGame]:
+        """
+        :raise RuntimeError: once for every game the worker failed to
+        prepare (from the worker's error).
+        """
+        if self._errors:
+            raise RuntimeError("preparing a game failed") \
+                from self._errors.pop(0)
+        try:
+            return self._ready.get_nowait()
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self._requests.put(None)
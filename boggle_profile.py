@@ -0,0 +1,194 @@
+"""
+Opt-in instrumentation of the game: times the controller and logic
+construction, every word submission and every GUI callback, counts the
+dictionary lookups and the DFS nodes the solver visits, and writes a JSON
+summary of every game (plus an optional cProfile dump).
+
+    python boggle.py --profile [DIR] [--cprofile]
+    BOGGLE_PROFILE=DIR BOGGLE_CPROFILE=1 python boggle.py
+
+Nothing is patched unless profiling is enabled, so the game runs its plain
+code (zero overhead) by default. Counters include the work of the
+background thread that solves the next board while a game is played;
+cProfile only sees the Tk thread.
+"""
+# -------------- I M P O R T S ----------------#
+import cProfile
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+ENV_VAR = "BOGGLE_PROFILE"
+CPROFILE_ENV_VAR = "BOGGLE_CPROFILE"
+
+# the callbacks Tk and the controller call on the GUI
+GUI_CALLBACKS = [
+    "_BoggleGUI__start_clicked", "_BoggleGUI__button_clicked",
+    "_BoggleGUI__delete_on_click", "_BoggleGUI__set_time", "start_game",
+    "submit_on_click", "update_words_found", "update_score_label",
+    "update_hint_label", "try_again", "long_word_label", "game_over",
+    "reset",
+]
+
+
+class GameProfiler:
+    """
+    The GameProfiler class collects the timings and counters of one game
+    at a time and writes them when the game ends.
+
+
+    Attributes:
+    1. out_dir: the directory of the reports.
+    2. use_cprofile: whether the Tk thread is also run under cProfile.
+    3. games: the number of games reported so far.
+
+
+    API methods:
+    1. install -> None: Wraps the instrumented methods.
+    2. record -> None: Adds the duration of one call of a timed method.
+    3. count -> None: Adds to a counter.
+    4. end_game -> dict: Writes the summary of the game and starts the next.
+    """
+
+    def __init__(self, out_dir: str = ".", use_cprofile: bool = False):
+        self.out_dir = out_dir
+        self.use_cprofile = use_cprofile
+        self.games = 0
+        self._lock = threading.Lock()
+        self._timings: Dict[str, List[float]] = defaultdict(list)
+        self._counters: Counter = Counter()
+        self._started = time.perf_counter()
+        self._profile: Optional[cProfile.Profile] = None
+        os.makedirs(out_dir, exist_ok=True)
+        self.__start_game()
+
+    # ------------ class encapsulated helpers ------------ #
+    def __start_game(self) -> None:
+        self._started = time.perf_counter()
+        if self.use_cprofile:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def _timed(self, name: str, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+        return wrapper
+
+    def _counted(self, name: str, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            self.count(name)
+            return method(*args, **kwargs)
+        return wrapper
+
+    # ------------ class API ------------ #
+    def install(self, controller_cls: Optional[type] = None) -> None:
+        """
+        Replaces the instrumented methods with timing and counting wrappers.
+        Must run before the game objects are created (Tk keeps the bound
+        callbacks it was given). controller_cls is the BoggleController
+        class to patch, the one of boggle.py's __main__ when run as a script.
+        """
+        if controller_cls is None:
+            from boggle import BoggleController as controller_cls
+        from boggle_gui import BoggleGUI
+        from boggle_logic import BoggleLogic
+        from boggle_state import SolvedBoard
+        from boggle_trie import BoggleTrie
+
+        timed = [(controller_cls, "__init__", "controller.init"),
+                 (BoggleLogic, "__init__", "logic.init"),
+                 (BoggleLogic, "after_submit", "logic.after_submit")]
+        timed += [(BoggleGUI, name, "gui." + name.replace("_BoggleGUI__", ""))
+                  for name in GUI_CALLBACKS]
+        for cls, name, label in timed:
+            setattr(cls, name, self._timed(label, getattr(cls, name)))
+
+        # a trie step is one dictionary lookup of the solver, and every node
+        # the DFS reaches asks whether it has children
+        counted = [(BoggleTrie, "step", "trie_steps"),
+                   (BoggleTrie, "has_children", "dfs_nodes"),
+                   (BoggleTrie, "__contains__", "word_lookups"),
+                   (SolvedBoard, "word_id", "word_lookups")]
+        for cls, name, label in counted:
+            setattr(cls, name, self._counted(label, getattr(cls, name)))
+
+        end_game = self.end_game
+        game_is_over = controller_cls.game_is_over
+
+        @functools.wraps(game_is_over)
+        def report_game(controller):
+            end_game()
+            return game_is_over(controller)
+
+        controller_cls.game_is_over = report_game
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._timings[name].append(seconds)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def end_game(self) -> dict:
+        """
+        Writes boggle_profile_<game>.json (and .prof with cProfile) to
+        out_dir and resets the timings and counters for the next game.
+        :return: the summary of the game.
+        """
+        if self._profile is not None:
+            self._profile.disable()
+        with self._lock:
+            timings, self._timings = self._timings, defaultdict(list)
+            counters, self._counters = self._counters, Counter()
+        self.games += 1
+
+        summary = {
+            "game": self.games,
+            "seconds": time.perf_counter() - self._started,
+            "timings": {
+                name: {"calls": len(durations),
+                       "total_ms": sum(durations) * 1000,
+                       "mean_ms": sum(durations) / len(durations) * 1000,
+                       "max_ms": max(durations) * 1000}
+                for name, durations in sorted(timings.items())},
+            "counters": dict(sorted(counters.items())),
+        }
+        path = os.path.join(self.out_dir, f"boggle_profile_{self.games}")
+        with open(path + ".json", "w") as report:
+            json.dump(summary, report, indent=2)
+            report.write("\n")
+        if self._profile is not None:
+            self._profile.dump_stats(path + ".prof")
+        self.__start_game()
+        return summary
+
+
+def enable(out_dir: Optional[str] = None,
+           use_cprofile: Optional[bool] = None,
+           controller_cls: Optional[type] = None) -> Optional[GameProfiler]:
+    """
+    Installs a GameProfiler if profiling was asked for, by the arguments or
+    else by the BOGGLE_PROFILE (report directory) and BOGGLE_CPROFILE
+    environment variables.
+    :return: the profiler, None if profiling is disabled.
+    """
+    if out_dir is None:
+        out_dir = os.environ.get(ENV_VAR)
+    if not out_dir:
+        return None
+    if use_cprofile is None:
+        use_cprofile = os.environ.get(CPROFILE_ENV_VAR, "") not in ("", "0")
+    profiler = GameProfiler(out_dir, use_cprofile)
+    profiler.install(controller_cls)
+    return profiler
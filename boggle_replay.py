@@ -0,0 +1,418 @@
+"""
+An append-only binary log of the games played, and a replay engine that
+re-runs logged games headless through BoggleLogic, to settle a disputed
+score or to check that a change of the game logic scores old games the same.
+
+    python -m boggle_replay show boggle_games.replay
+    python -m boggle_replay verify boggle_games.replay [--full]
+
+The log starts with a magic string, followed by one record per event, each
+framed by its kind, its size and the CRC32 of its contents (little-endian,
+so logs move between machines):
+    GAME_START: seed of the board, dictionary checksum, wall clock time,
+        rows, cols, dictionary name, faces of the board
+    SUBMIT: milliseconds since the start, accepted, score after it, and the
+        cell ids of the path (one byte each on boards under 255 cells)
+    GAME_END: final score, max score, milliseconds since the start
+A game takes a few bytes per submission; a torn record at the end of the
+log (the game was killed while writing) is ignored.
+
+A replay submits every logged path again, in order, and encodes the game
+with the outcomes it got; the game replays if that is the logged bytes, bit
+for bit. Only the words submitted are looked up in the dictionary (every
+word of the board is needed only to check the max score, --full), so games
+replay by the thousands per second.
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import random
+import struct
+import sys
+import time
+import zlib
+from array import array
+from typing import (Callable, Iterator, List, NamedTuple, Optional, Tuple,
+                    Union)
+
+from boggle_board_randomizer import randomize_board
+from boggle_cache import SolvedBoardCache
+from boggle_logic import BoggleLogic
+from boggle_path import Board, BoardPath, Path, pack_paths
+from boggle_trie import DEFAULT_DICT_PATH, BoggleTrie, load_trie
+
+DEFAULT_REPLAY_PATH = "boggle_games.replay"
+
+_MAGIC = b"BGLRPLY1"
+# kind, size of the contents, crc32 of the contents
+_FRAME = struct.Struct("<BHI")
+# seed, dictionary checksum, started at, rows, cols (then the dictionary
+# name, one byte of length, and the faces separated by commas)
+_START = struct.Struct("<QIdBB")
+# milliseconds since the start, accepted, score (then the cells)
+_SUBMIT = struct.Struct("<IBI")
+# score, max score, milliseconds since the start
+_END = struct.Struct("<III")
+
+GAME_START = 1
+SUBMIT = 2
+GAME_END = 3
+
+
+class Submission(NamedTuple):
+    elapsed_ms: int
+    # the cell ids (row * cols + col) of the path, in order
+    cells: Tuple[int, ...]
+    accepted: bool
+    # the score after the submission
+    score: int
+
+
+class LoggedGame(NamedTuple):
+    seed: int
+    dictionary: str
+    # the checksum of the dictionary the game was played with
+    checksum: int
+    started_at: float
+    board: Board
+    submissions: List[Submission]
+    # None for a game that was not over when the log stopped
+    score: Optional[int] = None
+    max_score: Optional[int] = None
+    duration_ms: Optional[int] = None
+
+
+# -------------- E N C O D I N G ----------------#
+def _frame(kind: int, payload: bytes) -> bytes:
+    return _FRAME.pack(kind, len(payload), zlib.crc32(payload)) + payload
+
+
+def _is_wide(board: Board) -> bool:
+    """
+    :return: True if the cells of the board take two bytes each.
+    """
+    return len(board) * len(board[0]) >= 0xFF
+
+
+def _start_record(game: LoggedGame) -> bytes:
+    name = game.dictionary.encode()[:0xFF]
+    faces = ",".join(face for row in game.board for face in row).encode()
+    return _frame(GAME_START, _START.pack(
+        game.seed, game.checksum, game.started_at, len(game.board),
+        len(game.board[0])) + bytes((len(name),)) + name + faces)
+
+
+def _submit_record(submission: Submission, wide: bool) -> bytes:
+    header = _SUBMIT.pack(submission.elapsed_ms, submission.accepted,
+                          submission.score)
+    if wide:
+        cells = struct.pack(f"<{len(submission.cells)}H", *submission.cells)
+    else:
+        try:
+            cells = bytes(submission.cells)
+        except ValueError:
+            # a cell off the board is kept off the board
+            cells = bytes(min(cell, 0xFF) for cell in submission.cells)
+    return _frame(SUBMIT, header + cells)
+
+
+def _end_record(game: LoggedGame) -> bytes:
+    return _frame(GAME_END, _END.pack(game.score, game.max_score,
+                                      game.duration_ms))
+
+
+def encode_game(game: LoggedGame) -> bytes:
+    """
+    :return: the records of the game, as ReplayWriter writes them.
+    """
+    wide = _is_wide(game.board)
+    records = [_start_record(game)]
+    records += [_submit_record(submission, wide)
+                for submission in game.submissions]
+    if game.score is not None:
+        records.append(_end_record(game))
+    return b"".join(records)
+
+
+def decode_games(data: bytes) -> Iterator[LoggedGame]:
+    """
+    Lazily decodes the games of a log, in the order they were played.
+    Raises ValueError if data is not a replay log or a record is corrupt.
+    """
+    if data[:len(_MAGIC)] != _MAGIC:
+        raise ValueError("not a Boggle replay log")
+    view = memoryview(data)
+    offset = len(_MAGIC)
+    game: Optional[LoggedGame] = None
+    wide = False
+    while offset + _FRAME.size <= len(data):
+        kind, size, checksum = _FRAME.unpack_from(data, offset)
+        start = offset + _FRAME.size
+        if start + size > len(data):
+            # torn last record
+            break
+        payload = view[start:start + size]
+        if zlib.crc32(payload) != checksum:
+            raise ValueError(f"corrupt replay record at byte {offset}")
+        offset = start + size
+
+        if kind == SUBMIT and game is not None:
+            elapsed_ms, accepted, score = _SUBMIT.unpack_from(payload)
+            cells = payload[_SUBMIT.size:]
+            game.submissions.append(Submission(
+                elapsed_ms,
+                struct.unpack(f"<{len(cells) // 2}H", cells) if wide
+                else tuple(cells), bool(accepted), score))
+        elif kind == GAME_END and game is not None:
+            score, max_score, duration_ms = _END.unpack_from(payload)
+            yield game._replace(score=score, max_score=max_score,
+                                duration_ms=duration_ms)
+            game = None
+        elif kind == GAME_START:
+            if game is not None:
+                yield game
+            seed, dict_checksum, started_at, rows, cols = \
+                _START.unpack_from(payload)
+            name_size = payload[_START.size]
+            name_end = _START.size + 1 + name_size
+            faces = bytes(payload[name_end:]).decode().split(",")
+            game = LoggedGame(
+                seed, bytes(payload[_START.size + 1:name_end]).decode(),
+                dict_checksum, started_at,
+                [faces[row * cols:(row + 1) * cols] for row in range(rows)],
+                [])
+            wide = _is_wide(game.board)
+        else:
+            raise ValueError(f"unexpected replay record {kind} at byte "
+                             f"{offset - size - _FRAME.size}")
+    if game is not None:
+        yield game
+
+
+def read_games(log_path: str = DEFAULT_REPLAY_PATH) -> Iterator[LoggedGame]:
+    with open(log_path, "rb") as log_file:
+        data = log_file.read()
+    return decode_games(data)
+
+
+# -------------- W R I T E R ----------------#
+class ReplayWriter:
+    """
+    The ReplayWriter class appends the games played to a replay log, one
+    record per event. Records are buffered and written to the disk when a
+    game ends.
+
+
+    Attributes:
+    1. log_path: the path of the log.
+    2. _clock: the monotonic clock the submissions are timed with.
+    3. _started: the clock time the current game started at.
+    4. _shape: the (rows, cols) of the current board.
+
+
+    API methods:
+    1. start_game -> None: Logs the seed, the board and the dictionary of a
+    new game.
+    2. submit -> None: Logs a submitted path with its outcome.
+    3. end_game -> None: Logs the final score and writes the game out.
+    4. close -> None: Writes the buffered records and closes the log.
+    """
+
+    def __init__(self, log_path: str = DEFAULT_REPLAY_PATH,
+                 clock: Callable[[], float] = time.monotonic):
+        self.log_path = log_path
+        self._clock = clock
+        self._started: Optional[float] = None
+        self._shape = (0, 0)
+        self._wide = False
+        self._file = open(log_path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(_MAGIC)
+
+    # ------------ class encapsulated helpers ------------ #
+    def _elapsed_ms(self) -> int:
+        return int((self._clock() - self._started) * 1000)
+
+    # ------------ class API ------------ #
+    def start_game(self, seed: int, board: Board,
+                   dictionary: str = "default", checksum: int = 0,
+                   started_at: Optional[float] = None) -> None:
+        self._started = self._clock()
+        self._shape = (len(board), len(board[0]))
+        self._wide = _is_wide(board)
+        self._file.write(_start_record(LoggedGame(
+            seed, dictionary, checksum,
+            time.time() if started_at is None else started_at, board, [])))
+
+    def submit(self, path: Optional[Union[BoardPath, Path]], accepted: bool,
+               score: int) -> None:
+        if self._started is None:
+            return
+        cells, _ = pack_paths([path or []], *self._shape)
+        self._file.write(_submit_record(Submission(
+            self._elapsed_ms(), tuple(cells), accepted, score), self._wide))
+
+    def end_game(self, score: int, max_score: int) -> None:
+        if self._started is None:
+            return
+        self._file.write(_frame(GAME_END, _END.pack(score, max_score,
+                                                    self._elapsed_ms())))
+        self._file.flush()
+        self._started = None
+
+    def close(self) -> None:
+        self._file.close()
+
+
+# -------------- R E P L A Y ----------------#
+class ReplayResult(NamedTuple):
+    game: LoggedGame
+    # the game with the outcomes the replay got
+    replayed: LoggedGame
+    # what differs, empty if the game replays bit for bit
+    mismatches: List[str]
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+
+def replay_game(game: LoggedGame, trie: BoggleTrie,
+                cache: Optional[SolvedBoardCache] = None,
+                new_board: Optional[Callable[..., Board]] = None
+                ) -> ReplayResult:
+    """
+    Submits the paths of a logged game again through a BoggleLogic of its
+    board, in one batch, and compares the outcomes with the log.
+    :param cache: solves the whole board through it, to check the max score
+    too (otherwise the logged one is kept).
+    :param new_board: checks the board is the one drawn from the logged
+    seed, new_board(rng=random.Random(seed)).
+    """
+    board = game.board
+    cols = len(board[0])
+    faces = [face for row in board for face in row]
+    cells = array("H")
+    offsets = array("I", [0])
+    solutions = {}
+    for submission in game.submissions:
+        path = submission.cells
+        cells.extend(path)
+        offsets.append(len(cells))
+        if max(path, default=len(faces)) < len(faces):
+            word = "".join([faces[cell] for cell in path])
+            if word not in solutions and word in trie:
+                solutions[word] = [divmod(cell, cols) for cell in path]
+
+    max_score = game.max_score or 0
+    if cache is not None:
+        solutions, max_score = cache.solve(board, trie)
+    logic = BoggleLogic.from_solutions(board, solutions, max_score)
+    result = logic.submit_packed(cells, offsets)
+
+    submissions = []
+    score = 0
+    for index, (submission, word) in enumerate(zip(game.submissions,
+                                                   result.words)):
+        accepted = word is not None
+        if accepted:
+            score += (offsets[index + 1] - offsets[index]) ** 2
+        if accepted != submission.accepted or score != submission.score:
+            submission = submission._replace(accepted=accepted, score=score)
+        submissions.append(submission)
+    replayed = game._replace(submissions=submissions)
+    if game.score is not None:
+        replayed = replayed._replace(score=logic.get_score(),
+                                     max_score=max_score)
+
+    mismatches = []
+    # only the outcomes differ between the two, so they are equal exactly
+    # when encode_game gives the same bytes for both
+    if replayed != game:
+        for index, (logged, again) in enumerate(zip(game.submissions,
+                                                    submissions)):
+            if logged != again:
+                mismatches.append(
+                    f"submission {index}: logged accepted={logged.accepted} "
+                    f"score={logged.score}, replayed "
+                    f"accepted={again.accepted} score={again.score}")
+        if replayed.score != game.score:
+            mismatches.append(f"score: logged {game.score}, "
+                              f"replayed {replayed.score}")
+        if replayed.max_score != game.max_score:
+            mismatches.append(f"max score: logged {game.max_score}, "
+                              f"replayed {replayed.max_score}")
+    if game.checksum and game.checksum != trie.checksum:
+        mismatches.append(f"dictionary: logged checksum {game.checksum:08x}, "
+                          f"replayed with {trie.checksum:08x}")
+    if new_board is not None and \
+            new_board(rng=random.Random(game.seed),
+                      rows=len(board), cols=cols) != board:
+        mismatches.append(f"board: not the board of seed {game.seed}")
+    return ReplayResult(game, replayed, mismatches)
+
+
+def replay_log(log_path: str, trie: BoggleTrie,
+               cache: Optional[SolvedBoardCache] = None,
+               new_board: Optional[Callable[..., Board]] = None
+               ) -> Iterator[ReplayResult]:
+    """
+    Lazily replays every game of a log (see replay_game).
+    """
+    for game in read_games(log_path):
+        yield replay_game(game, trie, cache, new_board)
+
+
+# -------------- C O M M A N D  L I N E ----------------#
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Show or replay the games of a Boggle replay log.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    show_parser = subparsers.add_parser("show", help="list the games")
+    show_parser.add_argument("log", nargs="?", default=DEFAULT_REPLAY_PATH)
+
+    verify_parser = subparsers.add_parser(
+        "verify", help="replay the games and report the ones that differ")
+    verify_parser.add_argument("log", nargs="?", default=DEFAULT_REPLAY_PATH)
+    verify_parser.add_argument("--dictionary", default=DEFAULT_DICT_PATH)
+    verify_parser.add_argument("--full", action="store_true",
+                               help="solve every board to check the max "
+                                    "score too")
+    verify_parser.add_argument("--check-seeds", action="store_true",
+                               help="check every board is drawn from its "
+                                    "seed (with the shipped dice)")
+
+    args = parser.parse_args(argv)
+    if args.command == "show":
+        for index, game in enumerate(read_games(args.log)):
+            played = time.strftime("%Y-%m-%d %H:%M:%S",
+                                   time.localtime(game.started_at))
+            result = "unfinished" if game.score is None else \
+                f"{game.score}/{game.max_score}"
+            print(f"{index:6d} {played} seed={game.seed:<20d} "
+                  f"{game.dictionary:<10} "
+                  f"{len(game.submissions):4d} submissions {result}")
+        return 0
+
+    trie = load_trie(args.dictionary)
+    start = time.perf_counter()
+    games = failed = 0
+    for result in replay_log(args.log, trie,
+                             SolvedBoardCache() if args.full else None,
+                             randomize_board if args.check_seeds else None):
+        games += 1
+        if not result.ok:
+            failed += 1
+            print(f"game {games - 1} (seed {result.game.seed}):")
+            for mismatch in result.mismatches:
+                print(f"    {mismatch}")
+    elapsed = time.perf_counter() - start
+    trie.close()
+    print(f"{games} games replayed in {elapsed:.2f}s "
+          f"({games / elapsed if elapsed else 0:.0f} games/s), "
+          f"{failed} differ", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
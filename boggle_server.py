@@ -0,0 +1,366 @@
+"""
+Multiplayer Boggle server: rooms of players sharing one board, over plain
+TCP with one JSON object per line.
+
+    python -m boggle_server --port 8765 --duration 180
+
+Client requests (each gets exactly one reply, in order):
+    {"op": "join", "room": "lobby", "player": "sarah", "dictionary": "kids"}
+        -> {"event": "joined", "room", "dictionary", "board", "ends_in"}
+    {"op": "submit", "path": [[0, 0], [0, 1], [1, 1]]}
+        -> {"event": "result", "ok", "word", "score"}
+    {"op": "submit_many", "paths": [[[0, 0], [0, 1], [1, 1]], ...]}
+        -> {"event": "results", "words", "score_delta", "score"}
+    {"op": "score"}
+        -> {"event": "score", "score", "words_found"}
+When the round of a room is over (the timer runs on the server) every
+player of the room gets {"event": "round_over", "scores", "max_score"} and
+may join again, which starts a new round. A player name is unique in a
+room: joining as a player already in it gets {"event": "error"}. The
+dictionary of a room is chosen by the player who creates it (the server's
+first one by default). A request line is at most MAX_REQUEST_BYTES (1 MiB):
+a longer one is skipped and gets {"event": "error"}.
+
+    python -m boggle_server --dictionary boggle_dict.txt \
+        --dictionary kids=lists/kids.txt.gz
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import asyncio
+import json
+import random
+import sys
+from typing import Dict, Optional
+
+from boggle_board_randomizer import BOARD_SIZE, randomize_board
+from boggle_cache import SolvedBoardCache
+from boggle_dictionaries import DictionaryRegistry, parse_dictionary_option
+from boggle_logic import BoggleLogic
+from boggle_path import Board
+from boggle_state import SolvedBoard
+from boggle_trie import DEFAULT_DICT_PATH
+
+
+ROUND_SECONDS = 180
+# the longest request line served (a submit_many of about 20,000 paths)
+MAX_REQUEST_BYTES = 2 ** 20
+
+
+# -------------- R O O M ----------------#
+class Room:
+    """
+    The Room class is one round of Boggle shared by several players.
+    The board is solved once, when the room is created, and every player
+    gets a BoggleLogic built from that shared solution.
+
+
+    Attributes:
+    1. name: the name of the room.
+    2. dictionary: the name of the dictionary of the round.
+    3. board: the board of the round.
+    4. players: a dict from player name to (writer, BoggleLogic).
+    5. deadline: the event loop time at which the round ends.
+    """
+
+    def __init__(self, name: str, dictionary: str, board: Board,
+                 solutions: dict, max_score: int, duration: float,
+                 loop: asyncio.AbstractEventLoop, on_close):
+        self.name = name
+        self.dictionary = dictionary
+        self.board = board
+        self.players: Dict[str, tuple] = {}
+        self.deadline = loop.time() + duration
+        self._solved = SolvedBoard(board, solutions, max_score)
+        self._loop = loop
+        self._on_close = on_close
+        self._timer = loop.call_later(duration, self.finish)
+        self.closed = False
+
+    def add_player(self, player: str,
+                   writer: asyncio.StreamWriter) -> BoggleLogic:
+        """
+        Adds a player to the round.
+        :raise KeyError: if another connection plays as player in the room.
+        """
+        if player in self.players:
+            raise KeyError(f"player {player!r} is already in room "
+                           f"{self.name!r}")
+        logic = BoggleLogic.from_solved(self._solved)
+        self.players[player] = (writer, logic)
+        return logic
+
+    def remove_player(self, player: str,
+                      writer: asyncio.StreamWriter) -> None:
+        """
+        Removes the player if it is the one of this connection.
+        """
+        entry = self.players.get(player)
+        if entry is not None and entry[0] is writer:
+            del self.players[player]
+
+    def ends_in(self) -> float:
+        return max(0.0, self.deadline - self._loop.time())
+
+    def finish(self) -> None:
+        """
+        Ends the round: sends the scores to every player and closes the room.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self._timer.cancel()
+        message = _encode({
+            "event": "round_over",
+            "room": self.name,
+            "scores": {player: logic.get_score()
+                       for player, (_, logic) in self.players.items()},
+            "max_score": self._solved.max_score,
+        })
+        for writer, _ in self.players.values():
+            if not writer.is_closing():
+                writer.write(message)
+        self._on_close(self)
+
+
+# -------------- S E R V E R ----------------#
+class BoggleServer:
+    """
+    The BoggleServer class hosts the rooms and serves the connections.
+    A room is created by the first player joining it, with the dictionary
+    that player asked for (the registry's first one by default); players
+    joining while its board is being solved wait for the same solution.
+    """
+
+    def __init__(self, registry: DictionaryRegistry,
+                 duration: float = ROUND_SECONDS,
+                 board_options: Optional[dict] = None,
+                 seed: Optional[int] = None):
+        self._registry = registry
+        self._duration = duration
+        self._board_options = board_options or {}
+        self._rng = random.Random(seed)
+        self._cache = SolvedBoardCache()
+        self._rooms: Dict[str, asyncio.Future] = {}
+        self.connections = 0
+
+    # ------------ class encapsulated helpers ------------ #
+    async def _get_room(self, name: str, dictionary: Optional[str]) -> Room:
+        """
+        Returns the open room called name, creating it with the given
+        dictionary (and solving its board in a worker thread, off the event
+        loop) if needed.
+        """
+        future = self._rooms.get(name)
+        if future is None:
+            dictionary = dictionary or self._registry.names()[0]
+            if dictionary not in self._registry.specs:
+                raise KeyError(f"unknown dictionary {dictionary!r}")
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._rooms[name] = future
+            board = randomize_board(rng=self._rng, **self._board_options)
+            try:
+                trie = await loop.run_in_executor(
+                    None, self._registry.trie, dictionary)
+                solutions, max_score = await loop.run_in_executor(
+                    None, self._cache.solve, board, trie)
+            except Exception as error:
+                del self._rooms[name]
+                future.set_exception(error)
+                # the players waiting for the room get the error from the
+                # future, this one raises it: nobody else may retrieve it
+                future.exception()
+                raise
+            future.set_result(Room(name, dictionary, board, solutions,
+                                   max_score, self._duration, loop,
+                                   self._close_room))
+        return await asyncio.shield(future)
+
+    def _close_room(self, room: Room) -> None:
+        future = self._rooms.get(room.name)
+        if future is not None and future.done() and \
+                future.result() is room:
+            del self._rooms[room.name]
+
+    async def _handle(self, reader: asyncio.StreamReader,
+                      writer: asyncio.StreamWriter) -> None:
+        """
+        Serves one connection until the client closes it.
+        """
+        self.connections += 1
+        room: Optional[Room] = None
+        player: Optional[str] = None
+        logic: Optional[BoggleLogic] = None
+        try:
+            while True:
+                line = await _read_request(reader)
+                if line == b"":
+                    break
+                request = _parse_request(line) if line is not None else None
+                op = request["op"] if request is not None else None
+
+                if line is None:
+                    reply = {"event": "error", "error": "request too long"}
+                elif request is None:
+                    reply = {"event": "error", "error": "bad request"}
+                elif op == "join":
+                    if room is not None:
+                        room.remove_player(player, writer)
+                    player = str(request.get("player") or
+                                 f"player-{id(writer)}")
+                    try:
+                        room = await self._get_room(
+                            str(request.get("room", "lobby")),
+                            request.get("dictionary"))
+                        logic = room.add_player(player, writer)
+                    except KeyError as error:
+                        room = logic = None
+                        reply = {"event": "error", "error": error.args[0]}
+                    except Exception as error:
+                        room = logic = None
+                        print(f"cannot open a room: {error!r}",
+                              file=sys.stderr)
+                        reply = {"event": "error",
+                                 "error": "cannot open the room"}
+                    else:
+                        reply = {"event": "joined", "room": room.name,
+                                 "dictionary": room.dictionary,
+                                 "board": room.board,
+                                 "ends_in": room.ends_in()}
+                elif logic is None:
+                    reply = {"event": "error", "error": "join a room first"}
+                elif op == "submit":
+                    ok = not room.closed and \
+                        logic.after_submit(_as_path(request.get("path"),
+                                                    room.board))
+                    reply = {"event": "result", "ok": ok,
+                             "word": logic.get_words_found()[-1]
+                             if ok else None,
+                             "score": logic.get_score()}
+                elif op == "submit_many":
+                    paths = request.get("paths")
+                    paths = [_as_path(path, room.board) for path in paths] \
+                        if isinstance(paths, list) else []
+                    if room.closed:
+                        # every path is rejected
+                        paths = [[]] * len(paths)
+                    result = logic.submit_paths(paths)
+                    reply = {"event": "results", "words": result.words,
+                             "score_delta": result.score_delta,
+                             "score": logic.get_score()}
+                elif op == "score":
+                    reply = {"event": "score", "score": logic.get_score(),
+                             "words_found": logic.get_words_found()}
+                else:
+                    reply = {"event": "error", "error": f"unknown op {op}"}
+
+                writer.write(_encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            if room is not None:
+                room.remove_player(player, writer)
+            writer.close()
+
+    # ------------ class API ------------ #
+    async def serve(self, host: str, port: int) -> None:
+        server = await asyncio.start_server(self._handle, host, port,
+                                            limit=MAX_REQUEST_BYTES,
+                                            backlog=4096)
+        addresses = ", ".join(str(sock.getsockname())
+                              for sock in server.sockets)
+        print(f"serving on {addresses}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """
+    :return: the next request line, b"" when the client closed the
+    connection, or None for a line longer than the reader's limit, which
+    is skipped.
+    """
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as error:
+        return error.partial
+    except asyncio.LimitOverrunError as error:
+        consumed = error.consumed
+    # drop the line up to its end, a limit's worth of bytes at a time
+    while True:
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b"\n")
+            return None
+        except asyncio.LimitOverrunError as error:
+            consumed = error.consumed
+
+
+def _parse_request(line: bytes) -> Optional[dict]:
+    """
+    :return: the request of a line, None if it is not a JSON object with
+    an "op".
+    """
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return None
+    if isinstance(request, dict) and "op" in request:
+        return request
+    return None
+
+
+def _as_path(path, board: Board) -> list:
+    """
+    :return: the JSON path as a list of (row, col) tuples, [] if malformed
+    or if a cell is off the board.
+    """
+    try:
+        path = [(int(row), int(col)) for row, col in path]
+    except (TypeError, ValueError, OverflowError):
+        return []
+    rows, cols = len(board), len(board[0])
+    if all(0 <= row < rows and 0 <= col < cols for row, col in path):
+        return path
+    return []
+
+
+def _encode(message: dict) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+# -------------- C O M M A N D  L I N E ----------------#
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Run a Boggle game server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--duration", type=float, default=ROUND_SECONDS,
+                        help="seconds per round")
+    parser.add_argument("--rows", type=int, default=BOARD_SIZE)
+    parser.add_argument("--cols", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--dictionary", action="append", default=None,
+                        metavar="[NAME=]PATH",
+                        help="a word list (plain or .gz) rooms can be "
+                             "played with, may be repeated, the first is "
+                             f"the default (default: {DEFAULT_DICT_PATH})")
+    args = parser.parse_args(argv)
+
+    registry = DictionaryRegistry(with_default=False)
+    for option in args.dictionary or [DEFAULT_DICT_PATH]:
+        registry.register(*parse_dictionary_option(option))
+    # compile (if needed) and load the default dictionary before serving
+    registry.trie(registry.names()[0])
+    server = BoggleServer(registry, args.duration,
+                          {"rows": args.rows, "cols": args.cols}, args.seed)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Headless Boggle solver: generates (or reads) boards, solves them in a pool
+of worker processes and streams one JSON object per board.
+
+    python -m boggle_solve --count 100000 --seed 7 --workers 8 > boards.jsonl
+    python -m boggle_solve --input boards_in.jsonl --output solved.jsonl
+
+Every input line is either a board ([["A", "B", ...], ...]) or an object
+with a "board" key. Board i of a generated run is randomize_board seeded
+with seed + i, so a fixed seed always gives the same output. Use --rows,
+--cols and --dice to generate boards of other sizes.
+"""
+# -------------- I M P O R T S ----------------#
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from typing import Iterator, Optional, TextIO, Tuple
+
+from boggle_board_randomizer import (BOARD_SIZE, LETTERS, load_dice,
+                                     randomize_board)
+from boggle_path import Board
+from boggle_solver import max_score_paths
+from boggle_trie import (DEFAULT_DICT_PATH, BoggleTrie, default_trie_path,
+                         load_trie)
+
+# a task is (index, seed, board), the board is None for generated boards
+Task = Tuple[int, Optional[int], Optional[Board]]
+
+# the dictionary and board options of a worker process, set by _init_worker
+_trie: Optional[BoggleTrie] = None
+_board_options: dict = {}
+
+
+# -------------- W O R K E R ----------------#
+def _init_worker(trie_path: str, board_options: dict) -> None:
+    """
+    Opens the compiled dictionary in a worker. The file is memory-mapped
+    read-only, so all workers share the same pages of the page cache.
+    board_options are the keyword arguments of randomize_board.
+    """
+    global _trie, _board_options
+    _trie = BoggleTrie.open(trie_path)
+    _board_options = board_options
+
+
+def solve_task(task: Task) -> str:
+    """
+    Generates the board of the task if needed, solves it and returns the
+    result as one line of JSON.
+    """
+    index, seed, board = task
+    if board is None:
+        board = randomize_board(rng=random.Random(seed), **_board_options)
+    solutions, max_score = max_score_paths(board, _trie)
+    result = {
+        "index": index,
+        "seed": seed,
+        "board": board,
+        "words": {word: solutions[word] for word in sorted(solutions)},
+        "max_score": max_score,
+    }
+    return json.dumps(result, separators=(",", ":"))
+
+
+# -------------- T A S K S ----------------#
+def generated_tasks(count: int, seed: int) -> Iterator[Task]:
+    for index in range(count):
+        yield index, seed + index, None
+
+
+def read_tasks(in_file: TextIO) -> Iterator[Task]:
+    index = 0
+    for line in in_file:
+        line = line.strip()
+        if not line:
+            continue
+        item = json.loads(line)
+        if isinstance(item, dict):
+            yield index, item.get("seed"), item["board"]
+        else:
+            yield index, None, item
+        index += 1
+
+
+def solve_stream(tasks: Iterator[Task], out_file: TextIO, trie_path: str,
+                 workers: int, chunksize: int,
+                 board_options: Optional[dict] = None) -> int:
+    """
+    Solves the tasks with a pool of workers and writes the results to
+    out_file in input order.
+    :return: the number of boards solved.
+    """
+    solved = 0
+    init_args = (trie_path, board_options or {})
+    if workers <= 1:
+        _init_worker(*init_args)
+        for task in tasks:
+            out_file.write(solve_task(task) + "\n")
+            solved += 1
+        return solved
+
+    with multiprocessing.Pool(workers, _init_worker, init_args) as pool:
+        for line in pool.imap(solve_task, tasks, chunksize):
+            out_file.write(line + "\n")
+            solved += 1
+    return solved
+
+
+# -------------- C O M M A N D  L I N E ----------------#
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Solve Boggle boards headless, as JSON Lines.")
+    parser.add_argument("--count", type=int, default=1000,
+                        help="number of boards to generate")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the first generated board")
+    parser.add_argument("--input", default=None,
+                        help="JSON Lines file of boards to solve instead "
+                             "of generating them ('-' for stdin)")
+    parser.add_argument("--output", default="-",
+                        help="output file (default: stdout)")
+    parser.add_argument("--rows", type=int, default=BOARD_SIZE)
+    parser.add_argument("--cols", type=int, default=None)
+    parser.add_argument("--dice", default=None,
+                        help="dice definition file, e.g. dice/big_boggle.txt")
+    parser.add_argument("--dictionary", default=DEFAULT_DICT_PATH)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunksize", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    # make sure the compiled dictionary is fresh before forking workers
+    load_trie(args.dictionary).close()
+    trie_path = default_trie_path(args.dictionary)
+    board_options = {
+        "dice_list": load_dice(args.dice) if args.dice else LETTERS,
+        "rows": args.rows,
+        "cols": args.cols,
+    }
+
+    in_file = None
+    out_file = sys.stdout
+    try:
+        if args.input == "-":
+            tasks = read_tasks(sys.stdin)
+        elif args.input:
+            in_file = open(args.input, encoding="utf-8")
+            tasks = read_tasks(in_file)
+        else:
+            tasks = generated_tasks(args.count, args.seed)
+        if args.output != "-":
+            out_file = open(args.output, "w", encoding="utf-8")
+
+        start = time.perf_counter()
+        solved = solve_stream(tasks, out_file, trie_path, args.workers,
+                              args.chunksize, board_options)
+        elapsed = time.perf_counter() - start
+    finally:
+        if in_file is not None:
+            in_file.close()
+        if out_file is not sys.stdout:
+            out_file.close()
+
+    print(f"solved {solved} boards in {elapsed:.2f}s "
+          f"({solved / elapsed if elapsed else 0:.1f} boards/sec, "
+          f"{args.workers} workers)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# -------------- I M P O R T S ----------------#
+from typing import Dict, List, Tuple
+
+from boggle_path import Board, Path, neighbours_table
+from boggle_trie import ROOT, BoggleTrie
+
+
+# -------------- S O L V E R ----------------#
+def _search(board: Board, trie: BoggleTrie,
+            longest: bool) -> Dict[str, Path]:
+    """
+    Walks the board with a DFS from every cell, only extending a path while
+    the letters spelled so far are a prefix of some word, so the work depends
+    on the board and not on the size of the dictionary.
+    If longest is True, the path kept for a word is the one with the most
+    cells, otherwise it is the first one found.
+    """
+    rows = len(board)
+    cols = len(board[0]) if rows else 0
+    neighbours = neighbours_table(rows, cols)
+    coords = [(row, col) for row in range(rows) for col in range(cols)]
+    texts = [board[row][col] for row, col in coords]
+    # every cell as single byte labels (a "QU" cube is two trie steps)
+    labels = [tuple(bytes((byte,)) for byte in text.encode())
+              for text in texts]
+
+    step = trie.step
+    is_word = trie.is_word
+    has_children = trie.has_children
+    found: Dict[str, Path] = {}
+    path: List[int] = []
+
+    def visit(cell: int, node: int, visited: int, spelled: str) -> None:
+        for label in labels[cell]:
+            node = step(node, label)
+            if node < 0:
+                return
+        spelled += texts[cell]
+        path.append(cell)
+        if (longest or spelled not in found) and is_word(node):
+            best = found.get(spelled)
+            if best is None or len(best) < len(path):
+                found[spelled] = [coords[i] for i in path]
+        if has_children(node):
+            for neighbour in neighbours[cell]:
+                if not visited >> neighbour & 1:
+                    visit(neighbour, node, visited | 1 << neighbour, spelled)
+        path.pop()
+
+    for cell in range(len(coords)):
+        visit(cell, ROOT, 1 << cell, "")
+    return found
+
+
+def solve_board(board: Board, trie: BoggleTrie) -> Dict[str, Path]:
+    """
+    Finds every word of the trie that can be spelled on the board.
+    :return: a dict mapping each word found to one path that spells it.
+    """
+    return _search(board, trie, longest=False)
+
+
+def max_score_paths(board: Board,
+                    trie: BoggleTrie) -> Tuple[Dict[str, Path], int]:
+    """
+    Finds, for every word of the trie on the board, the path that scores the
+    most (a word scores len(path) ** 2, so the path with the most cells) and
+    the maximum total score of the board.
+    When every cube shows a single letter all paths of a word have the same
+    length, so the first path found is kept and nothing else is compared.
+    boggle_cache.SolvedBoardCache keeps the results of solved boards.
+    :return: (dict mapping each word to its best path, maximum score).
+    """
+    single_letters = all(len(text) == 1 for row in board for text in row)
+    paths = _search(board, trie, longest=not single_letters)
+    return paths, sum(len(path) ** 2 for path in paths.values())
@@ -0,0 +1,62 @@
+# -------------- I M P O R T S ----------------#
+import bisect
+import sys
+from typing import Dict, Iterable, Optional, Tuple
+
+from boggle_path import Board
+
+
+class SolvedBoard:
+    """
+    The SolvedBoard class is the part of a game that only depends on its
+    board: the board, the words on it and the highest score. It is built
+    once per solved board and shared by all the games played on it (the
+    players of a server room, the bots of a game), which only keep what
+    they found (see BoggleLogic).
+
+
+    Attributes:
+    1. board: the board.
+    2. words: the words on the board, sorted and interned. The id of a word
+    is its index, so the words starting with a prefix have consecutive ids.
+    3. word_ids: the id of every word.
+    4. max_score: the highest score that can be reached on the board.
+    5. all_words: a bitset with the bit of every word id set.
+
+
+    API methods:
+    1. word_id -> Optional[int]: The id of a word, None if it is not on the
+    board.
+    2. prefix_range -> Tuple[int, int]: The ids (start, end) of the words
+    starting with a prefix.
+    """
+
+    __slots__ = ("board", "words", "word_ids", "max_score", "all_words")
+
+    def __init__(self, board: Board, words: Iterable[str], max_score: int):
+        self.board = board
+        self.words: Tuple[str, ...] = tuple(sorted(sys.intern(word)
+                                                   for word in words))
+        self.word_ids: Dict[str, int] = {
+            word: word_id for word_id, word in enumerate(self.words)}
+        self.max_score = max_score
+        self.all_words = (1 << len(self.words)) - 1
+
+    # ------------ class API ------------ #
+    def word_id(self, word: str) -> Optional[int]:
+        return self.word_ids.get(word)
+
+    def prefix_range(self, prefix: str = "") -> Tuple[int, int]:
+        """
+        :return: (start, end), the words starting with prefix have the ids
+        start .. end - 1.
+        """
+        start = bisect.bisect_left(self.words, prefix)
+        if not prefix:
+            return start, len(self.words)
+        # the first string after all the strings starting with prefix
+        after = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        return start, bisect.bisect_left(self.words, after, start)
+
+    def __len__(self) -> int:
+        return len(self.words)
@@ -0,0 +1,81 @@
+# -------------- I M P O R T S ----------------#
+import math
+import time
+from typing import Callable, Optional
+
+GAME_SECONDS = 180
+
+
+class GameTimer:
+    """
+    The GameTimer class is the count down of a game, driven by a deadline on
+    a monotonic clock instead of counting ticks.
+
+
+    The remaining time is always computed from the clock, so a tick that
+    runs late (a slow callback, a busy mainloop) only delays the redraw of
+    the label and never makes the game longer. next_tick_delay tells the
+    caller when the shown second changes, so the ticks line up with it.
+
+
+    Attributes:
+    1. duration: the length of the game in seconds.
+    2. clock: a function returning monotonic seconds (time.monotonic by
+    default, injectable for checks).
+
+
+    API methods:
+    1. start -> None: Starts (or restarts) the count down.
+    2. pause -> None: Stops the count down, keeping the remaining time.
+    3. resume -> None: Continues a paused count down.
+    4. remaining -> float: The seconds left, never negative.
+    5. seconds_shown -> int: The remaining time rounded up to whole seconds.
+    6. is_over -> bool: Whether the time is up.
+    7. next_tick_delay -> float: Seconds until seconds_shown changes.
+    """
+
+    def __init__(self, duration: float = GAME_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.duration = duration
+        self.clock = clock
+        self._deadline: Optional[float] = None
+        # remaining seconds while paused (or before the start)
+        self._paused_remaining: Optional[float] = float(duration)
+
+    # ------------ class API ------------ #
+    def start(self) -> None:
+        self._deadline = self.clock() + self.duration
+        self._paused_remaining = None
+
+    def pause(self) -> None:
+        if self._paused_remaining is None:
+            self._paused_remaining = self.remaining()
+
+    def resume(self) -> None:
+        if self._paused_remaining is not None:
+            self._deadline = self.clock() + self._paused_remaining
+            self._paused_remaining = None
+
+    def is_paused(self) -> bool:
+        return self._paused_remaining is not None
+
+    def remaining(self) -> float:
+        if self._paused_remaining is not None:
+            return self._paused_remaining
+        return max(0.0, self._deadline - self.clock())
+
+    def seconds_shown(self) -> int:
+        return math.ceil(self.remaining())
+
+    def is_over(self) -> bool:
+        return self.remaining() <= 0
+
+    def next_tick_delay(self) -> float:
+        """
+        :return: the seconds until the shown second changes (the time up
+        for the last second), 1 second while paused.
+        """
+        if self.is_paused():
+            return 1.0
+        remaining = self.remaining()
+        return remaining - math.floor(remaining) or min(1.0, remaining)
@@ -0,0 +1,424 @@
+# -------------- I M P O R T S ----------------#
+import argparse
+import gzip
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Iterable, Iterator, Optional, TextIO, Union
+
+
+# -------------- C O N S T A N T S ----------------#
+DEFAULT_DICT_PATH = "boggle_dict.txt"
+TRIE_SUFFIX = ".trie"
+
+# magic, node count, word count, checksum of the word list, endian marker
+_MAGIC = b"BGLTRIE1"
+_HEADER = struct.Struct("=8sIIII")
+_ENDIAN_MARKER = 0x01020304
+
+ROOT = 0
+
+
+# -------------- C O M P I L E D  T R I E ----------------#
+class BoggleTrie:
+    """
+    The BoggleTrie class is a read-only, array-backed trie over a word list,
+    built once and then opened straight from disk with mmap.
+
+
+    The trie is stored as flat arrays in breadth-first order so the children
+    of every node are consecutive:
+    1. labels: one byte per node, the (UTF-8) byte that leads into the node.
+    2. terminal: one byte per node, 1 if a word ends at the node.
+    3. first_child: N + 1 unsigned ints, the children of node i are the
+    nodes first_child[i] .. first_child[i + 1] - 1.
+    Looking up a child is a single bytes.find over the labels of the
+    siblings, so membership and prefix queries never build a Python object
+    per word.
+
+
+    API methods:
+    1. step -> int: Moves from a node along one label byte, -1 if impossible.
+    2. walk -> int: Moves from a node along a whole string, -1 if impossible.
+    3. is_word -> bool: Checks if a word ends at the given node.
+    4. has_children -> bool: Checks if any word continues past the given node.
+    5. has_prefix -> bool: Checks if some word starts with the given prefix.
+    6. iter_words -> Iterator[str]: Lazily yields the words (in sorted order)
+    that start with the given prefix.
+    7. close -> None: Releases the underlying buffer.
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]):
+        """
+        This function initializes the trie over an already compiled buffer
+        (the content of a .trie file or the result of compile_words).
+        It raises ValueError if the buffer is not a compiled trie.
+        """
+        if len(buffer) < _HEADER.size:
+            raise ValueError("buffer is too small to be a compiled trie")
+        magic, nodes, words, checksum, marker = _HEADER.unpack_from(buffer)
+        if magic != _MAGIC or marker != _ENDIAN_MARKER:
+            raise ValueError("buffer is not a compiled trie for this machine")
+
+        terminal_at = _HEADER.size + nodes
+        first_child_at = _align(terminal_at + nodes)
+        if len(buffer) < first_child_at + 4 * (nodes + 1):
+            raise ValueError("compiled trie is truncated")
+
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self._labels_at = _HEADER.size
+        self._terminal = self._view[terminal_at:terminal_at + nodes]
+        self._first_child = self._view[
+            first_child_at:first_child_at + 4 * (nodes + 1)].cast("I")
+        self._node_count = nodes
+        self._word_count = words
+        self._checksum = checksum
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "BoggleTrie":
+        """
+        Compiles the given words into an in-memory trie.
+        """
+        return cls(compile_words(words))
+
+    @classmethod
+    def open(cls, trie_path: str) -> "BoggleTrie":
+        """
+        Opens a compiled .trie file with mmap.
+        """
+        with open(trie_path, "rb") as trie_file:
+            buffer = mmap.mmap(trie_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(buffer)
+        except ValueError:
+            buffer.close()
+            raise
+
+    # ------------ class API ------------ #
+    def step(self, node: int, label: bytes) -> int:
+        """
+        :return: the child of node reached by the single byte label, or -1.
+        """
+        first_child = self._first_child
+        base = self._labels_at
+        found = self._buffer.find(label, base + first_child[node],
+                                  base + first_child[node + 1])
+        if found < 0:
+            return -1
+        return found - base
+
+    def walk(self, letters: str, node: int = ROOT) -> int:
+        """
+        :return: the node reached from node by following letters, or -1.
+        """
+        find = self._buffer.find
+        first_child = self._first_child
+        base = self._labels_at
+        for byte in letters.encode():
+            found = find(bytes((byte,)), base + first_child[node],
+                         base + first_child[node + 1])
+            if found < 0:
+                return -1
+            node = found - base
+        return node
+
+    def is_word(self, node: int) -> bool:
+        return node >= 0 and self._terminal[node] == 1
+
+    def has_children(self, node: int) -> bool:
+        return self._first_child[node + 1] > self._first_child[node]
+
+    def has_prefix(self, prefix: str) -> bool:
+        return self.walk(prefix) >= 0
+
+    def iter_words(self, prefix: str = "") -> Iterator[str]:
+        """
+        Lazily yields all words starting with prefix, in sorted order.
+        """
+        start = self.walk(prefix)
+        if start < 0:
+            return
+        buffer = self._buffer
+        base = self._labels_at
+        first_child = self._first_child
+        terminal = self._terminal
+
+        # iterative DFS, each entry holds a node and the bytes leading to it
+        stack = [(start, prefix.encode())]
+        while stack:
+            node, spelled = stack.pop()
+            if terminal[node]:
+                yield spelled.decode()
+            lo, hi = first_child[node], first_child[node + 1]
+            for child in range(hi - 1, lo - 1, -1):
+                stack.append((child, spelled + buffer[base + child:
+                                                      base + child + 1]))
+
+    def close(self) -> None:
+        """
+        Releases the views and closes the mmap (if the trie was opened
+        from disk). The trie can not be used afterwards.
+        """
+        self._first_child.release()
+        self._terminal.release()
+        self._view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    @property
+    def node_count(self) -> int:
+        return self._node_count
+
+    @property
+    def checksum(self) -> int:
+        """
+        CRC32 of the sorted word list, identifies the dictionary content.
+        """
+        return self._checksum
+
+    def __contains__(self, word: object) -> bool:
+        return isinstance(word, str) and self.is_word(self.walk(word))
+
+    def __iter__(self) -> Iterator[str]:
+        return self.iter_words()
+
+    def __len__(self) -> int:
+        return self._word_count
+
+    def __enter__(self) -> "BoggleTrie":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# -------------- B U I L D  H E L P E R S ----------------#
+def _align(offset: int) -> int:
+    return (offset + 3) & ~3
+
+
+def open_word_list(dict_path: str) -> TextIO:
+    """
+    Opens a word list for reading, gzip compressed if its name ends with
+    ".gz", so it can be streamed without decompressing it first.
+    """
+    if dict_path.endswith(".gz"):
+        return gzip.open(dict_path, "rt", encoding="utf-8")
+    return open(dict_path, encoding="utf-8")
+
+
+def normalize_word(word: str, qu_face: bool = True) -> Optional[str]:
+    """
+    :param qu_face: whether the dice show "QU" as one face (the standard
+    dice), then a word with a Q that is not followed by a U cannot be
+    spelled.
+    :return: the word in upper case, None if it cannot be spelled on a
+    board (empty, digits, hyphens, apostrophes or a lone Q).
+    """
+    word = word.strip().upper()
+    if not word.isalpha():
+        return None
+    if qu_face and "Q" in word.replace("QU", ""):
+        return None
+    return word
+
+
+def read_words(dict_path: str, qu_face: bool = True) -> Iterator[str]:
+    """
+    Streams the words of a plain or gzip compressed text dictionary, one
+    word per line, normalized by normalize_word (the words that cannot be
+    spelled are skipped).
+    """
+    with open_word_list(dict_path) as dict_file:
+        for line in dict_file:
+            word = normalize_word(line, qu_face)
+            if word:
+                yield word
+
+
+def compile_sorted_words(words: Iterable[str]) -> bytes:
+    """
+    Compiles words, which must come sorted (by their UTF-8 bytes, repeats
+    are skipped), into the flat trie layout described in BoggleTrie, one
+    word at a time: the word list itself is never held, only the nodes.
+    The nodes a word adds (for the bytes past its common prefix with the
+    previous word) come in depth-first order, which is the sorted order of
+    their prefixes, so ordering them by depth (stably) gives the
+    breadth-first layout.
+    :raise ValueError: if the words are not sorted.
+    """
+    labels = bytearray(b"\0")
+    terminal = bytearray(b"\0")
+    depths = array("H", [0])
+    parents = array("I", [0])
+    # the nodes of the previous word, path[depth] is the one at depth
+    path = [ROOT]
+    previous = b""
+    count = checksum = 0
+    for word in words:
+        encoded = word.encode()
+        if encoded <= previous:
+            if encoded == previous:
+                continue
+            raise ValueError(f"words are not sorted: {word!r} after "
+                             f"{previous.decode()!r}")
+        common = 0
+        limit = min(len(encoded), len(previous))
+        while common < limit and encoded[common] == previous[common]:
+            common += 1
+        del path[common + 1:]
+        for depth in range(common, len(encoded)):
+            parents.append(path[-1])
+            labels.append(encoded[depth])
+            terminal.append(0)
+            depths.append(depth + 1)
+            path.append(len(labels) - 1)
+        terminal[-1] = 1
+        # the checksum of the words joined by newlines
+        if count:
+            checksum = zlib.crc32(b"\n", checksum)
+        checksum = zlib.crc32(encoded, checksum)
+        count += 1
+        previous = encoded
+
+    # breadth-first numbering: a counting sort of the nodes by depth
+    nodes = len(labels)
+    starts = array("I", bytes(4 * (max(depths) + 2)))
+    for depth in depths:
+        starts[depth + 1] += 1
+    for depth in range(1, len(starts)):
+        starts[depth] += starts[depth - 1]
+    numbers = array("I", bytes(4 * nodes))
+    for node, depth in enumerate(depths):
+        numbers[node] = starts[depth]
+        starts[depth] += 1
+
+    bfs_labels = bytearray(nodes)
+    bfs_terminal = bytearray(nodes)
+    children = array("I", bytes(4 * (nodes + 1)))
+    for node in range(nodes):
+        number = numbers[node]
+        bfs_labels[number] = labels[node]
+        bfs_terminal[number] = terminal[node]
+        if node != ROOT:
+            children[numbers[parents[node]] + 1] += 1
+    # the children of the nodes are consecutive, in the nodes' order
+    first_child = children
+    first_child[0] = 1
+    for node in range(1, nodes + 1):
+        first_child[node] += first_child[node - 1]
+
+    header = _HEADER.pack(_MAGIC, nodes, count, checksum, _ENDIAN_MARKER)
+    padding = bytes(_align(len(header) + 2 * nodes) - len(header) - 2 * nodes)
+    return b"".join((header, bfs_labels, bfs_terminal, padding,
+                     first_child.tobytes()))
+
+
+def compile_words(words: Iterable[str]) -> bytes:
+    """
+    Compiles words, in any order, into the flat trie layout described in
+    BoggleTrie. The words are sorted in memory first (the order of strings
+    is that of their UTF-8 bytes); compile_sorted_words compiles an already
+    sorted stream without holding it.
+    """
+    return compile_sorted_words(sorted(set(words)))
+
+
+def dictionary_stem(dict_path: str) -> str:
+    """
+    :return: dict_path without its extensions ("kids.txt.gz" -> "kids"),
+    the compiled files of the dictionary are named after it.
+    """
+    if dict_path.endswith(".gz"):
+        dict_path = dict_path[:-len(".gz")]
+    return os.path.splitext(dict_path)[0]
+
+
+def default_trie_path(dict_path: str) -> str:
+    return dictionary_stem(dict_path) + TRIE_SUFFIX
+
+
+def is_stale(source_path: str, compiled_path: str) -> bool:
+    """
+    :return: True if compiled_path is missing or older than source_path.
+    """
+    if not os.path.exists(compiled_path):
+        return True
+    return os.path.getmtime(source_path) > os.path.getmtime(compiled_path)
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """
+    Writes data next to path and renames it in place, so readers never
+    mmap a half written file.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as out_file:
+        out_file.write(data)
+    os.replace(tmp_path, path)
+
+
+def build_trie(dict_path: str = DEFAULT_DICT_PATH,
+               trie_path: Optional[str] = None, qu_face: bool = True) -> str:
+    """
+    Compiles the text dictionary at dict_path (streamed, see read_words) and
+    writes it to trie_path (next to the dictionary by default). A sorted
+    list is compiled word by word without holding it; an unsorted one is
+    read again and sorted in memory.
+    :return: the path of the compiled file.
+    """
+    trie_path = trie_path or default_trie_path(dict_path)
+    try:
+        data = compile_sorted_words(read_words(dict_path, qu_face))
+    except ValueError:
+        data = compile_words(read_words(dict_path, qu_face))
+    write_atomic(trie_path, data)
+    return trie_path
+
+
+def load_trie(dict_path: str = DEFAULT_DICT_PATH,
+              trie_path: Optional[str] = None,
+              qu_face: bool = True) -> BoggleTrie:
+    """
+    Opens the compiled version of the dictionary at dict_path, rebuilding it
+    first when it is missing, older than the text file or not readable on
+    this machine.
+    """
+    trie_path = trie_path or default_trie_path(dict_path)
+    if is_stale(dict_path, trie_path):
+        build_trie(dict_path, trie_path, qu_face)
+    try:
+        return BoggleTrie.open(trie_path)
+    except ValueError:
+        build_trie(dict_path, trie_path, qu_face)
+        return BoggleTrie.open(trie_path)
+
+
+# -------------- C O M M A N D  L I N E ----------------#
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compile a Boggle word list into a memory-mapped trie.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="compile a dictionary")
+    build_parser.add_argument("dictionary", nargs="?",
+                              default=DEFAULT_DICT_PATH)
+    build_parser.add_argument("-o", "--output", default=None,
+                              help="compiled file (default: <dictionary>.trie)")
+
+    args = parser.parse_args(argv)
+    if args.command == "build":
+        trie_path = build_trie(args.dictionary, args.output)
+        with BoggleTrie.open(trie_path) as trie:
+            print(f"{trie_path}: {len(trie)} words, "
+                  f"{trie.node_count} nodes, "
+                  f"{os.path.getsize(trie_path)} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
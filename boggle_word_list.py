@@ -0,0 +1,95 @@
+# -------------- I M P O R T S ----------------#
+import tkinter as tk
+from typing import List
+
+
+class WordList:
+    """
+    The WordList class is a virtualized, scrollable list of words drawn on
+    a Tk canvas.
+
+
+    Only the rows that fit in the canvas exist as canvas items. Scrolling
+    changes their texts instead of moving the canvas, and the scrollbar is
+    set from the number of words, so adding a word takes the same time
+    whether the list has ten words or thousands.
+
+
+    Attributes:
+    1. canvas: the canvas the rows are drawn on.
+    2. scrollbar: the vertical scrollbar of the list (its command is yview).
+    3. words: all the words of the list, in the order they were added.
+
+
+    API methods:
+    1. append -> None: Adds a word at the end of the list.
+    2. yview -> None: The scrollbar command, scrolls the list.
+    3. __len__ -> int: The number of words in the list.
+    """
+
+    def __init__(self, canvas: tk.Canvas, scrollbar: tk.Scrollbar,
+                 top: int, row_height: int = 17, x: int = 40,
+                 prefix: str = "* ", **text_options):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.words: List[str] = []
+        self._prefix = prefix
+        self._first = 0
+        visible = max(1, (int(canvas["height"]) - top) // row_height)
+        self._rows = [canvas.create_text(x, top + row * row_height, text="",
+                                         **text_options)
+                      for row in range(visible)]
+        scrollbar.config(command=self.yview)
+        self.__update_scrollbar()
+
+    # ------------ class encapsulated helpers ------------ #
+    def __update_scrollbar(self) -> None:
+        if len(self.words) <= len(self._rows):
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            total = len(self.words)
+            self.scrollbar.set(self._first / total,
+                               (self._first + len(self._rows)) / total)
+
+    def __render(self) -> None:
+        """
+        Writes the visible words into the rows.
+        """
+        for row, item in enumerate(self._rows):
+            index = self._first + row
+            text = self._prefix + self.words[index] \
+                if index < len(self.words) else ""
+            self.canvas.itemconfigure(item, text=text)
+
+    # ------------ class API ------------ #
+    def append(self, word: str) -> None:
+        self.words.append(word)
+        row = len(self.words) - 1 - self._first
+        # only a word that lands on a visible row is drawn
+        if row < len(self._rows):
+            self.canvas.itemconfigure(self._rows[row],
+                                      text=self._prefix + word)
+        self.__update_scrollbar()
+
+    def yview(self, *args) -> None:
+        """
+        Scrolls the list, called by the scrollbar with ("moveto", fraction)
+        or ("scroll", number, "units" / "pages").
+        """
+        if not args:
+            return
+        if args[0] == "moveto":
+            first = round(float(args[1]) * len(self.words))
+        elif args[0] == "scroll":
+            step = len(self._rows) if args[2] == "pages" else 1
+            first = self._first + int(args[1]) * step
+        else:
+            return
+        first = max(0, min(first, len(self.words) - len(self._rows)))
+        if first != self._first:
+            self._first = first
+            self.__render()
+        self.__update_scrollbar()
+
+    def __len__(self) -> int:
+        return len(self.words)